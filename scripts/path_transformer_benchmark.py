@@ -0,0 +1,84 @@
+"""Microbenchmark of PathTransformerImpl: per-file transform against the batch APIs.
+
+Usage: python scripts/path_transformer_benchmark.py [number_of_names]
+
+The baseline reproduces the original per-file algorithm (uncompiled re.match, split,
+lookup and four chained Path joins per file) next to the current transform,
+transform_batch and target_locations, over synthetic slicer output names. The link
+creator uses target_locations and joins each directory and name into a string.
+"""
+import re
+import sys
+import time
+from pathlib import Path
+from typing import Callable, Dict, List
+
+# Runnable from a checkout without installing the package
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from unit_of_work.linker.agid_name_lookup.agid_name_lookup import AgidNameLookup
+from unit_of_work.linker.path_transformer.path_transformer_impl import PathTransformerImpl
+
+
+class _DictAgidNameLookup(AgidNameLookup):
+    def __init__(self, mapping: Dict[str, str]) -> None:
+        self._mapping: Dict[str, str] = mapping
+
+    def dest_agid_name(self, src_agid_name: str) -> str:
+        return self._mapping[src_agid_name]
+
+
+def _legacy_transform(lookup: AgidNameLookup, path: Path, target_base_dir: Path) -> Path:
+    if re.match(r"\w+\.\w+\.\w+", path.name):
+        agid_name_src, load_id, load_id_suffix = path.name.split(".")
+        return (
+            target_base_dir
+            / lookup.dest_agid_name(agid_name_src)
+            / (load_id[1:] + load_id_suffix[:3])
+            / (load_id[1:] + load_id_suffix)
+        )
+    agid_name_src, load_id = path.name.split(".")
+    return target_base_dir / lookup.dest_agid_name(agid_name_src) / "RES" / load_id[1:]
+
+
+def _measure(label: str, count: int, run: Callable[[], object], repeat: int = 3) -> float:
+    # The best of a few runs, so that a noisy machine does not decide the ratio
+    elapsed = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        run()
+        elapsed = min(elapsed, time.perf_counter() - start)
+    print(f"{label:<22} {elapsed:8.2f}s {elapsed / count * 1e9:10.0f} ns/file")
+    return elapsed
+
+
+def main() -> None:
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    lookup = _DictAgidNameLookup({f"A{i:02d}": f"D{i:02d}" for i in range(50)})
+    transformer = PathTransformerImpl(lookup)
+    source_dir = Path("/ars/data/spool/output/A12345/slicer")
+    target_base_dir = Path("/ars/data/spool/output/A12345/linker")
+    # Like slicer output: objects of a load share their first suffix characters and
+    # thereby their target directory, one resource per load
+    names: List[str] = []
+    for i in range(count):
+        agid, load_id = f"A{i // 100_000 % 50:02d}", f"L{i // 676:05d}"
+        if i % 676 == 0:
+            names.append(f"{agid}.{load_id}")
+        else:
+            names.append(f"{agid}.{load_id}.F{chr(65 + i // 26 % 26)}A{chr(65 + i % 26)}")
+    paths: List[Path] = [source_dir / name for name in names]
+
+    legacy = _measure("legacy transform", count, lambda: [_legacy_transform(lookup, p, target_base_dir) for p in paths])
+    _measure("transform", count, lambda: [transformer.transform(p, target_base_dir) for p in paths])
+    batch = _measure("transform_batch", count, lambda: transformer.transform_batch(names, target_base_dir))
+    locations = _measure("target_locations", count, lambda: [
+        f"{directory}/{name}"
+        for directory, name in transformer.target_locations(names, target_base_dir)
+    ])
+    print(f"speedup of transform_batch over legacy transform: {legacy / batch:.1f}x")
+    print(f"speedup of target_locations over legacy transform: {legacy / locations:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
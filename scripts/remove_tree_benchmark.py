@@ -0,0 +1,54 @@
+"""Benchmark of remove_tree against shutil.rmtree on the storage under a directory.
+
+Usage: python scripts/remove_tree_benchmark.py <scratch_directory> [number_of_files] [max_workers]
+
+Builds the same synthetic tape working directories twice below `scratch_directory`:
+a flat slicer-like directory and a linker-like tree of AGID and load directories
+holding hard links to it. Each copy is then removed, once with shutil.rmtree and
+once with remove_tree, and files removed per second are printed. Run it on the
+file system of output_working_directory; local disks show little difference.
+"""
+import os
+import shutil
+import sys
+import time
+from pathlib import Path
+
+from unit_of_work.utils.remove_tree import remove_tree
+
+
+def _build(root: Path, count: int) -> int:
+    slicer = root / "slicer"
+    slicer.mkdir(parents=True)
+    for i in range(count):
+        name = f"A{i // 100_000 % 50:02d}.L{i // 676:05d}.F{chr(65 + i // 26 % 26)}A{chr(65 + i % 26)}"
+        (slicer / name).touch()
+        directory = root / "linker" / f"D{i // 100_000 % 50:02d}" / f"{i // 676:05d}F{chr(65 + i // 26 % 26)}A"
+        directory.mkdir(parents=True, exist_ok=True)
+        os.link(slicer / name, directory / name)
+    return 2 * count
+
+
+def _measure(label: str, files: int, remove) -> float:
+    start = time.perf_counter()
+    remove()
+    elapsed = time.perf_counter() - start
+    print(f"{label:<12} {elapsed:8.2f}s {files / elapsed:12.0f} files/s")
+    return elapsed
+
+
+def main() -> None:
+    scratch = Path(sys.argv[1])
+    count = int(sys.argv[2]) if len(sys.argv) > 2 else 200_000
+    max_workers = int(sys.argv[3]) if len(sys.argv) > 3 else 8
+
+    files = _build(scratch / "rmtree", count)
+    _build(scratch / "remove_tree", count)
+    # Both trees are written before either is removed, so both start equally cold
+    legacy = _measure("rmtree", files, lambda: shutil.rmtree(scratch / "rmtree"))
+    parallel = _measure("remove_tree", files, lambda: remove_tree(scratch / "remove_tree", max_workers=max_workers))
+    print(f"speedup of remove_tree over rmtree with {max_workers} workers: {legacy / parallel:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
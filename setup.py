@@ -16,8 +16,9 @@ setup(
     ],
     
     install_requires=[        
-        'ibm_db==3.2.3',
-        'PyYAML==6.0.2'
+        'ibm_db==3.3.0',
+        'PyYAML==6.0.2',
+        'boto3==1.36.8'
     ],
 
     python_requires='>=3.9', 
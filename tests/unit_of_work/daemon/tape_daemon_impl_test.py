@@ -0,0 +1,193 @@
+import threading
+from pathlib import Path
+from typing import List
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from unit_of_work.daemon.tape_daemon_impl import TapeDaemonImpl
+from unit_of_work.processor.unit_of_work_processor import UnitOfWorkProcessor
+from unit_of_work.tape_register.tape_register import TapeRegister
+
+
+@pytest.fixture
+def tape_register() -> MagicMock:
+    return MagicMock(spec=TapeRegister)
+
+
+class TestTapeDaemonImpl:
+    def test_processes_claimed_tapes_with_their_location(self, tape_register: MagicMock) -> None:
+        # Given
+        processed: List[tuple] = []
+        processor = MagicMock(spec=UnitOfWorkProcessor)
+        processor.process.side_effect = lambda name, location: processed.append((name, location))
+
+        daemon = TapeDaemonImpl(
+            tape_register=tape_register,
+            processor_factory=lambda tape_name: processor,
+            tape_directory=Path("/tapes"),
+            max_concurrent_tapes=2,
+            poll_interval=0.01
+        )
+
+        def claim(limit: int) -> List[str]:
+            daemon.stop()
+            return ["T1", "T2"]
+
+        tape_register.claim_tapes.side_effect = claim
+
+        # When
+        daemon.run()
+
+        # Then
+        tape_register.claim_tapes.assert_called_once_with(2)
+        assert sorted(processed) == [("T1", Path("/tapes/T1")), ("T2", Path("/tapes/T2"))]
+        assert daemon.in_flight_count() == 0
+
+    def test_claims_only_free_slots(self, tape_register: MagicMock) -> None:
+        # Given
+        release = threading.Event()
+        processor = MagicMock(spec=UnitOfWorkProcessor)
+        processor.process.side_effect = lambda name, location: release.wait(5)
+        limits: List[int] = []
+
+        daemon = TapeDaemonImpl(
+            tape_register=tape_register,
+            processor_factory=lambda tape_name: processor,
+            tape_directory=Path("/tapes"),
+            max_concurrent_tapes=3,
+            poll_interval=0.01
+        )
+
+        def claim(limit: int) -> List[str]:
+            limits.append(limit)
+            if len(limits) == 1:
+                return ["T1", "T2"]
+            daemon.stop()
+            release.set()
+            return []
+
+        tape_register.claim_tapes.side_effect = claim
+
+        # When
+        daemon.run()
+
+        # Then
+        assert limits == [3, 1]
+
+    def test_claim_failure_does_not_stop_daemon(self, tape_register: MagicMock) -> None:
+        # Given
+        calls: List[int] = []
+
+        daemon = TapeDaemonImpl(
+            tape_register=tape_register,
+            processor_factory=lambda tape_name: MagicMock(spec=UnitOfWorkProcessor),
+            tape_directory=Path("/tapes"),
+            max_concurrent_tapes=1,
+            poll_interval=0.01
+        )
+
+        def claim(limit: int) -> List[str]:
+            calls.append(limit)
+            if len(calls) == 1:
+                raise Exception("DB error")
+            daemon.stop()
+            return []
+
+        tape_register.claim_tapes.side_effect = claim
+
+        # When
+        daemon.run()
+
+        # Then
+        assert len(calls) == 2
+
+    def test_crashed_processor_marks_tape_failed(self, tape_register: MagicMock) -> None:
+        # Given
+        def failing_factory(tape_name: str) -> UnitOfWorkProcessor:
+            raise RuntimeError("cannot build processor")
+
+        daemon = TapeDaemonImpl(
+            tape_register=tape_register,
+            processor_factory=failing_factory,
+            tape_directory=Path("/tapes"),
+            max_concurrent_tapes=1,
+            poll_interval=0.01
+        )
+
+        def claim(limit: int) -> List[str]:
+            daemon.stop()
+            return ["T1"]
+
+        tape_register.claim_tapes.side_effect = claim
+
+        # When
+        daemon.run()
+
+        # Then
+        tape_register.set_status_failed.assert_called_once_with("T1")
+
+    @patch('unit_of_work.daemon.tape_daemon_impl.logger')
+    def test_failure_to_mark_crashed_tape_failed_is_logged(
+        self,
+        mock_logger: MagicMock,
+        tape_register: MagicMock
+    ) -> None:
+        # Given
+        def failing_factory(tape_name: str) -> UnitOfWorkProcessor:
+            raise RuntimeError("cannot build processor")
+
+        daemon = TapeDaemonImpl(
+            tape_register=tape_register,
+            processor_factory=failing_factory,
+            tape_directory=Path("/tapes"),
+            max_concurrent_tapes=1,
+            poll_interval=0.01
+        )
+
+        def claim(limit: int) -> List[str]:
+            daemon.stop()
+            return ["T1"]
+
+        tape_register.claim_tapes.side_effect = claim
+        tape_register.set_status_failed.side_effect = RuntimeError("database gone")
+
+        # When
+        daemon.run()
+
+        # Then
+        mock_logger.exception.assert_called_once()
+        assert "T1" in mock_logger.exception.call_args.args[0]
+
+    def test_releases_stale_claims_before_claiming(self, tape_register: MagicMock) -> None:
+        # Given
+        daemon = TapeDaemonImpl(
+            tape_register=tape_register,
+            processor_factory=lambda tape_name: MagicMock(spec=UnitOfWorkProcessor),
+            tape_directory=Path("/tapes"),
+            max_concurrent_tapes=1,
+            poll_interval=0.01,
+            release_claims_on_start=True
+        )
+
+        def claim(limit: int) -> List[str]:
+            daemon.stop()
+            return []
+
+        tape_register.claim_tapes.side_effect = claim
+
+        # When
+        daemon.run()
+
+        # Then
+        assert [call[0] for call in tape_register.method_calls] == ["release_claims", "claim_tapes"]
+
+    def test_rejects_non_positive_concurrency(self, tape_register: MagicMock) -> None:
+        with pytest.raises(ValueError):
+            TapeDaemonImpl(
+                tape_register=tape_register,
+                processor_factory=lambda tape_name: MagicMock(spec=UnitOfWorkProcessor),
+                tape_directory=Path("/tapes"),
+                max_concurrent_tapes=0,
+                poll_interval=1
+            )
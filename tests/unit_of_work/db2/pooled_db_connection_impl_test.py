@@ -0,0 +1,185 @@
+import sqlite3
+import threading
+from pathlib import Path
+from typing import List
+from unittest.mock import MagicMock
+import pytest
+
+from unit_of_work.db2.pooled_db_connection_impl import PooledDBConnectionImpl
+
+FEATURE = """
+Feature: Pooled Database Connections
+    As a daemon running many pipelines
+    I want database calls to share a few long-lived connections
+    So that status updates do not pay a connect and authentication handshake each
+"""
+
+HEALTH_CHECK_QUERY = "SELECT 1"
+
+@pytest.fixture
+def database(tmp_path: Path) -> Path:
+    database = tmp_path / "register.db"
+    connection = sqlite3.connect(database)
+    connection.execute("CREATE TABLE tapes (volser TEXT PRIMARY KEY, status TEXT)")
+    connection.executemany("INSERT INTO tapes VALUES (?, ?)", [("A00001", "new"), ("A00002", "new")])
+    connection.commit()
+    connection.close()
+    return database
+
+@pytest.fixture
+def connect(database: Path) -> MagicMock:
+    return MagicMock(side_effect=lambda: sqlite3.connect(database, check_same_thread=False))
+
+@pytest.fixture
+def pool(connect: MagicMock) -> PooledDBConnectionImpl:
+    pool = PooledDBConnectionImpl(connect=connect, pool_size=2, health_check_query=HEALTH_CHECK_QUERY)
+    yield pool
+    pool.close()
+
+class TestPooledDBConnectionImpl:
+    def test_sequential_calls_reuse_one_connection(
+        self,
+        pool: PooledDBConnectionImpl,
+        connect: MagicMock
+    ) -> None:
+        """Should open a single connection for consecutive calls"""
+        # When
+        updated = pool.update("UPDATE tapes SET status = 'claimed' WHERE volser = 'A00001'")
+        status = pool.fetch_one("SELECT status FROM tapes WHERE volser = 'A00001'")
+        statuses = pool.fetch_all("SELECT volser, status FROM tapes")
+
+        # Then
+        assert updated == 1
+        assert status == ("claimed",)
+        assert statuses == {"A00001": ("claimed",), "A00002": ("new",)}
+        assert connect.call_count == 1
+        assert pool.size() == (1, 1)
+
+    def test_concurrent_calls_never_exceed_pool_size(
+        self,
+        pool: PooledDBConnectionImpl,
+        connect: MagicMock
+    ) -> None:
+        """Should make threads wait for a free connection instead of opening more"""
+        # Given
+        errors: List[Exception] = []
+
+        def worker() -> None:
+            try:
+                for _ in range(20):
+                    assert pool.fetch_one("SELECT COUNT(*) FROM tapes") == (2,)
+            except Exception as e:
+                errors.append(e)
+
+        threads = [threading.Thread(target=worker) for _ in range(8)]
+
+        # When
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        # Then
+        assert errors == []
+        assert connect.call_count <= 2
+        assert pool.size()[0] <= 2
+
+    def test_stale_connection_is_replaced_on_checkout(
+        self,
+        connect: MagicMock
+    ) -> None:
+        """Should health check an idle connection and reconnect if it is stale"""
+        # Given
+        pool = PooledDBConnectionImpl(
+            connect=connect, pool_size=1, health_check_query=HEALTH_CHECK_QUERY, health_check_interval=0
+        )
+        pool.fetch_one("SELECT 1")
+        stale_connection = pool._idle[-1][0].connection
+        stale_connection.close()
+
+        # When
+        result = pool.fetch_one("SELECT COUNT(*) FROM tapes")
+
+        # Then
+        assert result == (2,)
+        assert connect.call_count == 2
+        assert pool.size() == (1, 1)
+        pool.close()
+
+    def test_failed_call_discards_its_connection(
+        self,
+        pool: PooledDBConnectionImpl,
+        connect: MagicMock
+    ) -> None:
+        """Should close a connection that raised and open a new one for the next call"""
+        # Given
+        pool.fetch_one("SELECT 1")
+
+        # When
+        with pytest.raises(sqlite3.OperationalError):
+            pool.fetch_one("SELECT * FROM missing_table")
+
+        # Then
+        assert pool.size() == (0, 0)
+        assert pool.fetch_one("SELECT COUNT(*) FROM tapes") == (2,)
+        assert connect.call_count == 2
+
+    def test_failed_connect_releases_its_slot(
+        self,
+        database: Path
+    ) -> None:
+        """Should not leak pool capacity when connecting fails"""
+        # Given
+        connect = MagicMock(side_effect=[sqlite3.OperationalError("unreachable"), sqlite3.connect(database)])
+        pool = PooledDBConnectionImpl(connect=connect, pool_size=1, health_check_query=HEALTH_CHECK_QUERY)
+
+        # When
+        with pytest.raises(sqlite3.OperationalError):
+            pool.fetch_one("SELECT 1")
+
+        # Then
+        assert pool.fetch_one("SELECT 1") == (1,)
+        pool.close()
+
+    def test_rejects_non_positive_pool_size(self) -> None:
+        """Should refuse a pool without connections"""
+        with pytest.raises(ValueError):
+            PooledDBConnectionImpl(connect=MagicMock(), pool_size=0, health_check_query=HEALTH_CHECK_QUERY)
+
+    def test_parameterised_statements_bind_values(
+        self,
+        pool: PooledDBConnectionImpl
+    ) -> None:
+        """Should bind parameters instead of interpolating them into the SQL text"""
+        # When
+        updated = pool.execute("UPDATE tapes SET status = ? WHERE volser = ?", ("sliced", "A00001"))
+        inserted = pool.executemany("INSERT INTO tapes VALUES (?, ?)", [("A00003", "new"), ("A'; --", "new")])
+
+        # Then
+        assert updated == 1
+        assert inserted == 2
+        assert pool.fetch_one("SELECT status FROM tapes WHERE volser = ?", ("A00001",)) == ("sliced",)
+        assert pool.fetch_all("SELECT volser, status FROM tapes WHERE status = ?", ("new",)) == {
+            "A00002": ("new",),
+            "A00003": ("new",),
+            "A'; --": ("new",)
+        }
+
+    def test_iter_rows_streams_in_batches_and_returns_connection(
+        self,
+        pool: PooledDBConnectionImpl
+    ) -> None:
+        """Should yield every row and give the connection back, also when abandoned early"""
+        # Given
+        pool.executemany("INSERT INTO tapes VALUES (?, ?)", [(f"B{i:05d}", "new") for i in range(25)])
+
+        # When
+        rows = list(pool.iter_rows("SELECT volser FROM tapes WHERE status = ?", ("new",), batch_size=4))
+        abandoned = pool.iter_rows("SELECT volser FROM tapes", batch_size=4)
+        next(abandoned)
+        abandoned.close()
+
+        # Then
+        assert len(rows) == 27
+        assert pool.size()[0] <= 1
+        assert pool.fetch_one("SELECT COUNT(*) FROM tapes") == (27,)
@@ -0,0 +1,128 @@
+import sqlite3
+from unittest.mock import MagicMock, create_autospec, patch
+
+import ibm_db_dbi
+
+from unit_of_work.db2.statement_cache import StatementCache
+
+
+class TestStatementCache:
+    def test_preparing_driver_prepares_each_statement_once(self) -> None:
+        """Should prepare a statement on first use and only bind parameters afterwards"""
+        # Given
+        connection = MagicMock()
+        cursor = MagicMock()
+        connection.cursor.return_value = cursor
+        statements = StatementCache(connection)
+        query = "UPDATE register SET status = ? WHERE volser = ?"
+
+        # When
+        statements.execute(query, ("sliced", "A00001"))
+        statements.execute(query, ("linked", "A00002"))
+
+        # Then
+        connection.cursor.assert_called_once()
+        cursor.prepare.assert_called_once_with(query)
+        assert [call.args for call in cursor.execute.call_args_list] == [
+            (None, ("sliced", "A00001")),
+            (None, ("linked", "A00002"))
+        ]
+
+    def test_ibm_db_dbi_cursor_is_prepared_once(self) -> None:
+        """Should prepare and re-execute through the API of the pinned ibm_db_dbi cursor"""
+        # Given
+        connection = create_autospec(ibm_db_dbi.Connection, instance=True)
+        cursor = create_autospec(ibm_db_dbi.Cursor, instance=True)
+        connection.cursor.return_value = cursor
+        statements = StatementCache(connection)
+        query = "UPDATE register SET status = ? WHERE volser = ?"
+
+        # When
+        statements.execute(query, ("sliced", "A00001"))
+        statements.execute(query, ("linked", "A00002"))
+
+        # Then
+        cursor.prepare.assert_called_once_with(query)
+        assert [call.args for call in cursor.execute.call_args_list] == [
+            (None, ("sliced", "A00001")),
+            (None, ("linked", "A00002"))
+        ]
+
+    def test_ibm_db_dbi_batch_runs_prepared_statement(self) -> None:
+        """Should run batches through the statement prepared once instead of preparing per call"""
+        # Given
+        connection = create_autospec(ibm_db_dbi.Connection, instance=True)
+        cursor = create_autospec(ibm_db_dbi.Cursor, instance=True)
+        cursor.stmt_handler = "stmt"
+        connection.cursor.return_value = cursor
+        statements = StatementCache(connection)
+        query = "INSERT INTO register VALUES (?, ?)"
+
+        # When
+        with patch("unit_of_work.db2.statement_cache.ibm_db.execute_many", return_value=2) as execute_many:
+            first = statements.executemany(query, [["A00001", "new"], ["A00002", "new"]])
+            second = statements.executemany(query, [["A00003", "new"], ["A00004", "new"]])
+
+        # Then
+        assert (first, second) == (2, 2)
+        connection.cursor.assert_called_once()
+        cursor.prepare.assert_called_once_with(query)
+        cursor.executemany.assert_not_called()
+        assert execute_many.call_args_list[1].args == (
+            "stmt", (("A00003", "new"), ("A00004", "new"))
+        )
+
+    def test_driver_without_prepare_reuses_cursor(self) -> None:
+        """Should pass the SQL text to drivers that cannot prepare explicitly"""
+        # Given
+        connection = sqlite3.connect(":memory:")
+        connection.execute("CREATE TABLE register (volser TEXT)")
+        connection.executemany("INSERT INTO register VALUES (?)", [("A00001",), ("A00002",)])
+        statements = StatementCache(connection)
+
+        # When
+        first = statements.execute("SELECT COUNT(*) FROM register WHERE volser = ?", ("A00001",))
+        count = first.fetchone()
+        second = statements.execute("SELECT COUNT(*) FROM register WHERE volser = ?", ("A00003",))
+
+        # Then
+        assert first is second
+        assert count == (1,)
+        assert second.fetchone() == (0,)
+
+    def test_least_recently_used_statement_is_evicted(self) -> None:
+        """Should close the cursor of the least recently used statement beyond max_size"""
+        # Given
+        connection = MagicMock()
+        cursors = [MagicMock(), MagicMock(), MagicMock()]
+        connection.cursor.side_effect = cursors
+        statements = StatementCache(connection, max_size=2)
+
+        # When
+        statements.execute("SELECT 1")
+        statements.execute("SELECT 2")
+        statements.execute("SELECT 1")
+        statements.execute("SELECT 3")
+
+        # Then
+        cursors[1].close.assert_called_once()
+        cursors[0].close.assert_not_called()
+
+    def test_batch_without_prepare_reuses_cursor(self) -> None:
+        """Should reuse the cached cursor for batches on drivers that cannot prepare explicitly"""
+        # Given
+        connection = MagicMock()
+        cursor = create_autospec(sqlite3.Cursor, instance=True)
+        cursor.rowcount = 2
+        connection.cursor.return_value = cursor
+        statements = StatementCache(connection)
+        query = "INSERT INTO register VALUES (?)"
+
+        # When
+        first = statements.executemany(query, [["A00001"], ["A00002"]])
+        second = statements.executemany(query, [["A00003"], ["A00004"]])
+
+        # Then
+        assert (first, second) == (2, 2)
+        connection.cursor.assert_called_once()
+        assert cursor.executemany.call_args_list[1].args == (query, (("A00003",), ("A00004",)))
@@ -8,11 +8,11 @@ from unit_of_work.linker.agid_name_lookup.agid_name_lookup_impl import AgidNameL
 @pytest.fixture
 def mock_db_connection() -> MagicMock:
     connection = MagicMock(spec=DBConnection)
-    connection.fetch_all.return_value = {
-        "src1": ("dest1",),
-        "src2": ("dest2",),
-        "src3": ("dest3",)
-    }
+    connection.iter_rows.side_effect = lambda query: iter([
+        ("src1", "dest1"),
+        ("src2", "dest2"),
+        ("src3", "dest3")
+    ])
     return connection
 
 class TestAgidNameLookupImpl:
@@ -25,7 +25,7 @@ class TestAgidNameLookupImpl:
         lookup = AgidNameLookupImpl(mock_db_connection)
     
         # Then
-        mock_db_connection.fetch_all.assert_called_once_with(
+        mock_db_connection.iter_rows.assert_called_once_with(
             "SELECT distinct(agid_name_src), agid_name_dst FROM mig_mapping"
         )
         assert lookup._dict == {
@@ -62,6 +62,8 @@ class TestAgidNameLookupImpl:
         # When/Then
         with pytest.raises(RemagError) as exc_info:
             lookup.dest_agid_name(unknown_src)
+        with pytest.raises(RemagError):
+            lookup.dest_agid_name(unknown_src)
 
         assert str(exc_info.value) == f"Missing entry in remag table for src_agid_name: {unknown_src}"
 
@@ -70,10 +72,47 @@ class TestAgidNameLookupImpl:
         )
 
 
+    @patch('unit_of_work.linker.agid_name_lookup.agid_name_lookup_impl.time.monotonic')
+    def test_miss_reloads_mapping_once_refresh_interval_passed(self, mock_monotonic: MagicMock) -> None:
+        # Given
+        connection = MagicMock(spec=DBConnection)
+        connection.iter_rows.side_effect = [iter([("src1", "dest1")]), iter([("src1", "dest1"), ("src2", "dest2")])]
+        mock_monotonic.return_value = 0
+        lookup = AgidNameLookupImpl(connection, refresh_interval=60)
+
+        # When
+        mock_monotonic.return_value = 30
+        with pytest.raises(RemagError):
+            lookup.dest_agid_name("src2")
+        mock_monotonic.return_value = 61
+        result = lookup.dest_agid_name("src2")
+
+        # Then
+        assert result == "dest2"
+        assert connection.iter_rows.call_count == 2
+
+
+    @patch('unit_of_work.linker.agid_name_lookup.agid_name_lookup_impl.time.monotonic')
+    def test_failed_reload_keeps_mapping(self, mock_monotonic: MagicMock) -> None:
+        # Given
+        connection = MagicMock(spec=DBConnection)
+        connection.iter_rows.side_effect = [iter([("src1", "dest1")]), Exception("DB2 down")]
+        mock_monotonic.return_value = 0
+        lookup = AgidNameLookupImpl(connection, refresh_interval=60)
+
+        # When
+        mock_monotonic.return_value = 61
+        lookup.prefetch({"src1", "src2"})
+
+        # Then
+        assert lookup.dest_agid_name("src1") == "dest1"
+        assert connection.iter_rows.call_count == 2
+
+
     def test_handles_empty_fetch_result(self) -> None:
         # Given
         connection = MagicMock(spec=DBConnection)
-        connection.fetch_all.return_value = {}
+        connection.iter_rows.return_value = iter([])
 
         # When
         lookup = AgidNameLookupImpl(connection)
@@ -85,10 +124,10 @@ class TestAgidNameLookupImpl:
     def test_initialization_with_multi_value_tuples(self) -> None:
         # Given
         connection = MagicMock(spec=DBConnection)
-        connection.fetch_all.return_value = {
-            "src1": ("dest1", "extra1", "more1"),
-            "src2": ("dest2", "extra2")
-        }
+        connection.iter_rows.return_value = iter([
+            ("src1", "dest1", "extra1", "more1"),
+            ("src2", "dest2", "extra2")
+        ])
 
         # When
         lookup = AgidNameLookupImpl(connection)
@@ -0,0 +1,132 @@
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+import pytest
+
+from unit_of_work.db2.db_connection import DBConnection
+from unit_of_work.linker.agid_name_lookup.cached_agid_name_lookup_impl import CachedAgidNameLookupImpl
+
+MODULE = "unit_of_work.linker.agid_name_lookup.cached_agid_name_lookup_impl"
+
+@pytest.fixture
+def mock_db_connection() -> MagicMock:
+    connection = MagicMock(spec=DBConnection)
+    connection.iter_rows.side_effect = lambda query: iter([("src1", "dest1"), ("src2", "dest2")])
+    connection.fetch_one.return_value = (2,)
+    return connection
+
+@pytest.fixture
+def cache_file(tmp_path: Path) -> Path:
+    return tmp_path / "cache" / "agid_name_cache.sqlite"
+
+class TestCachedAgidNameLookupImpl:
+
+    def test_first_worker_loads_from_db_and_writes_cache(
+        self,
+        mock_db_connection: MagicMock,
+        cache_file: Path
+    ) -> None:
+        # Given/When
+        lookup = CachedAgidNameLookupImpl(mock_db_connection, cache_file, ttl=60)
+
+        # Then
+        assert lookup.dest_agid_name("src2") == "dest2"
+        mock_db_connection.iter_rows.assert_called_once()
+        assert cache_file.exists()
+
+    def test_fresh_cache_is_used_without_db(
+        self,
+        mock_db_connection: MagicMock,
+        cache_file: Path
+    ) -> None:
+        # Given
+        CachedAgidNameLookupImpl(mock_db_connection, cache_file, ttl=60)
+        other_connection = MagicMock(spec=DBConnection)
+
+        # When
+        lookup = CachedAgidNameLookupImpl(other_connection, cache_file, ttl=60)
+
+        # Then
+        assert lookup.dest_agid_name("src1") == "dest1"
+        other_connection.iter_rows.assert_not_called()
+        other_connection.fetch_one.assert_not_called()
+
+    def test_expired_cache_with_unchanged_source_is_not_reloaded(
+        self,
+        mock_db_connection: MagicMock,
+        cache_file: Path
+    ) -> None:
+        # Given
+        CachedAgidNameLookupImpl(mock_db_connection, cache_file, ttl=60)
+        mock_db_connection.reset_mock()
+
+        # When
+        with patch(f"{MODULE}.time.time", return_value=10 ** 12):
+            lookup = CachedAgidNameLookupImpl(mock_db_connection, cache_file, ttl=60)
+
+        # Then
+        assert lookup.dest_agid_name("src1") == "dest1"
+        mock_db_connection.fetch_one.assert_called_once_with(CachedAgidNameLookupImpl._SIGNATURE_QUERY)
+        mock_db_connection.iter_rows.assert_not_called()
+
+    def test_expired_cache_with_changed_source_is_reloaded(
+        self,
+        mock_db_connection: MagicMock,
+        cache_file: Path
+    ) -> None:
+        # Given
+        CachedAgidNameLookupImpl(mock_db_connection, cache_file, ttl=60)
+        mock_db_connection.fetch_one.return_value = (3,)
+        mock_db_connection.iter_rows.side_effect = lambda query: iter([("src3", "dest3")])
+
+        # When
+        lookup = CachedAgidNameLookupImpl(mock_db_connection, cache_file, ttl=0)
+
+        # Then
+        assert lookup._dict == {"src3": "dest3"}
+        assert CachedAgidNameLookupImpl(MagicMock(spec=DBConnection), cache_file, ttl=60)._dict == {"src3": "dest3"}
+
+    def test_stale_cache_is_used_when_db_is_unavailable(
+        self,
+        mock_db_connection: MagicMock,
+        cache_file: Path
+    ) -> None:
+        # Given
+        CachedAgidNameLookupImpl(mock_db_connection, cache_file, ttl=60)
+        mock_db_connection.fetch_one.side_effect = ConnectionError("DB2 down")
+
+        # When
+        lookup = CachedAgidNameLookupImpl(mock_db_connection, cache_file, ttl=0)
+
+        # Then
+        assert lookup.dest_agid_name("src1") == "dest1"
+
+    def test_db_error_without_cache_is_raised(
+        self,
+        mock_db_connection: MagicMock,
+        cache_file: Path
+    ) -> None:
+        # Given
+        mock_db_connection.fetch_one.side_effect = ConnectionError("DB2 down")
+
+        # When/Then
+        with pytest.raises(ConnectionError):
+            CachedAgidNameLookupImpl(mock_db_connection, cache_file, ttl=60)
+
+    def test_shared_lookup_sees_new_mappings_after_ttl(
+        self,
+        mock_db_connection: MagicMock,
+        cache_file: Path
+    ) -> None:
+        # Given
+        lookup = CachedAgidNameLookupImpl(mock_db_connection, cache_file, ttl=60)
+        mock_db_connection.fetch_one.return_value = (3,)
+        mock_db_connection.iter_rows.side_effect = lambda query: iter([("src1", "dest1"), ("src3", "dest3")])
+
+        # When
+        with patch(f"{MODULE}.time.time", return_value=10 ** 12), \
+                patch("unit_of_work.linker.agid_name_lookup.agid_name_lookup_impl.time.monotonic", return_value=10 ** 12):
+            result = lookup.dest_agid_name("src3")
+
+        # Then
+        assert result == "dest3"
+        assert mock_db_connection.iter_rows.call_count == 2
@@ -0,0 +1,92 @@
+from unittest.mock import MagicMock, patch
+import pytest
+
+from unit_of_work.db2.db_connection import DBConnection
+from unit_of_work.linker.agid_name_lookup.agid_name_lookup_impl import RemagError
+from unit_of_work.linker.agid_name_lookup.tape_scoped_agid_name_lookup_impl import TapeScopedAgidNameLookupImpl
+
+MODULE = "unit_of_work.linker.agid_name_lookup.tape_scoped_agid_name_lookup_impl"
+
+MIG_MAPPING = {"AAA": "SFB", "BBB": "TGC", "CCC": "UHD"}
+
+@pytest.fixture
+def mock_db_connection() -> MagicMock:
+    connection = MagicMock(spec=DBConnection)
+    connection.iter_rows.side_effect = lambda query, params: iter(
+        [(name, MIG_MAPPING[name]) for name in params if name in MIG_MAPPING]
+    )
+    return connection
+
+class TestTapeScopedAgidNameLookupImpl:
+
+    def test_construction_does_not_query(self, mock_db_connection: MagicMock) -> None:
+        # Given/When
+        TapeScopedAgidNameLookupImpl(mock_db_connection)
+
+        # Then
+        mock_db_connection.iter_rows.assert_not_called()
+
+    def test_prefetch_fetches_only_given_agids_in_batches(self, mock_db_connection: MagicMock) -> None:
+        # Given
+        lookup = TapeScopedAgidNameLookupImpl(mock_db_connection, batch_size=2)
+
+        # When
+        lookup.prefetch(["BBB", "AAA", "AAA", "CCC"])
+
+        # Then
+        assert [call.args for call in mock_db_connection.iter_rows.call_args_list] == [
+            ("SELECT agid_name_src, agid_name_dst FROM mig_mapping WHERE agid_name_src IN (?, ?)", ("AAA", "BBB")),
+            ("SELECT agid_name_src, agid_name_dst FROM mig_mapping WHERE agid_name_src IN (?)", ("CCC",))
+        ]
+        assert lookup.dest_agid_name("CCC") == "UHD"
+        assert mock_db_connection.iter_rows.call_count == 2
+
+    def test_prefetch_skips_cached_agids(self, mock_db_connection: MagicMock) -> None:
+        # Given
+        lookup = TapeScopedAgidNameLookupImpl(mock_db_connection)
+        lookup.prefetch(["AAA"])
+
+        # When
+        lookup.prefetch(["AAA", "BBB"])
+
+        # Then
+        assert mock_db_connection.iter_rows.call_args.args[1] == ("BBB",)
+
+    def test_missing_agid_is_queried_once(self, mock_db_connection: MagicMock) -> None:
+        # Given
+        lookup = TapeScopedAgidNameLookupImpl(mock_db_connection)
+        lookup.prefetch(["ZZZ"])
+
+        # When/Then
+        for _ in range(3):
+            with pytest.raises(RemagError):
+                lookup.dest_agid_name("ZZZ")
+        mock_db_connection.iter_rows.assert_called_once()
+
+    def test_missing_agid_is_queried_again_after_negative_ttl(self, mock_db_connection: MagicMock) -> None:
+        # Given
+        lookup = TapeScopedAgidNameLookupImpl(mock_db_connection, negative_ttl=60)
+        with patch(f"{MODULE}.time.monotonic", return_value=1000):
+            lookup.prefetch(["ZZZ"])
+
+        # When
+        MIG_MAPPING["ZZZ"] = "NEW"
+        try:
+            with patch(f"{MODULE}.time.monotonic", return_value=1061):
+                result = lookup.dest_agid_name("ZZZ")
+        finally:
+            del MIG_MAPPING["ZZZ"]
+
+        # Then
+        assert result == "NEW"
+
+    def test_lookup_without_prefetch_fetches_single_agid(self, mock_db_connection: MagicMock) -> None:
+        # Given
+        lookup = TapeScopedAgidNameLookupImpl(mock_db_connection)
+
+        # When
+        result = lookup.dest_agid_name("BBB")
+
+        # Then
+        assert result == "TGC"
+        assert mock_db_connection.iter_rows.call_args.args[1] == ("BBB",)
@@ -1,9 +1,11 @@
+import os
 from pathlib import Path
-from typing import Dict, Optional
+from typing import List, Union
 from unittest.mock import Mock, patch
 import pytest
 
 from unit_of_work.linker.link_creator.link_creator_impl import LinkCreatorImpl
+from unit_of_work.linker.link_creator.link_result import LinkResult
 
 FEATURE = """
 Feature: Symlink Creation
@@ -51,6 +53,21 @@ def path_transformer(target_base_dir) -> Mock:
         return target_path
 
     mock_transformer.transform.side_effect = transform_path
+
+    def transform_batch(names: List[str], target_base_dir: Path) -> List[Union[Path, Exception]]:
+        results: List[Union[Path, Exception]] = []
+        for name in names:
+            try:
+                results.append(mock_transformer.transform(Path(name), target_base_dir))
+            except Exception as e:
+                results.append(e)
+        return results
+
+    mock_transformer.transform_batch.side_effect = transform_batch
+    mock_transformer.target_locations.side_effect = lambda names, target_base_dir: [
+        result if isinstance(result, Exception) else (str(result.parent), result.name)
+        for result in mock_transformer.transform_batch(names, target_base_dir)
+    ]
     return mock_transformer
 
 class TestLinkCreator:
@@ -69,12 +86,12 @@ class TestLinkCreator:
 
         # When
 
-        results: Dict[Path, Optional[Exception]] = link_creator.create_links()
+        result: LinkResult = link_creator.create_links()
 
         # Then
-        assert len(results) == 1
-        assert results[source_file] is None
-        path_transformer.transform.assert_called_once_with(source_file, target_base_dir)
+        assert result.succeeded == 1
+        assert result.failed == 0
+        path_transformer.transform_batch.assert_called_once_with(["test.txt"], target_base_dir)
         assert expected_target.exists()
         assert expected_target.stat().st_nlink == 2
         assert expected_target.stat().st_ino == source_file.stat().st_ino  # Verify same inode
@@ -93,11 +110,12 @@ class TestLinkCreator:
         (target_base_dir / "test.txt").touch()
 
         # When
-        results = link_creator.create_links()
+        result = link_creator.create_links()
 
         # Then
-        assert len(results) == 1
-        assert isinstance(results[source_file], FileExistsError)
+        assert result.succeeded == 0
+        assert result.failure_counts == {"FileExistsError": 1}
+        assert result.failures[0].source_file == source_file
 
     def test_create_symlinks_empty_source(
         self,
@@ -105,10 +123,11 @@ class TestLinkCreator:
     ) -> None:
         """Should handle empty source directory gracefully"""
         # When
-        results = link_creator.create_links()
+        result = link_creator.create_links()
 
         # Then
-        assert len(results) == 0
+        assert result.succeeded == 0
+        assert result.failed == 0
 
     @pytest.mark.parametrize(
         "file_patterns",
@@ -123,6 +142,7 @@ class TestLinkCreator:
         self,
         link_creator: LinkCreatorImpl,
         source_dir: Path,
+        target_base_dir: Path,
         file_patterns: list[str]
     ) -> None:
         """Should only process files matching the specified pattern"""
@@ -135,13 +155,13 @@ class TestLinkCreator:
         other_file.touch()
 
         # When
-        results = link_creator.create_links()
+        result = link_creator.create_links()
 
         # Then
-        assert len(results) == 2
-        assert txt_file1 in results
-        assert txt_file2 in results
-        assert other_file not in results
+        assert result.succeeded == 2
+        assert (target_base_dir / "AAA.BBB.CCC").exists()
+        assert (target_base_dir / "AAA.BBB").exists()
+        assert not (target_base_dir / "AAA").exists()
 
     @patch('unit_of_work.linker.link_creator.link_creator_impl.logger')
     def test_create_symlinks_transformation_error(
@@ -159,20 +179,167 @@ class TestLinkCreator:
         path_transformer.transform.side_effect = ValueError("Invalid path")
 
         # When
-        results = link_creator.create_links()
+        result = link_creator.create_links()
 
         # Then
-        assert len(results) == 1
-        assert isinstance(results[source_file], ValueError)
+        assert result.failure_counts == {"ValueError": 1}
+        assert result.failures[0].source_file == source_file
         mock_logger.error.assert_called_once()
         print(mock_logger.error.call_args)
         
-    def test_get_source_files_deduplication(self, link_creator: LinkCreatorImpl, source_dir: Path):
-        with patch.object(Path, "glob", side_effect=[
-            [Path("/path/to/source/file1.txt")],
-            [Path("/path/to/source/file1.txt")]
-        ]):
-            source_files = link_creator._get_source_files()
-            assert len(source_files) == 1
-            assert source_files[0] == Path("/path/to/source/file1.txt")
-        
\ No newline at end of file
+    @pytest.mark.parametrize("file_patterns", [["AAA.*", "*.BBB"]], indirect=True)
+    def test_get_source_files_single_pass(
+        self,
+        link_creator: LinkCreatorImpl,
+        source_dir: Path
+    ) -> None:
+        """Should list each matching regular file once, even if several patterns match it"""
+        # Given
+        (source_dir / "AAA.BBB").touch()
+        (source_dir / "CCC.BBB").touch()
+        (source_dir / "DDD.EEE").touch()
+        (source_dir / "AAA.DIR").mkdir()
+
+        # When
+        with patch("unit_of_work.utils.file_scanner.os.scandir", wraps=os.scandir) as scandir:
+            source_files = sorted(link_creator._get_source_files())
+
+        # Then
+        assert source_files == [source_dir / "AAA.BBB", source_dir / "CCC.BBB"]
+        scandir.assert_called_once_with(source_dir)
+
+    def test_link_files_links_only_given_files_and_reports_targets(
+        self,
+        link_creator: LinkCreatorImpl,
+        source_dir: Path,
+        target_base_dir: Path
+    ) -> None:
+        """Should link just the given files and report every created link"""
+        # Given
+        linked_file = source_dir / "AAA.BBB"
+        linked_file.touch()
+        (source_dir / "CCC.DDD").touch()
+        reported = []
+
+        # When
+        result = link_creator.link_files(
+            [linked_file],
+            on_linked=lambda source, target: reported.append((source, target))
+        )
+
+        # Then
+        assert (result.succeeded, result.failed) == (1, 0)
+        assert reported == [(linked_file, target_base_dir / "AAA.BBB")]
+        assert not (target_base_dir / "CCC.DDD").exists()
+
+
+    def test_link_files_creates_each_target_directory_once(
+        self,
+        link_creator: LinkCreatorImpl,
+        source_dir: Path,
+        target_base_dir: Path,
+        path_transformer: Mock
+    ) -> None:
+        """Should create every distinct target directory once and link into it"""
+        # Given
+        path_transformer.transform.side_effect = lambda path, base: base / path.name[:3] / "LOAD1" / path.name
+        source_files = [source_dir / f"{agid}.{i}" for agid in ("AAA", "BBB") for i in range(5)]
+        for source_file in source_files:
+            source_file.touch()
+        (target_base_dir / "AAA").mkdir()
+        (target_base_dir / "BBB").mkdir()
+
+        # When
+        with patch("unit_of_work.linker.link_creator.link_creator_impl.os.makedirs", wraps=os.makedirs) as makedirs:
+            result = link_creator.link_files(source_files)
+
+        # Then
+        assert (result.succeeded, result.failed) == (10, 0)
+        assert sorted(call.args[0] for call in makedirs.call_args_list) == [
+            str(target_base_dir / "AAA" / "LOAD1"),
+            str(target_base_dir / "BBB" / "LOAD1")
+        ]
+        assert (target_base_dir / "BBB" / "LOAD1" / "BBB.4").stat().st_ino == source_files[-1].stat().st_ino
+
+    def test_link_files_transforms_in_bounded_chunks_sharing_directories(
+        self,
+        link_creator: LinkCreatorImpl,
+        source_dir: Path,
+        target_base_dir: Path,
+        path_transformer: Mock
+    ) -> None:
+        """Should consume the source files lazily in chunks and create each directory once across chunks"""
+        # Given
+        link_creator._CHUNK_SIZE = 2
+        path_transformer.transform.side_effect = lambda path, base: base / "LOAD1" / path.name
+        source_files = [source_dir / f"AAA.{i}" for i in range(5)]
+        for source_file in source_files:
+            source_file.touch()
+
+        # When
+        with patch("unit_of_work.linker.link_creator.link_creator_impl.os.makedirs", wraps=os.makedirs) as makedirs:
+            result = link_creator.link_files(iter(source_files))
+
+        # Then
+        assert (result.succeeded, result.failed) == (5, 0)
+        assert [len(call.args[0]) for call in path_transformer.transform_batch.call_args_list] == [2, 2, 1]
+        assert [call.args[0] for call in makedirs.call_args_list] == [str(target_base_dir / "LOAD1")]
+
+    def test_link_files_fails_only_files_below_uncreatable_directory(
+        self,
+        link_creator: LinkCreatorImpl,
+        source_dir: Path,
+        target_base_dir: Path,
+        path_transformer: Mock
+    ) -> None:
+        """Should report a directory creation error against the files below it only"""
+        # Given
+        (target_base_dir / "AAA").touch()
+        path_transformer.transform.side_effect = lambda path, base: base / path.name[:3] / path.name
+        blocked_file = source_dir / "AAA.1"
+        linked_file = source_dir / "BBB.1"
+        blocked_file.touch()
+        linked_file.touch()
+
+        # When
+        result = link_creator.link_files([blocked_file, linked_file])
+
+        # Then
+        assert result.succeeded == 1
+        assert [failure.source_file for failure in result.failures] == [blocked_file]
+        assert (target_base_dir / "BBB" / "BBB.1").exists()
+
+
+    @patch('unit_of_work.linker.link_creator.link_creator_impl.logger')
+    def test_failures_are_summarised_once_and_written_to_failure_file(
+        self,
+        mock_logger: Mock,
+        source_dir: Path,
+        target_base_dir: Path,
+        path_transformer: Mock,
+        tmp_path: Path
+    ) -> None:
+        """Should log a single summary for many failures and list them in the failure file"""
+        # Given
+        failure_file = tmp_path / "link_failures.tsv"
+        link_creator = LinkCreatorImpl(
+            source_dir=source_dir,
+            output_directory=target_base_dir,
+            file_patterns=["*"],
+            path_transformer=path_transformer,
+            failure_file=failure_file
+        )
+        path_transformer.transform.side_effect = ValueError("Invalid path")
+        source_files = [source_dir / f"ZZZ.L{i}" for i in range(100)]
+        for source_file in source_files:
+            source_file.touch()
+
+        # When
+        result = link_creator.link_files(source_files)
+
+        # Then
+        assert result.failed == 100
+        assert result.failure_manifest == failure_file
+        mock_logger.error.assert_called_once()
+        assert "0 successful, 100 failed" in mock_logger.error.call_args.args[0]
+        assert len(failure_file.read_text().splitlines()) == 100
@@ -0,0 +1,58 @@
+from pathlib import Path
+
+from unit_of_work.linker.agid_name_lookup.agid_name_lookup_impl import RemagError
+from unit_of_work.linker.link_creator.link_result import LinkResult
+
+
+class TestLinkResult:
+    def test_counts_failures_per_reason_with_bounded_samples(self) -> None:
+        """Should count every failure but keep only a few examples per reason"""
+        # Given
+        result = LinkResult(max_samples=2)
+        error = RemagError("Missing entry in remag table for src_agid_name: ZZZ")
+
+        # When
+        for i in range(1000):
+            result.add_failure(Path(f"/slicer/ZZZ.L{i}"), error)
+        result.add_failure(Path("/slicer/AAA.L1"), FileExistsError("exists"))
+        for _ in range(7):
+            result.add_success()
+        summary = result.summary()
+
+        # Then
+        assert result.failed == 1001
+        assert result.failure_counts == {"RemagError": 1000, "FileExistsError": 1}
+        assert summary.startswith("Link creation completed: 7 successful, 1001 failed; RemagError: 1000 (e.g. ")
+        assert "/slicer/ZZZ.L1 [" in summary
+        assert "/slicer/ZZZ.L2 [" not in summary
+        assert "FileExistsError: 1 (e.g. /slicer/AAA.L1 [exists])" in summary
+
+    def test_writes_every_failure_to_failure_file(self, tmp_path: Path) -> None:
+        """Should append one line per failing file to the side file"""
+        # Given
+        failure_file = tmp_path / "log" / "link_failures.tsv"
+        result = LinkResult(failure_file, max_samples=1)
+
+        # When
+        result.add_failure(Path("/slicer/ZZZ.L1"), RemagError("missing ZZZ"))
+        result.add_failure(Path("/slicer/ZZZ.L2"), RemagError("missing ZZZ"))
+        result.close()
+
+        # Then
+        assert failure_file.read_text().splitlines() == [
+            "/slicer/ZZZ.L1\tRemagError\tmissing ZZZ",
+            "/slicer/ZZZ.L2\tRemagError\tmissing ZZZ"
+        ]
+        assert str(failure_file) in result.summary()
+
+    def test_summary_without_failures(self) -> None:
+        """Should result only the counters when nothing failed"""
+        # Given
+        result = LinkResult()
+
+        # When
+        for _ in range(3):
+            result.add_success()
+
+        # Then
+        assert result.summary() == "Link creation completed: 3 successful, 0 failed"
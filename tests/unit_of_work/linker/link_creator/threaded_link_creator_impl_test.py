@@ -0,0 +1,126 @@
+from pathlib import Path
+from typing import List, Union
+from unittest.mock import Mock
+import pytest
+
+from unit_of_work.linker.link_creator.link_result import LinkResult
+from unit_of_work.linker.link_creator.threaded_link_creator_impl import ThreadedLinkCreatorImpl
+
+FEATURE = """
+Feature: Parallel Link Creation
+    As a system processor
+    I want links to be created by several workers
+    So that per-file filesystem latency does not serialise the linker
+"""
+
+@pytest.fixture
+def source_dir(tmp_path: Path) -> Path:
+    source = tmp_path / "source"
+    source.mkdir()
+    return source
+
+@pytest.fixture
+def target_base_dir(tmp_path: Path) -> Path:
+    target = tmp_path / "target"
+    target.mkdir()
+    return target
+
+@pytest.fixture
+def path_transformer() -> Mock:
+    mock_transformer = Mock()
+
+    def transform_path(path: Path, target_base_dir: Path) -> Path:
+        if path.name.startswith("BAD"):
+            raise ValueError(f"No AGID for {path.name}")
+        return target_base_dir / path.name[:2] / path.name
+
+    mock_transformer.transform.side_effect = transform_path
+
+    def transform_batch(names: List[str], target_base_dir: Path) -> List[Union[Path, Exception]]:
+        results: List[Union[Path, Exception]] = []
+        for name in names:
+            try:
+                results.append(mock_transformer.transform(Path(name), target_base_dir))
+            except Exception as e:
+                results.append(e)
+        return results
+
+    mock_transformer.transform_batch.side_effect = transform_batch
+    mock_transformer.target_locations.side_effect = lambda names, target_base_dir: [
+        result if isinstance(result, Exception) else (str(result.parent), result.name)
+        for result in mock_transformer.transform_batch(names, target_base_dir)
+    ]
+    return mock_transformer
+
+@pytest.fixture
+def link_creator(source_dir: Path, target_base_dir: Path, path_transformer: Mock) -> ThreadedLinkCreatorImpl:
+    return ThreadedLinkCreatorImpl(
+        source_dir=source_dir,
+        output_directory=target_base_dir,
+        file_patterns=["*"],
+        path_transformer=path_transformer,
+        max_workers=4
+    )
+
+class TestThreadedLinkCreator:
+    def test_links_all_files_and_reports_failures_per_file(
+        self,
+        link_creator: ThreadedLinkCreatorImpl,
+        source_dir: Path,
+        target_base_dir: Path
+    ) -> None:
+        """Should link every valid file and report each failure against its source file"""
+        # Given
+        good_files: List[Path] = [source_dir / f"F{i % 7}.{i:05d}" for i in range(300)]
+        bad_file: Path = source_dir / "BAD.00001"
+        for source_file in good_files + [bad_file]:
+            source_file.touch()
+
+        # When
+        result: LinkResult = link_creator.create_links()
+
+        # Then
+        assert result.succeeded == 300
+        assert [(failure.source_file, failure.reason) for failure in result.failures] == [(bad_file, "ValueError")]
+        for source_file in good_files:
+            target = target_base_dir / source_file.name[:2] / source_file.name
+            assert target.stat().st_ino == source_file.stat().st_ino
+
+    def test_callbacks_and_failures_follow_source_order(
+        self,
+        link_creator: ThreadedLinkCreatorImpl,
+        source_dir: Path
+    ) -> None:
+        """Should call on_linked and sample failures in source order regardless of scheduling"""
+        # Given
+        link_creator._CHUNK_SIZE_PER_WORKER = 3
+        source_files: List[Path] = [source_dir / f"F{i}.{i:05d}" for i in range(50)]
+        bad_files: List[Path] = [source_dir / f"BAD{i}.{i:05d}" for i in range(4)]
+        for source_file in source_files + bad_files:
+            source_file.touch()
+        linked: List[Path] = []
+        interleaved: List[Path] = [file for pair in zip(source_files, bad_files) for file in pair] + source_files[4:]
+
+        # When
+        result = link_creator.link_files(interleaved, on_linked=lambda source, _: linked.append(source))
+
+        # Then
+        assert linked == source_files
+        assert [failure.source_file for failure in result.failures] == bad_files
+
+    def test_rejects_non_positive_worker_count(
+        self,
+        source_dir: Path,
+        target_base_dir: Path,
+        path_transformer: Mock
+    ) -> None:
+        """Should refuse a pool without workers"""
+        # When / Then
+        with pytest.raises(ValueError):
+            ThreadedLinkCreatorImpl(
+                source_dir=source_dir,
+                output_directory=target_base_dir,
+                file_patterns=["*"],
+                path_transformer=path_transformer,
+                max_workers=0
+            )
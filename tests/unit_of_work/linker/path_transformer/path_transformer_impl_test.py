@@ -88,4 +88,100 @@ class TestPathTransformation:
         result = transformer.transform(input_path, target_base)
 
         # Then
-        assert result.name == expected_suffix
\ No newline at end of file
+        assert result.name == expected_suffix
+
+    def test_transform_batch_matches_transform(self, transformer, agid_name_lookup):
+        """Should return the same paths as transform and report failures in place"""
+        # Given
+        names = ["AAG.L123.FAAA", "AAG.L123", "BBH.L456.FBBB", "invalid_format", "AAG.L789.FCCC"]
+        target_base = Path("/ars/data/spool/output/A12345/linker")
+
+        # When
+        results = transformer.transform_batch(names, target_base)
+
+        # Then
+        assert results[0] == transformer.transform(Path(names[0]), target_base)
+        assert results[1] == Path("/ars/data/spool/output/A12345/linker/SFB/RES/123")
+        assert results[2] == Path("/ars/data/spool/output/A12345/linker/TGC/456FBB/456FBBB")
+        assert isinstance(results[3], ValueError)
+        assert results[4] == Path("/ars/data/spool/output/A12345/linker/SFB/789FCC/789FCCC")
+
+    def test_target_locations_match_transform_batch(self, transformer, agid_name_lookup):
+        # Given
+        names = ["AAG.L123.FAAA", "AAG.L123", "UNSUPPORTED"]
+        target_base = Path("/ars/data/spool/output/A12345/linker")
+
+        # When
+        locations = transformer.target_locations(names, target_base)
+
+        # Then
+        assert locations[:2] == [
+            (str(path.parent), path.name) for path in transformer.transform_batch(names[:2], target_base)
+        ]
+        assert isinstance(locations[2], ValueError)
+
+    def test_transform_batch_looks_up_each_agid_once(self, transformer, agid_name_lookup):
+        """Should reuse the destination prefix of an AGID within a batch"""
+        # Given
+        names = [f"AAG.L{i:03d}.FAAA" for i in range(100)] + ["BBH.L456"]
+
+        # When
+        transformer.transform_batch(names, Path("/linker"))
+
+        # Then
+        assert [call.args[0] for call in agid_name_lookup.dest_agid_name.call_args_list] == ["AAG", "BBH"]
+
+    def test_transform_batch_reports_lookup_errors(self, transformer, agid_name_lookup):
+        """Should report a failed AGID lookup against every file of that AGID"""
+        # Given
+        agid_name_lookup.dest_agid_name.side_effect = KeyError("CCC")
+
+        # When
+        results = transformer.transform_batch(["CCC.L1.F1", "CCC.L2"], Path("/linker"))
+
+        # Then
+        assert all(isinstance(result, KeyError) for result in results)
+
+    def test_transform_batch_prefetches_distinct_agids(self, transformer, agid_name_lookup):
+        """Should hint the lookup with the distinct source AGIDs of the batch first"""
+        # When
+        transformer.transform_batch(["AAG.L1.FAAA", "AAG.L2", "BBH.L3.FBBB"], Path("/linker"))
+
+        # Then
+        agid_name_lookup.prefetch.assert_called_once_with({"AAG", "BBH"})
+
+    def test_transform_batch_shares_lookup_error_of_an_agid(self, transformer, agid_name_lookup):
+        """Should look up a failing AGID once and report the same error for all its files"""
+        # Given
+        agid_name_lookup.dest_agid_name.side_effect = KeyError("CCC")
+
+        # When
+        results = transformer.transform_batch([f"CCC.L{i}.F1" for i in range(50)], Path("/linker"))
+
+        # Then
+        agid_name_lookup.dest_agid_name.assert_called_once_with("CCC")
+        assert all(result is results[0] for result in results)
+
+    def test_transform_batch_reports_malformed_name_for_that_file_only(self, transformer, agid_name_lookup):
+        """Should not fail the other files of an AGID because one of its names is malformed"""
+        # When
+        results = transformer.transform_batch(["AAG.L1.F1.extra", "AAG.L123.FAAA"], Path("/linker"))
+
+        # Then
+        assert isinstance(results[0], ValueError)
+        assert "Unsupported path type" in str(results[0])
+        assert results[1] == Path("/linker/SFB/123FAA/123FAAA")
+
+    def test_object_keys_are_paths_relative_to_target_base(self, transformer):
+        """Should return the target path below the base directory as a posix key"""
+        # Given
+        names = ["AAG.L123.FAAA", "BBH.L456", "invalid_format"]
+        target_base = Path("/ars/data/spool/output/A12345/linker")
+
+        # When
+        keys = transformer.object_keys(names)
+
+        # Then
+        assert keys[0] == transformer.transform(Path(names[0]), target_base).relative_to(target_base).as_posix()
+        assert keys[1] == "TGC/RES/456"
+        assert isinstance(keys[2], ValueError)
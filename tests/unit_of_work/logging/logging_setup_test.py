@@ -0,0 +1,51 @@
+import logging
+import logging.handlers
+import threading
+from pathlib import Path
+from typing import Iterator
+
+import pytest
+
+from unit_of_work.logging import logging_setup
+
+
+class TestLoggingSetup:
+    @pytest.fixture(autouse=True)
+    def restore_root_logger(self) -> Iterator[None]:
+        root_logger = logging.getLogger()
+        handlers, level = list(root_logger.handlers), root_logger.level
+        yield
+        logging_setup.shutdown_logging()
+        root_logger.handlers[:] = handlers
+        root_logger.setLevel(level)
+
+    def test_records_of_worker_threads_reach_the_log_file(self, tmp_path: Path) -> None:
+        # Given
+        log_file = tmp_path / "log" / "unit_of_work.log"
+        logging_setup.setup_logging(log_file)
+        logger = logging.getLogger("unit_of_work.test")
+
+        # When
+        worker = threading.Thread(target=logger.info, args=("Linked %s files", 3))
+        worker.start()
+        worker.join()
+        logger.debug("Filtered out %s", "debug")
+        logging_setup.shutdown_logging()
+
+        # Then
+        lines = log_file.read_text().splitlines()
+        assert len(lines) == 1
+        assert lines[0].endswith(" - INFO - Linked 3 files")
+
+    def test_root_logger_only_enqueues(self, tmp_path: Path) -> None:
+        # Given
+        handlers_before = list(logging.getLogger().handlers)
+
+        # When
+        logging_setup.setup_logging(tmp_path / "first.log")
+        logging_setup.setup_logging(tmp_path / "second.log")
+
+        # Then
+        added = [handler for handler in logging.getLogger().handlers if handler not in handlers_before]
+        assert len(added) == 1
+        assert isinstance(added[0], logging.handlers.QueueHandler)
@@ -0,0 +1,92 @@
+import json
+import threading
+from pathlib import Path
+
+from unit_of_work.metrics.metrics_publisher_impl import MetricsPublisherImpl
+from unit_of_work.metrics.unit_of_work_metrics import UnitOfWorkMetrics
+
+
+def _metrics(succeeded: bool, uploaded_bytes: int) -> UnitOfWorkMetrics:
+    metrics = UnitOfWorkMetrics()
+    with metrics.stage("linker") as stage:
+        stage.files = 3
+        stage.failed_files = 1
+    with metrics.stage("uploader") as stage:
+        stage.files = 3
+        stage.bytes = uploaded_bytes
+    metrics.finish(succeeded)
+    return metrics
+
+
+class TestMetricsPublisherImpl:
+    def test_textfile_accumulates_counters_per_stage(self, tmp_path: Path) -> None:
+        # Given
+        textfile = tmp_path / "textfile" / "unit_of_work.prom"
+        publisher = MetricsPublisherImpl(textfile=textfile, gauges=lambda: {"upload_concurrency_limit": 8})
+
+        # When
+        publisher.publish("tape1", _metrics(True, 12345678901))
+        publisher.publish("tape2", _metrics(False, 1))
+
+        # Then
+        lines = textfile.read_text().splitlines()
+        assert 'unit_of_work_stage_bytes_total{stage="uploader"} 12345678902' in lines
+        assert 'unit_of_work_stage_files_total{stage="linker"} 6' in lines
+        assert 'unit_of_work_stage_failed_files_total{stage="linker"} 2' in lines
+        assert 'unit_of_work_tapes_total{outcome="finished"} 1' in lines
+        assert 'unit_of_work_tapes_total{outcome="failed"} 1' in lines
+        assert "# TYPE unit_of_work_stage_runs_total counter" in lines
+        assert "# TYPE unit_of_work_stage_last_seconds gauge" in lines
+        assert "unit_of_work_upload_concurrency_limit 8" in lines
+        assert sorted(path.name for path in textfile.parent.iterdir()) == ["unit_of_work.prom", "unit_of_work.prom.lock"]
+
+    def test_counters_continue_from_existing_textfile(self, tmp_path: Path) -> None:
+        # Given
+        textfile = tmp_path / "unit_of_work.prom"
+        MetricsPublisherImpl(textfile=textfile).publish("tape1", _metrics(True, 10))
+
+        # When
+        MetricsPublisherImpl(textfile=textfile).publish("tape2", _metrics(True, 10))
+
+        # Then
+        lines = textfile.read_text().splitlines()
+        assert 'unit_of_work_stage_bytes_total{stage="uploader"} 20' in lines
+        assert 'unit_of_work_tapes_total{outcome="finished"} 2' in lines
+
+    def test_publishers_sharing_a_textfile_keep_each_others_counts(self, tmp_path: Path) -> None:
+        # Given
+        textfile = tmp_path / "unit_of_work.prom"
+        first = MetricsPublisherImpl(textfile=textfile)
+        second = MetricsPublisherImpl(textfile=textfile)
+
+        # When
+        threads = [
+            threading.Thread(target=lambda publisher=publisher: [
+                publisher.publish("tape", _metrics(True, 1)) for _ in range(20)
+            ])
+            for publisher in (first, second)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        # Then
+        lines = textfile.read_text().splitlines()
+        assert 'unit_of_work_stage_bytes_total{stage="uploader"} 40' in lines
+        assert 'unit_of_work_tapes_total{outcome="finished"} 40' in lines
+
+    def test_history_appends_one_json_line_per_run(self, tmp_path: Path) -> None:
+        # Given
+        history_file = tmp_path / "log" / "unit_of_work_metrics.jsonl"
+        publisher = MetricsPublisherImpl(history_file=history_file)
+
+        # When
+        publisher.publish("tape1", _metrics(True, 10))
+        publisher.publish("tape2", _metrics(False, 0))
+
+        # Then
+        runs = [json.loads(line) for line in history_file.read_text().splitlines()]
+        assert [(run["tape"], run["succeeded"]) for run in runs] == [("tape1", True), ("tape2", False)]
+        assert [stage["stage"] for stage in runs[0]["stages"]] == ["linker", "uploader"]
+        assert runs[0]["stages"][1]["bytes"] == 10
@@ -0,0 +1,38 @@
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from unit_of_work.metrics.unit_of_work_metrics import UnitOfWorkMetrics
+
+
+class TestUnitOfWorkMetrics:
+    @patch('unit_of_work.metrics.unit_of_work_metrics.time.monotonic')
+    def test_stage_records_monotonic_duration_and_counts(self, mock_monotonic: MagicMock) -> None:
+        # Given
+        mock_monotonic.side_effect = [10.0, 11.0, 15.0, 16.0]
+        metrics = UnitOfWorkMetrics()
+
+        # When
+        with metrics.stage("uploader") as stage:
+            stage.files = 2
+            stage.bytes = 400
+        metrics.finish(True)
+
+        # Then
+        [recorded] = metrics.stages
+        assert (recorded.stage, recorded.seconds, recorded.failed) == ("uploader", 4.0, False)
+        assert recorded.bytes_per_second == 100.0
+        assert metrics.seconds == 6.0
+        assert metrics.to_dict()["stages"][0]["files"] == 2
+
+    def test_stage_that_raises_is_recorded_as_failed(self) -> None:
+        # Given
+        metrics = UnitOfWorkMetrics()
+
+        # When
+        with pytest.raises(ValueError):
+            with metrics.stage("slicer"):
+                raise ValueError("slicer crashed")
+
+        # Then
+        assert [(stage.stage, stage.failed) for stage in metrics.stages] == [("slicer", True)]
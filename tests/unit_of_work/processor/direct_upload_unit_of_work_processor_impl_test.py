@@ -0,0 +1,118 @@
+from pathlib import Path
+from typing import List
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from unit_of_work.linker.path_transformer.path_transformer import PathTransformer
+from unit_of_work.processor.direct_upload_unit_of_work_processor_impl import DirectUploadUnitOfWorkProcessorImpl
+from unit_of_work.sanity_checker.sanity_checker import SanityChecker
+from unit_of_work.slicer.slicer import Slicer
+from unit_of_work.tape_import_confirmer.tape_import_confirmer import TapeImportConfirmer
+from unit_of_work.tape_register.tape_register import TapeRegister
+from unit_of_work.uploader.hcp_uploader import HcpUploader
+from unit_of_work.uploader.upload_target import UploadTarget
+from unit_of_work.utils.background_deleter import BackgroundDeleter
+
+
+class TestDirectUploadUnitOfWorkProcessorImpl:
+    @pytest.fixture
+    def processor(self, tmp_path: Path) -> DirectUploadUnitOfWorkProcessorImpl:
+        def write_slicer_output(tape_location: Path, output_directory: Path, log_file: Path) -> None:
+            output_directory.mkdir(parents=True, exist_ok=True)
+            for name in ["AAG.L1.FAAA", "AAG.L2.FAAA", "AAG.L3", "invalid_format"]:
+                (output_directory / name).write_text(name)
+
+        def object_keys(names) -> List:
+            return [
+                ValueError(f"Unsupported path type: {name}") if "." not in name else "SFB/" + name
+                for name in names
+            ]
+
+        slicer = MagicMock(spec=Slicer)
+        slicer.execute.side_effect = write_slicer_output
+        path_transformer = MagicMock(spec=PathTransformer)
+        path_transformer.object_keys.side_effect = object_keys
+
+        return DirectUploadUnitOfWorkProcessorImpl(
+            tape_import_confirmer=MagicMock(spec=TapeImportConfirmer),
+            tape_register=MagicMock(spec=TapeRegister),
+            slicer=slicer,
+            sanity_checker=MagicMock(spec=SanityChecker),
+            path_transformer=path_transformer,
+            hcp_uploader=MagicMock(spec=HcpUploader),
+            slicer_output_directory=tmp_path / "slicer",
+            slicer_log=tmp_path / "log" / "slicer.log",
+            sanity_checker_log=tmp_path / "log" / "sanity.log",
+            linked_output_directory=tmp_path / "linker",
+            file_patterns=['*'],
+            upload_batch_size=2,
+            key_failure_file=tmp_path / "log" / "link_failures.tsv"
+        )
+
+    @patch('unit_of_work.processor.unit_of_work_processor_impl.delete_path')
+    def test_process_uploads_slicer_output_under_computed_keys(
+        self,
+        mock_delete_path: MagicMock,
+        processor: DirectUploadUnitOfWorkProcessorImpl,
+        tmp_path: Path
+    ) -> None:
+        # Given
+        tape_name = "tape1"
+
+        # When
+        processor.process(tape_name, Path("/path/to/tape1"))
+
+        # Then
+        targets: List[UploadTarget] = [
+            target
+            for upload_call in processor._hcp_uploader.upload_files.call_args_list
+            for target in upload_call.args[0]
+        ]
+        assert sorted((target.local_path, target.s3_key) for target in targets) == [
+            (tmp_path / "slicer" / name, "SFB/" + name) for name in ["AAG.L1.FAAA", "AAG.L2.FAAA", "AAG.L3"]
+        ]
+        assert all(len(upload_call.args[0]) <= 2 for upload_call in processor._hcp_uploader.upload_files.call_args_list)
+        assert (tmp_path / "log" / "link_failures.tsv").read_text().startswith(str(tmp_path / "slicer" / "invalid_format"))
+        assert not (tmp_path / "linker").exists()
+        processor._hcp_uploader.upload_dir.assert_not_called()
+        processor._tape_register.set_status_sanitized.assert_called_once_with(tape_name)
+        processor._tape_register.set_status_linked.assert_not_called()
+        processor._tape_register.set_status_finished.assert_called_once_with(tape_name)
+        processor._tape_register.set_status_failed.assert_not_called()
+
+    @patch('unit_of_work.processor.unit_of_work_processor_impl.delete_path')
+    def test_upload_failure_sets_status_failed(
+        self,
+        mock_delete_path: MagicMock,
+        processor: DirectUploadUnitOfWorkProcessorImpl
+    ) -> None:
+        # Given
+        tape_name = "tape2"
+        processor._hcp_uploader.upload_files.side_effect = Exception("Uploader error")
+
+        # When
+        processor.process(tape_name, Path("/path/to/tape2"))
+
+        # Then
+        processor._tape_register.set_status_finished.assert_not_called()
+        processor._tape_register.set_status_failed.assert_called_once_with(tape_name)
+        mock_delete_path.assert_not_called()
+
+    def test_background_deleter_takes_slicer_output(
+        self,
+        processor: DirectUploadUnitOfWorkProcessorImpl,
+        tmp_path: Path
+    ) -> None:
+        # Given
+        deleter = MagicMock(spec=BackgroundDeleter)
+        processor._background_deleter = deleter
+
+        # When
+        processor.process("tape3", Path("/path/to/tape3"))
+
+        # Then
+        processor._tape_register.set_status_finished.assert_called_once_with("tape3")
+        deleted = [delete_call.args[0] for delete_call in deleter.delete.call_args_list]
+        assert tmp_path / "slicer" in deleted
+        assert Path("/path/to/tape3") not in deleted
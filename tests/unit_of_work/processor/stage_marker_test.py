@@ -0,0 +1,52 @@
+from pathlib import Path
+
+from unit_of_work.processor.stage_marker import StageMarker
+from unit_of_work.tape_register.tape_status import TapeStatus
+
+
+class TestStageMarker:
+    def test_read_missing_marker_returns_nothing(self, tmp_path: Path) -> None:
+        assert StageMarker(tmp_path / "stage_marker.json").read() == {}
+
+    def test_record_accumulates_stages(self, tmp_path: Path) -> None:
+        # Given
+        marker = StageMarker(tmp_path / "work" / "stage_marker.json")
+
+        # When
+        marker.record(TapeStatus.SLICED, 3)
+        marker.record(TapeStatus.SANITIZED, 3)
+
+        # Then
+        assert marker.read() == {TapeStatus.SLICED: 3, TapeStatus.SANITIZED: 3}
+        assert not (tmp_path / "work" / "stage_marker.json.tmp").exists()
+
+    def test_unreadable_marker_is_ignored(self, tmp_path: Path) -> None:
+        # Given
+        marker_file = tmp_path / "stage_marker.json"
+        marker_file.write_text("{not json")
+
+        # When/Then
+        assert StageMarker(marker_file).read() == {}
+
+    def test_clear_removes_marker(self, tmp_path: Path) -> None:
+        # Given
+        marker = StageMarker(tmp_path / "stage_marker.json")
+        marker.record(TapeStatus.SLICED, 1)
+
+        # When
+        marker.clear()
+        marker.clear()
+
+        # Then
+        assert marker.read() == {}
+
+    def test_count_files_recurses_and_ignores_directories(self, tmp_path: Path) -> None:
+        # Given
+        (tmp_path / "SFB" / "123FAA").mkdir(parents=True)
+        (tmp_path / "SFB" / "123FAA" / "123FAAA").touch()
+        (tmp_path / "SFB" / "RES").mkdir()
+        (tmp_path / "top").touch()
+
+        # When/Then
+        assert StageMarker.count_files(tmp_path) == 2
+        assert StageMarker.count_files(tmp_path / "missing") == -1
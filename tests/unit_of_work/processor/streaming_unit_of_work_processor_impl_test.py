@@ -0,0 +1,146 @@
+from pathlib import Path
+from typing import Callable, Iterable, List, Optional
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from unit_of_work.linker.link_creator.link_creator import LinkCreator
+from unit_of_work.linker.link_creator.link_result import LinkResult
+from unit_of_work.processor.streaming_unit_of_work_processor_impl import StreamingUnitOfWorkProcessorImpl
+from unit_of_work.sanity_checker.sanity_checker import SanityChecker
+from unit_of_work.slicer.slicer import Slicer
+from unit_of_work.tape_import_confirmer.tape_import_confirmer import TapeImportConfirmer
+from unit_of_work.tape_register.tape_register import TapeRegister
+from unit_of_work.uploader.hcp_uploader import HcpUploader
+from unit_of_work.uploader.upload_target import UploadTarget
+
+
+class TestStreamingUnitOfWorkProcessorImpl:
+    @pytest.fixture
+    def processor(self, tmp_path: Path) -> StreamingUnitOfWorkProcessorImpl:
+        slicer_output_directory = tmp_path / "slicer"
+        linker_output_directory = tmp_path / "linker"
+
+        def write_slicer_output(tape_location: Path, output_directory: Path, log_file: Path) -> None:
+            output_directory.mkdir(parents=True, exist_ok=True)
+            for name in ["AAG.L1.FAAA", "AAG.L2.FAAA", "AAG.L3"]:
+                (output_directory / name).write_text(name)
+
+        def link_files(
+            source_files: Iterable[Path],
+            on_linked: Optional[Callable[[Path, Path], None]] = None
+        ) -> LinkResult:
+            result = LinkResult()
+            for source_file in source_files:
+                on_linked(source_file, linker_output_directory / "SFB" / source_file.name)
+                result.add_success()
+            return result
+
+        slicer = MagicMock(spec=Slicer)
+        slicer.execute.side_effect = write_slicer_output
+        link_creator = MagicMock(spec=LinkCreator)
+        link_creator.link_files.side_effect = link_files
+
+        return StreamingUnitOfWorkProcessorImpl(
+            tape_import_confirmer=MagicMock(spec=TapeImportConfirmer),
+            tape_register=MagicMock(spec=TapeRegister),
+            slicer=slicer,
+            sanity_checker=MagicMock(spec=SanityChecker),
+            link_creator=link_creator,
+            hcp_uploader=MagicMock(spec=HcpUploader),
+            slicer_output_directory=slicer_output_directory,
+            slicer_log=tmp_path / "log" / "slicer.log",
+            sanity_checker_log=tmp_path / "log" / "sanity.log",
+            linked_output_directory=linker_output_directory,
+            file_patterns=['[A-Z0-9]*.[A-Z0-9]*.[A-Z0-9]*', '[A-Z0-9]*.[A-Z0-9]*'],
+            poll_interval=0.01,
+            settle_seconds=0,
+            upload_batch_size=2
+        )
+
+    @staticmethod
+    def _uploaded_keys(hcp_uploader: MagicMock) -> List[str]:
+        targets: List[UploadTarget] = [
+            target
+            for upload_call in hcp_uploader.upload_files.call_args_list
+            for target in upload_call.args[0]
+        ]
+        return sorted(target.s3_key for target in targets)
+
+    @patch('unit_of_work.processor.unit_of_work_processor_impl.delete_path')
+    def test_process_links_and_uploads_all_slicer_output(
+        self,
+        mock_delete_path: MagicMock,
+        processor: StreamingUnitOfWorkProcessorImpl
+    ) -> None:
+        # Given
+        tape_name = "tape1"
+        tape_location = Path("/path/to/tape1")
+
+        # When
+        processor.process(tape_name, tape_location)
+
+        # Then
+        assert self._uploaded_keys(processor._hcp_uploader) == ["SFB/AAG.L1.FAAA", "SFB/AAG.L2.FAAA", "SFB/AAG.L3"]
+        processor._hcp_uploader.upload_dir.assert_not_called()
+        processor._sanity_checker.execute.assert_called_once()
+        processor._tape_register.set_status_exported.assert_called_once_with(tape_name)
+        processor._tape_register.set_status_sliced.assert_called_once_with(tape_name)
+        processor._tape_register.set_status_sanitized.assert_called_once_with(tape_name)
+        processor._tape_register.set_status_linked.assert_called_once_with(tape_name)
+        processor._tape_register.set_status_finished.assert_called_once_with(tape_name)
+        processor._tape_register.set_status_failed.assert_not_called()
+        mock_delete_path.assert_any_call(processor._slicer_output_directory, False)
+
+    @patch('unit_of_work.processor.unit_of_work_processor_impl.delete_path')
+    def test_sanity_checker_failure_blocks_finished_status(
+        self,
+        mock_delete_path: MagicMock,
+        processor: StreamingUnitOfWorkProcessorImpl
+    ) -> None:
+        # Given
+        tape_name = "tape2"
+        processor._sanity_checker.execute.side_effect = Exception("Sanity checker error")
+
+        # When
+        processor.process(tape_name, Path("/path/to/tape2"))
+
+        # Then
+        processor._tape_register.set_status_finished.assert_not_called()
+        processor._tape_register.set_status_failed.assert_called_once_with(tape_name)
+        mock_delete_path.assert_not_called()
+
+    @patch('unit_of_work.processor.unit_of_work_processor_impl.delete_path')
+    def test_upload_failure_sets_status_failed(
+        self,
+        mock_delete_path: MagicMock,
+        processor: StreamingUnitOfWorkProcessorImpl
+    ) -> None:
+        # Given
+        tape_name = "tape3"
+        processor._hcp_uploader.upload_files.side_effect = Exception("Uploader error")
+
+        # When
+        processor.process(tape_name, Path("/path/to/tape3"))
+
+        # Then
+        processor._tape_register.set_status_finished.assert_not_called()
+        processor._tape_register.set_status_failed.assert_called_once_with(tape_name)
+
+    @patch('unit_of_work.processor.unit_of_work_processor_impl.delete_path')
+    def test_slicer_failure_stops_before_sanity_checker(
+        self,
+        mock_delete_path: MagicMock,
+        processor: StreamingUnitOfWorkProcessorImpl
+    ) -> None:
+        # Given
+        tape_name = "tape4"
+        processor._slicer.execute.side_effect = Exception("Slicer error")
+
+        # When
+        processor.process(tape_name, Path("/path/to/tape4"))
+
+        # Then
+        processor._sanity_checker.execute.assert_not_called()
+        processor._tape_register.set_status_sliced.assert_not_called()
+        processor._tape_register.set_status_failed.assert_called_once_with(tape_name)
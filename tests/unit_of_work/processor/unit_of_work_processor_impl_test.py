@@ -7,8 +7,13 @@ from unit_of_work.tape_register.tape_register import TapeRegister
 from unit_of_work.slicer.slicer import Slicer
 from unit_of_work.sanity_checker.sanity_checker import SanityChecker
 from unit_of_work.linker.link_creator.link_creator import LinkCreator
+from unit_of_work.linker.link_creator.link_result import LinkResult
 from unit_of_work.uploader.hcp_uploader import HcpUploader
 from unit_of_work.tape_import_confirmer.tape_import_confirmer import TapeImportConfirmer
+from unit_of_work.processor.stage_marker import StageMarker
+from unit_of_work.metrics.metrics_publisher import MetricsPublisher
+from unit_of_work.uploader.upload_summary import UploadSummary
+from unit_of_work.tape_register.tape_status import TapeStatus
 
 
 class TestUnitOfWorkProcessorImpl:
@@ -19,6 +24,7 @@ class TestUnitOfWorkProcessorImpl:
         slicer = MagicMock(spec=Slicer)
         sanity_checker = MagicMock(spec=SanityChecker)
         link_creator = MagicMock(spec=LinkCreator)
+        link_creator.create_links.return_value = LinkResult()
         hcp_uploader = MagicMock(spec=HcpUploader)
 
         slicer_output_directory = Path("/mock/slicer/output")
@@ -40,7 +46,7 @@ class TestUnitOfWorkProcessorImpl:
         )
 
     @patch('unit_of_work.processor.unit_of_work_processor_impl.delete_path')
-    @patch('unit_of_work.processor.unit_of_work_processor_impl.time.time')
+    @patch('unit_of_work.metrics.unit_of_work_metrics.time.monotonic')
     def test_process_runs_all_steps_successfully(
         self,
         mock_time: MagicMock,
@@ -52,7 +58,7 @@ class TestUnitOfWorkProcessorImpl:
         tape_location = Path("/path/to/tape1")
         mock_confirmation_file = Path("/path/to/confirmation")
         processor._tape_import_confirmer.get_tape_confirmation_file.return_value = mock_confirmation_file
-        mock_time.side_effect = [1.0, 2.0, 3.0, 4.0, 5.0, 6.0, 7.0, 8.0, 9.0, 10.0]  # Updated for 5 operations
+        mock_time.side_effect = [float(tick) for tick in range(1, 13)]  # Run start, 5 stages, run end
 
         # When
         processor.process(tape_name, tape_location)
@@ -74,7 +80,7 @@ class TestUnitOfWorkProcessorImpl:
         )
         processor._link_creator.create_links.assert_called_once()
         processor._hcp_uploader.upload_dir.assert_called_once_with(
-            processor._linker_output_directory
+            processor._linker_output_directory, None
         )
 
         # Verify status updates
@@ -253,7 +259,7 @@ class TestUnitOfWorkProcessorImpl:
 
     @patch('unit_of_work.processor.unit_of_work_processor_impl.logger')
     @patch('unit_of_work.processor.unit_of_work_processor_impl.delete_path')
-    @patch('unit_of_work.processor.unit_of_work_processor_impl.time.time')
+    @patch('unit_of_work.metrics.unit_of_work_metrics.time.monotonic')
     def test_process_logs_statistics_on_success(
         self,
         mock_time: MagicMock,
@@ -266,7 +272,7 @@ class TestUnitOfWorkProcessorImpl:
         tape_location = Path("/path/to/tape7")
         mock_confirmation_file = Path("/path/to/confirmation")
         processor._tape_import_confirmer.get_tape_confirmation_file.return_value = mock_confirmation_file
-        mock_time.side_effect = [1.0, 2.0, 3.0, 4.0, 5.0, 6.0, 7.0, 8.0, 9.0, 10.0]  # 5 operations
+        mock_time.side_effect = [float(tick) for tick in range(1, 13)]  # Run start, 5 stages, run end
 
         # When
         processor.process(tape_name, tape_location)
@@ -280,12 +286,59 @@ class TestUnitOfWorkProcessorImpl:
             f"[slicer=1.0] "
             f"[sanity_checker=1.0] "
             f"[linker=1.0] "
-            f"[uploader=1.0]"
+            f"[uploader=1.0] "
+            f"[upload_skipped_bytes=0]"
         )
         mock_logger.info.assert_any_call(f"Uploader finished, working directory deleted, tape name: {tape_name}")
         mock_logger.info.assert_any_call(expected_stats_call.args[0])
         assert mock_logger.info.call_count >= 6  # At least start messages + finish + stats
 
+    @patch('unit_of_work.processor.unit_of_work_processor_impl.delete_path')
+    def test_process_publishes_stage_metrics(
+        self,
+        mock_delete_path: MagicMock,
+        processor: UnitOfWorkProcessorImpl
+    ) -> None:
+        # Given
+        processor._metrics_publisher = MagicMock(spec=MetricsPublisher)
+        link_result = LinkResult()
+        link_result.add_success()
+        link_result.add_success()
+        processor._link_creator.create_links.return_value = link_result
+        processor._hcp_uploader.upload_dir.return_value = UploadSummary(objects=2, bytes=300)
+
+        # When
+        processor.process("tape1", Path("/path/to/tape1"))
+
+        # Then
+        tape_name, metrics = processor._metrics_publisher.publish.call_args.args
+        assert tape_name == "tape1"
+        assert metrics.succeeded is True
+        assert [(stage.stage, stage.files, stage.bytes) for stage in metrics.stages] == [
+            ("confirmer_wait", 0, 0),
+            ("slicer", 0, 0),
+            ("sanity_checker", 0, 0),
+            ("linker", 2, 0),
+            ("uploader", 2, 300),
+        ]
+
+    def test_process_publishes_failed_stage(self, processor: UnitOfWorkProcessorImpl) -> None:
+        # Given
+        processor._metrics_publisher = MagicMock(spec=MetricsPublisher)
+        processor._sanity_checker.execute.side_effect = Exception("Sanity error")
+
+        # When
+        processor.process("tape1", Path("/path/to/tape1"))
+
+        # Then
+        _, metrics = processor._metrics_publisher.publish.call_args.args
+        assert metrics.succeeded is False
+        assert [(stage.stage, stage.failed) for stage in metrics.stages] == [
+            ("confirmer_wait", False),
+            ("slicer", False),
+            ("sanity_checker", True),
+        ]
+
     @patch('unit_of_work.processor.unit_of_work_processor_impl.logger')
     def test_run_slicer_logs_specific_error_on_failure(
         self,
@@ -327,4 +380,141 @@ class TestUnitOfWorkProcessorImpl:
             call(confirmation_file, True)
         ]
         assert mock_delete_path.call_count == 2
-        mock_delete_path.assert_has_calls(expected_calls)
\ No newline at end of file
+        mock_delete_path.assert_has_calls(expected_calls)
+
+
+class TestUnitOfWorkProcessorImplResume:
+    @pytest.fixture
+    def working_directory(self, tmp_path: Path) -> Path:
+        return tmp_path / "tape1"
+
+    @pytest.fixture
+    def processor(self, working_directory: Path) -> UnitOfWorkProcessorImpl:
+        link_creator = MagicMock(spec=LinkCreator)
+        link_creator.create_links.return_value = LinkResult()
+        return UnitOfWorkProcessorImpl(
+            tape_import_confirmer=MagicMock(spec=TapeImportConfirmer),
+            tape_register=MagicMock(spec=TapeRegister),
+            slicer=MagicMock(spec=Slicer),
+            sanity_checker=MagicMock(spec=SanityChecker),
+            link_creator=link_creator,
+            hcp_uploader=MagicMock(spec=HcpUploader),
+            slicer_output_directory=working_directory / "slicer",
+            slicer_log=working_directory / "log" / "slicer.log",
+            sanity_checker_log=working_directory / "log" / "sanity.log",
+            linked_output_directory=working_directory / "linker",
+            stage_marker=StageMarker(working_directory / "stage_marker.json")
+        )
+
+    @staticmethod
+    def _slice(working_directory: Path, names: list) -> None:
+        (working_directory / "slicer").mkdir(parents=True, exist_ok=True)
+        for name in names:
+            (working_directory / "slicer" / name).touch()
+
+    @patch('unit_of_work.processor.unit_of_work_processor_impl.delete_path')
+    def test_resumes_after_sanitized_without_slicing_again(
+        self,
+        mock_delete_path: MagicMock,
+        processor: UnitOfWorkProcessorImpl,
+        working_directory: Path
+    ) -> None:
+        # Given
+        self._slice(working_directory, ["AAG.L1.FAAA", "AAG.L2"])
+        processor._stage_marker.record(TapeStatus.SLICED, 2)
+        processor._stage_marker.record(TapeStatus.SANITIZED, 2)
+        processor._tape_register.get_status.return_value = TapeStatus.FAILED
+
+        # When
+        processor.process("tape1", Path("/path/to/tape1"))
+
+        # Then
+        processor._tape_import_confirmer.wait_for_confirmation.assert_not_called()
+        processor._slicer.execute.assert_not_called()
+        processor._sanity_checker.execute.assert_not_called()
+        processor._link_creator.create_links.assert_called_once()
+        processor._hcp_uploader.upload_dir.assert_called_once()
+        mock_delete_path.assert_any_call(processor._linker_output_directory, True)
+        processor._tape_register.set_status_finished.assert_called_once_with("tape1")
+        processor._tape_register.set_status_failed.assert_not_called()
+
+    @patch('unit_of_work.processor.unit_of_work_processor_impl.delete_path')
+    def test_register_status_caps_marker(
+        self,
+        mock_delete_path: MagicMock,
+        processor: UnitOfWorkProcessorImpl,
+        working_directory: Path
+    ) -> None:
+        # Given
+        self._slice(working_directory, ["AAG.L1.FAAA"])
+        processor._stage_marker.record(TapeStatus.SLICED, 1)
+        processor._stage_marker.record(TapeStatus.SANITIZED, 1)
+        processor._tape_register.get_status.return_value = TapeStatus.SLICED
+
+        # When
+        processor.process("tape1", Path("/path/to/tape1"))
+
+        # Then
+        processor._slicer.execute.assert_not_called()
+        processor._sanity_checker.execute.assert_called_once()
+
+    @patch('unit_of_work.processor.unit_of_work_processor_impl.delete_path')
+    def test_incomplete_output_starts_over(
+        self,
+        mock_delete_path: MagicMock,
+        processor: UnitOfWorkProcessorImpl,
+        working_directory: Path
+    ) -> None:
+        # Given
+        self._slice(working_directory, ["AAG.L1.FAAA"])
+        processor._stage_marker.record(TapeStatus.SLICED, 2)
+        processor._tape_register.get_status.return_value = TapeStatus.FAILED
+
+        # When
+        processor.process("tape1", Path("/path/to/tape1"))
+
+        # Then
+        processor._tape_import_confirmer.wait_for_confirmation.assert_called_once()
+        processor._slicer.execute.assert_called_once()
+
+    @patch('unit_of_work.processor.unit_of_work_processor_impl.delete_path')
+    def test_stages_are_recorded_and_marker_cleared_on_success(
+        self,
+        mock_delete_path: MagicMock,
+        processor: UnitOfWorkProcessorImpl,
+        working_directory: Path
+    ) -> None:
+        # Given
+        recorded = []
+        original_record = processor._stage_marker.record
+        processor._stage_marker.record = lambda stage, count: (recorded.append(stage), original_record(stage, count))
+
+        # When
+        processor.process("tape1", Path("/path/to/tape1"))
+
+        # Then
+        assert recorded == [TapeStatus.SLICED, TapeStatus.SANITIZED, TapeStatus.LINKED]
+        assert processor._stage_marker.read() == {}
+        processor._tape_register.get_status.assert_not_called()
+
+    @patch('unit_of_work.processor.unit_of_work_processor_impl.delete_path')
+    def test_failure_keeps_marker_for_next_run(
+        self,
+        mock_delete_path: MagicMock,
+        processor: UnitOfWorkProcessorImpl,
+        working_directory: Path
+    ) -> None:
+        # Given
+        processor._slicer.execute.side_effect = lambda **kwargs: self._slice(working_directory, ["AAG.L1"])
+        processor._hcp_uploader.upload_dir.side_effect = Exception("Uploader error")
+
+        # When
+        processor.process("tape1", Path("/path/to/tape1"))
+
+        # Then
+        assert processor._stage_marker.read() == {
+            TapeStatus.SLICED: 1,
+            TapeStatus.SANITIZED: 1,
+            TapeStatus.LINKED: -1
+        }
+        processor._tape_register.set_status_failed.assert_called_once_with("tape1")
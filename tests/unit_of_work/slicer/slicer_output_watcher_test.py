@@ -0,0 +1,114 @@
+import os
+from pathlib import Path
+from typing import Iterator, Pattern
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from unit_of_work.slicer.slicer_output_watcher import SlicerOutputModifiedError, SlicerOutputWatcher
+from unit_of_work.utils.file_scanner import scan_files
+
+PATTERNS = ['[A-Z0-9]*.[A-Z0-9]*.[A-Z0-9]*', '[A-Z0-9]*.[A-Z0-9]*']
+
+
+class TestSlicerOutputWatcher:
+    def test_file_is_ready_after_two_stable_polls(self, tmp_path: Path) -> None:
+        # Given
+        watcher = SlicerOutputWatcher(tmp_path, PATTERNS, settle_seconds=0)
+        (tmp_path / "AAG.L123.FAAA").write_text("data")
+
+        # When/Then
+        assert watcher.poll() == []
+        assert watcher.poll() == [tmp_path / "AAG.L123.FAAA"]
+        assert watcher.poll() == []
+
+    def test_poll_does_not_stat_files_handed_out(self, tmp_path: Path) -> None:
+        # Given
+        watcher = SlicerOutputWatcher(tmp_path, PATTERNS, settle_seconds=0)
+        (tmp_path / "AAG.L123.FAAA").write_text("data")
+        watcher.poll()
+        watcher.poll()
+        (tmp_path / "AAG.L123.FAAB").write_text("data")
+        stated = []
+
+        def scan_recording_stats(directory: Path, pattern: Pattern[str]) -> Iterator[os.DirEntry]:
+            for entry in scan_files(directory, pattern):
+                recorded = MagicMock(spec=os.DirEntry, stat=lambda entry=entry: stated.append(entry.name) or entry.stat())
+                recorded.name = entry.name
+                yield recorded
+
+        # When
+        with patch("unit_of_work.slicer.slicer_output_watcher.scan_files", scan_recording_stats):
+            watcher.poll()
+
+        # Then
+        assert stated == ["AAG.L123.FAAB"]
+
+    def test_growing_file_is_not_ready(self, tmp_path: Path) -> None:
+        # Given
+        watcher = SlicerOutputWatcher(tmp_path, PATTERNS, settle_seconds=0)
+        growing = tmp_path / "AAG.L123.FAAA"
+        growing.write_text("data")
+        watcher.poll()
+
+        # When
+        with growing.open("a") as f:
+            f.write("more")
+
+        # Then
+        assert watcher.poll() == []
+
+    def test_recent_file_waits_for_settle_time(self, tmp_path: Path) -> None:
+        # Given
+        watcher = SlicerOutputWatcher(tmp_path, PATTERNS, settle_seconds=3600)
+        (tmp_path / "AAG.L123").write_text("data")
+
+        # When
+        watcher.poll()
+
+        # Then
+        assert watcher.poll() == []
+        assert watcher.drain() == [tmp_path / "AAG.L123"]
+
+    def test_ignores_non_matching_files_and_missing_directory(self, tmp_path: Path) -> None:
+        # Given
+        watcher = SlicerOutputWatcher(tmp_path / "slicer", PATTERNS, settle_seconds=0)
+
+        # When/Then
+        assert watcher.poll() == []
+        (tmp_path / "slicer").mkdir()
+        (tmp_path / "slicer" / "slicer.tmp").write_text("data")
+        (tmp_path / "slicer" / "AAG").write_text("data")
+        watcher.poll()
+        assert watcher.poll() == []
+        assert watcher.drain() == []
+
+    def test_drain_returns_only_files_not_handed_out(self, tmp_path: Path) -> None:
+        # Given
+        watcher = SlicerOutputWatcher(tmp_path, PATTERNS, settle_seconds=0)
+        (tmp_path / "AAG.L1.FAAA").write_text("data")
+        watcher.poll()
+        watcher.poll()
+        (tmp_path / "AAG.L2.FAAA").write_text("data")
+
+        # When
+        remaining = watcher.drain()
+
+        # Then
+        assert remaining == [tmp_path / "AAG.L2.FAAA"]
+
+    def test_drain_fails_when_handed_out_file_changed(self, tmp_path: Path) -> None:
+        # Given
+        watcher = SlicerOutputWatcher(tmp_path, PATTERNS, settle_seconds=0)
+        changed = tmp_path / "AAG.L1.FAAA"
+        changed.write_text("data")
+        watcher.poll()
+        watcher.poll()
+
+        # When
+        changed.write_text("rewritten")
+        os.utime(changed, ns=(1, 1))
+
+        # Then
+        with pytest.raises(SlicerOutputModifiedError):
+            watcher.drain()
@@ -0,0 +1,117 @@
+import threading
+import time
+from pathlib import Path
+from typing import Iterator
+from unittest.mock import patch
+
+import pytest
+
+from unit_of_work.tape_import_confirmer.inotify_tape_import_confirmer_impl import InotifyTapeImportConfirmerImpl
+
+
+@pytest.fixture
+def confirmer() -> Iterator[InotifyTapeImportConfirmerImpl]:
+    confirmer = InotifyTapeImportConfirmerImpl('.exported', timeout=10, check_interval=5)
+    if confirmer._inotify is None:
+        pytest.skip("inotify not available on this platform")
+    yield confirmer
+    confirmer.close()
+
+
+def _create_later(*paths: Path, delay: float = 0.2) -> threading.Thread:
+    def create() -> None:
+        time.sleep(delay)
+        for path in paths:
+            path.write_text("data")
+    thread = threading.Thread(target=create)
+    thread.start()
+    return thread
+
+
+class TestInotifyTapeImportConfirmerImpl:
+    def test_returns_immediately_when_files_exist(self, confirmer: InotifyTapeImportConfirmerImpl, tmp_path: Path) -> None:
+        # Given
+        (tmp_path / "T1").write_text("tape")
+        (tmp_path / "T1.exported").write_text("")
+
+        # When/Then
+        confirmer.wait_for_confirmation("T1", tmp_path / "T1")
+
+    def test_wakes_when_ready_file_appears(self, confirmer: InotifyTapeImportConfirmerImpl, tmp_path: Path) -> None:
+        # Given
+        (tmp_path / "T1").write_text("tape")
+        creator = _create_later(tmp_path / "T1.exported")
+
+        # When
+        start = time.monotonic()
+        confirmer.wait_for_confirmation("T1", tmp_path / "T1")
+        creator.join()
+
+        # Then: well before the polling interval
+        assert time.monotonic() - start < 2
+
+    def test_one_watch_serves_many_tapes(self, confirmer: InotifyTapeImportConfirmerImpl, tmp_path: Path) -> None:
+        # Given
+        errors = []
+
+        def wait(tape_name: str) -> None:
+            try:
+                confirmer.wait_for_confirmation(tape_name, tmp_path / tape_name)
+            except Exception as e:
+                errors.append(e)
+
+        waiters = [threading.Thread(target=wait, args=(f"T{i}",)) for i in range(5)]
+        for waiter in waiters:
+            waiter.start()
+
+        # When
+        creator = _create_later(*[tmp_path / f"T{i}{suffix}" for i in range(5) for suffix in ("", ".exported")])
+        creator.join()
+        for waiter in waiters:
+            waiter.join(5)
+
+        # Then
+        assert errors == []
+        assert list(confirmer._watches) == [tmp_path]
+        assert confirmer._interests[tmp_path] == {}
+
+    def test_rechecks_every_check_interval_without_events(self, tmp_path: Path) -> None:
+        # Given: a change made by another NFS client, which raises no inotify event
+        confirmer = InotifyTapeImportConfirmerImpl('.exported', timeout=10, check_interval=1)
+        if confirmer._inotify is None:
+            pytest.skip("inotify not available on this platform")
+        (tmp_path / "T1").write_text("tape")
+        creator = _create_later(tmp_path / "T1.exported")
+
+        # When
+        start = time.monotonic()
+        with patch.object(confirmer, "_register", side_effect=lambda directory, names: confirmer._arrived.setdefault(directory, set())), \
+                patch.object(confirmer, "_unregister"):
+            confirmer.wait_for_confirmation("T1", tmp_path / "T1")
+        creator.join()
+        confirmer.close()
+
+        # Then: at the next check, one check interval later
+        assert 0.2 <= time.monotonic() - start < 2
+
+    def test_timeout(self, tmp_path: Path) -> None:
+        # Given
+        confirmer = InotifyTapeImportConfirmerImpl('.exported', timeout=0, check_interval=1)
+
+        # When/Then
+        with pytest.raises(TimeoutError):
+            confirmer.wait_for_confirmation("T1", tmp_path / "T1")
+        confirmer.close()
+
+    @patch('unit_of_work.tape_import_confirmer.inotify_tape_import_confirmer_impl._Inotify')
+    @patch('unit_of_work.tape_import_confirmer.tape_import_confirmer_impl.TapeImportConfirmerImpl.wait_for_confirmation')
+    def test_falls_back_to_polling_without_inotify(self, mock_polling_wait, mock_inotify, tmp_path: Path) -> None:
+        # Given
+        mock_inotify.side_effect = OSError("inotify is not available on aix")
+        confirmer = InotifyTapeImportConfirmerImpl('.exported', timeout=10, check_interval=1)
+
+        # When
+        confirmer.wait_for_confirmation("T1", tmp_path / "T1")
+
+        # Then
+        mock_polling_wait.assert_called_once_with("T1", tmp_path / "T1")
@@ -11,37 +11,94 @@ class TestTapeRegisterImpl(unittest.TestCase):
 
     def test_set_status_exported_updates_status_to_exported(self):
         self.tape_register.set_status_exported("tape1")
-        self.db_connection.update.assert_called_once_with(
-            f"UPDATE mig_taperegister SET status = '{TapeStatus.EXPORTED}' WHERE volser = 'tape1'"
+        self.db_connection.execute.assert_called_once_with(
+            "UPDATE mig_taperegister SET status = ? WHERE volser = ?",
+            (TapeStatus.EXPORTED.value, "tape1")
         )
         
     def test_set_status_failed_updates_status_to_failed(self):
         self.tape_register.set_status_failed("tape2")
-        self.db_connection.update.assert_called_once_with(
-            f"UPDATE mig_taperegister SET status = '{TapeStatus.FAILED}' WHERE volser = 'tape2'"
+        self.db_connection.execute.assert_called_once_with(
+            "UPDATE mig_taperegister SET status = ? WHERE volser = ?",
+            (TapeStatus.FAILED.value, "tape2")
         )
 
     def test_set_status_sliced_updates_status_to_sliced(self):
         self.tape_register.set_status_sliced("tape3")
-        self.db_connection.update.assert_called_once_with(
-            f"UPDATE mig_taperegister SET status = '{TapeStatus.SLICED}' WHERE volser = 'tape3'"
+        self.db_connection.execute.assert_called_once_with(
+            "UPDATE mig_taperegister SET status = ? WHERE volser = ?",
+            (TapeStatus.SLICED.value, "tape3")
         )
 
     def test_set_status_linked_updates_status_to_linked(self):
         self.tape_register.set_status_linked("tape4")
-        self.db_connection.update.assert_called_once_with(
-            f"UPDATE mig_taperegister SET status = '{TapeStatus.LINKED}' WHERE volser = 'tape4'"
+        self.db_connection.execute.assert_called_once_with(
+            "UPDATE mig_taperegister SET status = ? WHERE volser = ?",
+            (TapeStatus.LINKED.value, "tape4")
         )
 
     def test_set_status_exported_updates_status_to_finished(self):
         self.tape_register.set_status_finished("tape5")
-        self.db_connection.update.assert_called_once_with(
-            f"UPDATE mig_taperegister SET status = '{TapeStatus.FINISHED}' WHERE volser = 'tape5'"
+        self.db_connection.execute.assert_called_once_with(
+            "UPDATE mig_taperegister SET status = ? WHERE volser = ?",
+            (TapeStatus.FINISHED.value, "tape5")
         )
 
     @patch('unit_of_work.tape_register.tape_register_impl.logger')
     def test_set_status_logs_error_and_raises_exception_on_failure(self, mock_logger):
-        self.db_connection.update.side_effect = Exception("DB error")
+        self.db_connection.execute.side_effect = Exception("DB error")
         with self.assertRaises(Exception):
             self.tape_register.set_status_failed("tape6")
-        mock_logger.error.assert_called_once_with(f"Failed to update status to {TapeStatus.FAILED} for tape tape6: DB error")
\ No newline at end of file
+        mock_logger.error.assert_called_once_with(f"Failed to update status to {TapeStatus.FAILED} for tape tape6: DB error")
+
+    def test_claim_tapes_claims_only_tapes_it_won(self):
+        self.db_connection.fetch_all.return_value = {"tape7": (), "tape8": ()}
+        self.db_connection.execute.side_effect = [1, 0]
+
+        claimed = self.tape_register.claim_tapes(2)
+
+        self.assertEqual(claimed, ["tape7"])
+        self.db_connection.fetch_all.assert_called_once_with(
+            "SELECT volser FROM mig_taperegister WHERE status IN (?, ?) FETCH FIRST 2 ROWS ONLY",
+            ("new", "requested")
+        )
+        self.db_connection.execute.assert_any_call(
+            "UPDATE mig_taperegister SET status = ? WHERE volser = ? AND status IN (?, ?)",
+            ("claimed", "tape7", "new", "requested")
+        )
+
+    def test_claim_tapes_returns_tapes_claimed_before_an_error(self):
+        self.db_connection.fetch_all.return_value = ["tape7", "tape8"]
+        self.db_connection.execute.side_effect = [1, Exception("connection lost")]
+
+        self.assertEqual(self.tape_register.claim_tapes(2), ["tape7"])
+
+    def test_claim_tapes_raises_if_nothing_was_claimed(self):
+        self.db_connection.fetch_all.return_value = ["tape7"]
+        self.db_connection.execute.side_effect = Exception("connection lost")
+
+        with self.assertRaises(Exception):
+            self.tape_register.claim_tapes(1)
+
+    def test_release_claims_returns_claimed_tapes_to_requested(self):
+        self.db_connection.execute.return_value = 3
+
+        self.assertEqual(self.tape_register.release_claims(), 3)
+        self.db_connection.execute.assert_called_once_with(
+            "UPDATE mig_taperegister SET status = ? WHERE status = ?",
+            ("requested", "claimed")
+        )
+
+    def test_get_status_parses_register_value(self):
+        self.db_connection.fetch_one.return_value = ("sliced   ",)
+
+        self.assertEqual(self.tape_register.get_status("tape9"), TapeStatus.SLICED)
+        self.db_connection.fetch_one.assert_called_once_with(
+            "SELECT status FROM mig_taperegister WHERE volser = ?",
+            ("tape9",)
+        )
+
+    def test_get_status_of_unknown_tape_is_none(self):
+        self.db_connection.fetch_one.return_value = None
+
+        self.assertIsNone(self.tape_register.get_status("tape10"))
@@ -0,0 +1,91 @@
+import threading
+
+import pytest
+
+from unit_of_work.uploader.adaptive_concurrency_limiter import AdaptiveConcurrencyLimiter
+
+
+class TestAdaptiveConcurrencyLimiter:
+    def test_healthy_completions_grow_limit_up_to_max(self) -> None:
+        # Given
+        limiter = AdaptiveConcurrencyLimiter(max_limit=4, initial_limit=1)
+
+        # When
+        for _ in range(20):
+            limiter.release(limiter.acquire(), size=1024)
+
+        # Then
+        assert limiter.limit == 4
+
+    def test_throttling_halves_limit_once_per_cooldown(self) -> None:
+        # Given
+        limiter = AdaptiveConcurrencyLimiter(max_limit=16, cooldown=60)
+
+        # When
+        for _ in range(3):
+            limiter.release(limiter.acquire(), size=0, throttled=True)
+
+        # Then
+        assert limiter.limit == 8
+        assert limiter.throttled == 3
+
+    def test_errored_completions_neither_grow_limit_nor_count_throughput(self) -> None:
+        # Given
+        limiter = AdaptiveConcurrencyLimiter(max_limit=4, initial_limit=1)
+
+        # When
+        for _ in range(20):
+            limiter.release(limiter.acquire(), size=1024, errored=True)
+
+        # Then
+        assert limiter.limit == 1
+        assert limiter.metrics()["upload_throughput_bytes_per_second"] == 0
+        assert limiter.metrics()["upload_in_flight"] == 0
+
+    def test_limit_never_drops_below_min(self) -> None:
+        # Given
+        limiter = AdaptiveConcurrencyLimiter(max_limit=4, min_limit=2, cooldown=0)
+
+        # When
+        for _ in range(5):
+            limiter.on_throttle()
+
+        # Then
+        assert limiter.limit == 2
+
+    def test_acquire_blocks_at_limit(self) -> None:
+        # Given
+        limiter = AdaptiveConcurrencyLimiter(max_limit=1)
+        started = limiter.acquire()
+        acquired = threading.Event()
+        waiter = threading.Thread(target=lambda: (limiter.acquire(), acquired.set()))
+
+        # When
+        waiter.start()
+        blocked = not acquired.wait(0.1)
+        limiter.release(started, size=1)
+        waiter.join(1)
+
+        # Then
+        assert blocked
+        assert acquired.is_set()
+
+    def test_metrics_report_limit_and_throughput(self) -> None:
+        # Given
+        limiter = AdaptiveConcurrencyLimiter(max_limit=2, initial_limit=2, throughput_window=10)
+
+        # When
+        limiter.release(limiter.acquire(), size=1000)
+
+        # Then
+        assert limiter.metrics() == {
+            "upload_concurrency_limit": 2,
+            "upload_in_flight": 0,
+            "upload_throughput_bytes_per_second": 100.0,
+            "upload_throttled_total": 0
+        }
+
+    def test_invalid_limits_are_rejected(self) -> None:
+        # When/Then
+        with pytest.raises(ValueError):
+            AdaptiveConcurrencyLimiter(max_limit=1, min_limit=2)
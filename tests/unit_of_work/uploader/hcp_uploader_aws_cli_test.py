@@ -0,0 +1,245 @@
+import subprocess
+from pathlib import Path
+from unittest.mock import MagicMock, call, patch
+
+import pytest
+
+from unit_of_work.uploader.hcp_uploader_aws_cli import CliS3UploadError, HcpUploaderAwsCliImpl
+from unit_of_work.uploader.upload_manifest import UploadManifest
+from unit_of_work.uploader.upload_summary import UploadSummary
+from unit_of_work.uploader.upload_target import UploadTarget
+
+
+@pytest.fixture
+def uploader() -> HcpUploaderAwsCliImpl:
+    return HcpUploaderAwsCliImpl(s3_bucket="bucket", s3_prefix="prefix", verify_ssl=True)
+
+
+class TestHcpUploaderAwsCliImpl:
+    @patch('unit_of_work.uploader.hcp_uploader_aws_cli.subprocess.run')
+    def test_upload_dir_runs_recursive_copy(self, mock_run: MagicMock, uploader: HcpUploaderAwsCliImpl) -> None:
+        # Given
+        mock_run.return_value.stderr = ""
+
+        # When
+        uploader.upload_dir(Path("/work/linker"))
+
+        # Then
+        mock_run.assert_called_once_with(
+            ["aws", "s3", "cp", "/work/linker/", "s3://bucket/prefix/", "--no-progress", "--recursive"],
+            check=True,
+            capture_output=True,
+            text=True
+        )
+
+    @patch('unit_of_work.uploader.hcp_uploader_aws_cli.subprocess.run')
+    def test_upload_files_groups_targets_by_directory(
+        self,
+        mock_run: MagicMock,
+        uploader: HcpUploaderAwsCliImpl,
+        tmp_path: Path
+    ) -> None:
+        # Given
+        mock_run.return_value.stderr = ""
+        (tmp_path / "linker" / "SFB" / "123FAA").mkdir(parents=True)
+        (tmp_path / "slicer").mkdir()
+        targets = [
+            UploadTarget(tmp_path / "linker/SFB/123FAA/123FAAA", "SFB/123FAA/123FAAA"),
+            UploadTarget(tmp_path / "linker/SFB/123FAA/123FAAB", "SFB/123FAA/123FAAB"),
+            UploadTarget(tmp_path / "slicer/AAG.L123", "SFB/RES/123"),
+        ]
+        for target in targets:
+            target.local_path.write_text("data")
+
+        # When
+        results = uploader.upload_files(targets)
+
+        # Then
+        assert mock_run.call_args_list == [
+            call(
+                ["aws", "s3", "cp", f"{tmp_path}/linker/SFB/123FAA/", "s3://bucket/prefix/SFB/123FAA/",
+                 "--no-progress", "--recursive", "--exclude", "*",
+                 "--include", "123FAAA", "--include", "123FAAB"],
+                check=True, capture_output=True, text=True
+            ),
+            call(
+                ["aws", "s3", "cp", f"{tmp_path}/slicer/AAG.L123", "s3://bucket/prefix/SFB/RES/123", "--no-progress"],
+                check=True, capture_output=True, text=True
+            ),
+        ]
+        assert [(result.s3_key, result.size, result.succeeded) for result in results] == [
+            ("SFB/123FAA/123FAAA", 4, True),
+            ("SFB/123FAA/123FAAB", 4, True),
+            ("SFB/RES/123", 4, True),
+        ]
+
+    @patch('unit_of_work.uploader.hcp_uploader_aws_cli.subprocess.run')
+    def test_upload_files_splits_large_directories(
+        self,
+        mock_run: MagicMock,
+        uploader: HcpUploaderAwsCliImpl,
+        tmp_path: Path
+    ) -> None:
+        # Given
+        mock_run.return_value.stderr = ""
+        count = HcpUploaderAwsCliImpl._MAX_INCLUDES_PER_COMMAND + 1
+        (tmp_path / "SFB").mkdir()
+        targets = [UploadTarget(tmp_path / f"SFB/F{i}", f"SFB/F{i}") for i in range(count)]
+        for target in targets:
+            target.local_path.touch()
+
+        # When
+        uploader.upload_files(targets)
+
+        # Then
+        assert mock_run.call_count == 2
+
+    @patch('unit_of_work.uploader.hcp_uploader_aws_cli.subprocess.run')
+    def test_upload_files_raises_cli_error(self, mock_run: MagicMock, uploader: HcpUploaderAwsCliImpl) -> None:
+        # Given
+        mock_run.side_effect = Exception("boom")
+
+        # When/Then
+        with pytest.raises(CliS3UploadError):
+            uploader.upload_files([UploadTarget(Path("/work/linker/SFB/F1"), "SFB/F1")])
+
+    @patch('unit_of_work.uploader.hcp_uploader_aws_cli.subprocess.run')
+    def test_upload_dir_with_manifest_runs_one_copy_and_records_it(
+        self,
+        mock_run: MagicMock,
+        uploader: HcpUploaderAwsCliImpl,
+        tmp_path: Path
+    ) -> None:
+        # Given
+        mock_run.return_value.stderr = ""
+        linker = tmp_path / "linker"
+        (linker / "SFB" / "123FAA").mkdir(parents=True)
+        (linker / "SFB" / "F1").write_text("data")
+        (linker / "SFB" / "123FAA" / "F2").write_text("more data")
+        manifest_file = tmp_path / "upload_manifest.tsv"
+        manifest = UploadManifest(manifest_file)
+
+        # When
+        summary = uploader.upload_dir(linker, manifest)
+        manifest.close()
+
+        # Then
+        mock_run.assert_called_once_with(
+            ["aws", "s3", "cp", f"{linker}/", "s3://bucket/prefix/", "--no-progress", "--recursive"],
+            check=True, capture_output=True, text=True
+        )
+        assert summary == UploadSummary(objects=2, bytes=len("data") + len("more data"))
+        assert sorted(line.split("\t")[0] for line in manifest_file.read_text().splitlines()) == [
+            "SFB/123FAA/F2", "SFB/F1"
+        ]
+
+    @patch('unit_of_work.uploader.hcp_uploader_aws_cli.subprocess.run')
+    def test_failed_copy_records_files_the_cli_reported_uploaded(
+        self,
+        mock_run: MagicMock,
+        uploader: HcpUploaderAwsCliImpl,
+        tmp_path: Path
+    ) -> None:
+        # Given
+        linker = tmp_path / "linker"
+        (linker / "SFB").mkdir(parents=True)
+        (linker / "SFB" / "F 1").write_text("data")
+        (linker / "SFB" / "F2").write_text("more data")
+        mock_run.side_effect = subprocess.CalledProcessError(
+            1, "aws",
+            output=f"upload: {linker}/SFB/F 1 to s3://bucket/prefix/SFB/F 1\n",
+            stderr="upload failed: SFB/F2 An error occurred (SlowDown)"
+        )
+        manifest_file = tmp_path / "upload_manifest.tsv"
+        manifest = UploadManifest(manifest_file)
+
+        # When
+        with pytest.raises(CliS3UploadError):
+            uploader.upload_dir(linker, manifest)
+        manifest.close()
+
+        # Then
+        assert [line.split("\t")[0] for line in manifest_file.read_text().splitlines()] == ["SFB/F 1"]
+
+    @patch('unit_of_work.uploader.hcp_uploader_aws_cli.subprocess.run')
+    def test_rerun_uploads_only_files_missing_from_manifest(
+        self,
+        mock_run: MagicMock,
+        uploader: HcpUploaderAwsCliImpl,
+        tmp_path: Path
+    ) -> None:
+        # Given
+        mock_run.return_value.stderr = ""
+        linker = tmp_path / "linker"
+        (linker / "SFB").mkdir(parents=True)
+        (linker / "SFB" / "F1").write_text("data")
+        (linker / "SFB" / "F2").write_text("more data")
+        manifest_file = tmp_path / "upload_manifest.tsv"
+        first_run = UploadManifest(manifest_file)
+        first_run.record([UploadTarget(linker / "SFB" / "F1", "SFB/F1")])
+        first_run.close()
+        manifest = UploadManifest(manifest_file)
+
+        # When
+        summary = uploader.upload_dir(linker, manifest)
+        manifest.close()
+
+        # Then
+        mock_run.assert_called_once()
+        assert mock_run.call_args.args[0][-3:] == ["*", "--include", "F2"]
+        assert summary == UploadSummary(objects=1, bytes=len("more data"))
+        assert (manifest.skipped, manifest.skipped_bytes) == (1, len("data"))
+
+    @patch('unit_of_work.uploader.hcp_uploader_aws_cli.subprocess.run')
+    def test_upload_files_escapes_wildcards_in_names(
+        self,
+        mock_run: MagicMock,
+        uploader: HcpUploaderAwsCliImpl,
+        tmp_path: Path
+    ) -> None:
+        # Given
+        mock_run.return_value.stderr = ""
+        (tmp_path / "SFB").mkdir()
+        target = UploadTarget(tmp_path / "SFB" / "F[1]*?", "SFB/F[1]*?")
+        target.local_path.touch()
+
+        # When
+        uploader.upload_files([target])
+
+        # Then
+        assert mock_run.call_args.args[0][-2:] == ["--include", "F[[]1][*][?]"]
+
+    @patch('unit_of_work.uploader.hcp_uploader_aws_cli.subprocess.run')
+    def test_delete_uploaded_removes_files_after_each_command(self, mock_run: MagicMock, tmp_path: Path) -> None:
+        # Given
+        mock_run.return_value.stderr = ""
+        uploader = HcpUploaderAwsCliImpl(s3_bucket="bucket", s3_prefix="prefix", verify_ssl=True, delete_uploaded=True)
+        linker = tmp_path / "linker"
+        (linker / "SFB").mkdir(parents=True)
+        (linker / "SFB" / "F1").write_text("data")
+        (linker / "SFB" / "F2").write_text("more data")
+
+        # When
+        results = uploader.upload_files(
+            [UploadTarget(linker / "SFB" / "F1", "SFB/F1"), UploadTarget(linker / "SFB" / "F2", "SFB/F2")]
+        )
+
+        # Then
+        assert [(result.s3_key, result.size) for result in results] == [("SFB/F1", 4), ("SFB/F2", 9)]
+        assert list((linker / "SFB").iterdir()) == []
+
+    @patch('unit_of_work.uploader.hcp_uploader_aws_cli.subprocess.run')
+    def test_delete_uploaded_keeps_files_of_failed_command(self, mock_run: MagicMock, tmp_path: Path) -> None:
+        # Given
+        mock_run.side_effect = Exception("boom")
+        uploader = HcpUploaderAwsCliImpl(s3_bucket="bucket", s3_prefix="prefix", verify_ssl=True, delete_uploaded=True)
+        linker = tmp_path / "linker"
+        (linker / "SFB").mkdir(parents=True)
+        (linker / "SFB" / "F1").write_text("data")
+
+        # When
+        with pytest.raises(CliS3UploadError):
+            uploader.upload_dir(linker)
+
+        # Then
+        assert (linker / "SFB" / "F1").exists()
@@ -0,0 +1,328 @@
+import hashlib
+from pathlib import Path
+from typing import Iterator
+from unittest.mock import MagicMock
+
+import boto3
+import pytest
+from botocore.exceptions import ClientError
+
+from unit_of_work.uploader.adaptive_concurrency_limiter import AdaptiveConcurrencyLimiter
+from unit_of_work.uploader.hcp_uploader_boto3_impl import HcpUploaderBoto3Impl, S3UploadError
+from unit_of_work.uploader.upload_manifest import UploadManifest
+from unit_of_work.uploader.upload_summary import UploadSummary
+from unit_of_work.uploader.upload_target import UploadTarget
+
+
+@pytest.fixture
+def s3_client() -> MagicMock:
+    return MagicMock()
+
+
+@pytest.fixture
+def uploader(s3_client: MagicMock) -> Iterator[HcpUploaderBoto3Impl]:
+    uploader = HcpUploaderBoto3Impl(
+        s3_bucket="bucket",
+        s3_prefix="prefix/",
+        verify_ssl=True,
+        multipart_threshold=1024,
+        multipart_chunksize=512,
+        max_concurrency=2,
+        max_workers=2,
+        s3_client=s3_client
+    )
+    yield uploader
+    uploader.close()
+
+
+@pytest.fixture
+def linker_dir(tmp_path: Path) -> Path:
+    linker = tmp_path / "linker"
+    (linker / "SFB" / "123FAA").mkdir(parents=True)
+    (linker / "SFB" / "RES").mkdir(parents=True)
+    (linker / "SFB" / "123FAA" / "123FAAA").write_text("object")
+    (linker / "SFB" / "RES" / "123").write_text("resource")
+    return linker
+
+
+class TestHcpUploaderBoto3Impl:
+    def test_upload_files_returns_per_object_results(
+        self,
+        uploader: HcpUploaderBoto3Impl,
+        s3_client: MagicMock,
+        linker_dir: Path
+    ) -> None:
+        # Given
+        target = UploadTarget(linker_dir / "SFB" / "123FAA" / "123FAAA", "SFB/123FAA/123FAAA")
+
+        # When
+        results = uploader.upload_files([target])
+
+        # Then
+        assert [(result.s3_key, result.size, result.succeeded) for result in results] == [
+            ("SFB/123FAA/123FAAA", 6, True)
+        ]
+        s3_client.upload_file.assert_called_once_with(
+            Filename=str(target.local_path),
+            Bucket="bucket",
+            Key="prefix/SFB/123FAA/123FAAA",
+            Config=uploader._transfer_config
+        )
+        assert uploader._transfer_config.multipart_threshold == 1024
+        assert uploader._transfer_config.multipart_chunksize == 512
+        assert uploader._transfer_config.max_request_concurrency == 2
+
+    def test_upload_dir_mirrors_directory_layout(
+        self,
+        uploader: HcpUploaderBoto3Impl,
+        s3_client: MagicMock,
+        linker_dir: Path
+    ) -> None:
+        # When
+        summary = uploader.upload_dir(linker_dir)
+
+        # Then
+        keys = sorted(call.kwargs["Key"] for call in s3_client.upload_file.call_args_list)
+        assert keys == ["prefix/SFB/123FAA/123FAAA", "prefix/SFB/RES/123"]
+        assert summary == UploadSummary(objects=2, bytes=len("object") + len("resource"))
+
+    def test_failed_objects_raise_with_results(
+        self,
+        uploader: HcpUploaderBoto3Impl,
+        s3_client: MagicMock,
+        linker_dir: Path
+    ) -> None:
+        # Given
+        s3_client.upload_file.side_effect = [None, Exception("503 SlowDown")]
+        targets = [
+            UploadTarget(linker_dir / "SFB" / "123FAA" / "123FAAA", "SFB/123FAA/123FAAA"),
+            UploadTarget(linker_dir / "SFB" / "RES" / "123", "SFB/RES/123"),
+        ]
+
+        # When
+        with pytest.raises(S3UploadError) as exc_info:
+            uploader.upload_files(targets)
+
+        # Then
+        assert len(exc_info.value.results) == 2
+        assert sum(not result.succeeded for result in exc_info.value.results) == 1
+
+    def test_upload_dir_raises_when_objects_failed(
+        self,
+        uploader: HcpUploaderBoto3Impl,
+        s3_client: MagicMock,
+        linker_dir: Path
+    ) -> None:
+        # Given
+        s3_client.upload_file.side_effect = Exception("connection reset")
+
+        # When/Then
+        with pytest.raises(S3UploadError):
+            uploader.upload_dir(linker_dir)
+
+    def test_delete_uploaded_removes_only_acknowledged_files(
+        self,
+        s3_client: MagicMock,
+        linker_dir: Path
+    ) -> None:
+        # Given
+        def upload_file(Filename: str, **kwargs) -> None:
+            if Filename.endswith("123"):
+                raise Exception("connection reset")
+        s3_client.upload_file.side_effect = upload_file
+        uploader = HcpUploaderBoto3Impl(
+            s3_bucket="bucket", s3_prefix="prefix", verify_ssl=True, max_workers=2,
+            delete_uploaded=True, s3_client=s3_client
+        )
+
+        # When
+        with pytest.raises(S3UploadError):
+            uploader.upload_dir(linker_dir)
+        uploader.close()
+
+        # Then
+        assert not (linker_dir / "SFB" / "123FAA" / "123FAAA").exists()
+        assert (linker_dir / "SFB" / "RES" / "123").exists()
+
+    def test_rerun_skips_objects_recorded_in_manifest(
+        self,
+        uploader: HcpUploaderBoto3Impl,
+        s3_client: MagicMock,
+        linker_dir: Path,
+        tmp_path: Path
+    ) -> None:
+        # Given
+        manifest_file = tmp_path / "upload_manifest.tsv"
+
+        def fail_resources(**kwargs) -> None:
+            if "/RES/" in kwargs["Key"]:
+                raise Exception("503 SlowDown")
+
+        s3_client.upload_file.side_effect = fail_resources
+        with pytest.raises(S3UploadError):
+            uploader.upload_dir(linker_dir, UploadManifest(manifest_file))
+        s3_client.upload_file.reset_mock(side_effect=True)
+
+        # When
+        manifest = UploadManifest(manifest_file)
+        uploader.upload_dir(linker_dir, manifest)
+
+        # Then
+        assert [call.kwargs["Key"] for call in s3_client.upload_file.call_args_list] == ["prefix/SFB/RES/123"]
+        assert (manifest.skipped, manifest.skipped_bytes) == (1, len("object"))
+
+    def test_throttled_upload_lowers_concurrency_limit(
+        self,
+        uploader: HcpUploaderBoto3Impl,
+        s3_client: MagicMock,
+        linker_dir: Path
+    ) -> None:
+        # Given
+        s3_client.upload_file.side_effect = ClientError({"Error": {"Code": "SlowDown"}}, "PutObject")
+
+        # When
+        with pytest.raises(S3UploadError):
+            uploader.upload_dir(linker_dir)
+
+        # Then
+        assert uploader.metrics()["upload_concurrency_limit"] == 1
+        assert uploader.metrics()["upload_throttled_total"] == 2
+
+    def test_failed_upload_is_released_as_errored(
+        self,
+        uploader: HcpUploaderBoto3Impl,
+        s3_client: MagicMock,
+        linker_dir: Path,
+        monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        # Given
+        s3_client.upload_file.side_effect = Exception("connection reset")
+        release = MagicMock(wraps=AdaptiveConcurrencyLimiter.release)
+        monkeypatch.setattr(AdaptiveConcurrencyLimiter, "release", lambda self, *args: release(self, *args))
+
+        # When
+        with pytest.raises(S3UploadError):
+            uploader.upload_files([UploadTarget(linker_dir / "SFB" / "RES" / "123", "SFB/RES/123")])
+
+        # Then
+        (_, _, _, throttled, errored), _ = release.call_args
+        assert (throttled, errored) == (False, True)
+        assert uploader.metrics()["upload_throttled_total"] == 0
+
+    def test_retried_throttling_is_seen_through_botocore_events(self) -> None:
+        # Given
+        s3_client = boto3.session.Session().client(
+            "s3", region_name="us-east-1", aws_access_key_id="testing", aws_secret_access_key="testing"
+        )
+        uploader = HcpUploaderBoto3Impl(
+            s3_bucket="bucket", s3_prefix="", verify_ssl=True, max_workers=8, s3_client=s3_client
+        )
+
+        # When
+        s3_client.meta.events.emit(
+            "needs-retry.s3.PutObject",
+            response=(MagicMock(status_code=503), {"Error": {"Code": "SlowDown"}}),
+            endpoint=None, operation=None, attempts=1, caught_exception=None, request_dict={"context": {}}
+        )
+        uploader.close()
+
+        # Then
+        assert uploader.metrics()["upload_concurrency_limit"] == 4
+
+    def test_uploads_to_local_s3_stand_in(self, linker_dir: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+        moto = pytest.importorskip("moto")
+        # Given
+        monkeypatch.setenv("AWS_ACCESS_KEY_ID", "testing")
+        monkeypatch.setenv("AWS_SECRET_ACCESS_KEY", "testing")
+        monkeypatch.setenv("AWS_DEFAULT_REGION", "us-east-1")
+        (linker_dir / "SFB" / "123FAA" / "123FAAB").write_bytes(b"x" * 3000)
+
+        with moto.mock_aws():
+            boto3.client("s3").create_bucket(Bucket="bucket")
+            uploader = HcpUploaderBoto3Impl(
+                s3_bucket="bucket",
+                s3_prefix="prefix",
+                verify_ssl=True,
+                multipart_threshold=1024,
+                multipart_chunksize=1024,
+                max_workers=2
+            )
+
+            # When
+            uploader.upload_dir(linker_dir)
+            uploader.close()
+
+            # Then
+            objects = boto3.client("s3").list_objects_v2(Bucket="bucket")["Contents"]
+            assert sorted((o["Key"], o["Size"]) for o in objects) == [
+                ("prefix/SFB/123FAA/123FAAA", 6),
+                ("prefix/SFB/123FAA/123FAAB", 3000),
+                ("prefix/SFB/RES/123", 8),
+            ]
+
+    def test_checksummed_upload_records_md5_in_manifest(
+        self,
+        linker_dir: Path,
+        tmp_path: Path,
+        monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        moto = pytest.importorskip("moto")
+        # Given
+        monkeypatch.setenv("AWS_ACCESS_KEY_ID", "testing")
+        monkeypatch.setenv("AWS_SECRET_ACCESS_KEY", "testing")
+        monkeypatch.setenv("AWS_DEFAULT_REGION", "us-east-1")
+        large_content = bytes(range(256)) * (11 * 1024 * 4)
+        (linker_dir / "SFB" / "123FAA" / "123FAAB").write_bytes(large_content)
+        (linker_dir / "SFB" / "123FAA" / "123FAAC").write_bytes(b"")
+        manifest = UploadManifest(tmp_path / "upload_manifest.tsv")
+
+        with moto.mock_aws():
+            s3 = boto3.client("s3")
+            s3.create_bucket(Bucket="bucket")
+            uploader = HcpUploaderBoto3Impl(
+                s3_bucket="bucket",
+                s3_prefix="prefix",
+                verify_ssl=True,
+                multipart_threshold=6 * 1024 * 1024,
+                multipart_chunksize=5 * 1024 * 1024,
+                max_concurrency=2,
+                max_workers=2,
+                upload_checksums=True
+            )
+
+            # When
+            uploader.upload_dir(linker_dir, manifest)
+            uploader.close()
+            manifest.close()
+
+            # Then
+            body = s3.get_object(Bucket="bucket", Key="prefix/SFB/123FAA/123FAAB")["Body"].read()
+            assert body == large_content
+            assert s3.get_object(Bucket="bucket", Key="prefix/SFB/RES/123")["Body"].read() == b"resource"
+
+        recorded = UploadManifest(tmp_path / "upload_manifest.tsv")
+        assert recorded.checksum("SFB/123FAA/123FAAB") == hashlib.md5(large_content).hexdigest()
+        assert recorded.checksum("SFB/RES/123") == hashlib.md5(b"resource").hexdigest()
+        assert recorded.checksum("SFB/123FAA/123FAAC") == hashlib.md5(b"").hexdigest()
+
+    def test_corrupted_part_aborts_multipart_upload(self, tmp_path: Path) -> None:
+        # Given
+        s3_client = MagicMock()
+        s3_client.create_multipart_upload.return_value = {"UploadId": "id"}
+        s3_client.upload_part.side_effect = ClientError({"Error": {"Code": "BadDigest"}}, "UploadPart")
+        uploader = HcpUploaderBoto3Impl(
+            s3_bucket="bucket", s3_prefix="", verify_ssl=True, multipart_threshold=1024,
+            multipart_chunksize=1024, max_concurrency=2, max_workers=1, upload_checksums=True, s3_client=s3_client
+        )
+        large_file = tmp_path / "F1"
+        large_file.write_bytes(b"x" * 10 * 1024)
+
+        # When
+        with pytest.raises(S3UploadError):
+            uploader.upload_files([UploadTarget(large_file, "F1")])
+        uploader.close()
+
+        # Then
+        s3_client.abort_multipart_upload.assert_called_once_with(Bucket="bucket", Key="F1", UploadId="id")
+        s3_client.complete_multipart_upload.assert_not_called()
+        assert s3_client.upload_part.call_count <= 3
@@ -0,0 +1,84 @@
+import os
+from pathlib import Path
+
+from unit_of_work.uploader.upload_manifest import UploadManifest
+from unit_of_work.uploader.upload_target import UploadTarget
+
+
+class TestUploadManifest:
+    def test_recorded_target_is_uploaded_in_a_later_run(self, tmp_path: Path) -> None:
+        # Given
+        local_file = tmp_path / "F1"
+        local_file.write_text("payload")
+        target = UploadTarget(local_file, "SFB/F1")
+        manifest_file = tmp_path / "log" / "upload_manifest.tsv"
+        first_run = UploadManifest(manifest_file)
+        first_run.record([target])
+        first_run.close()
+
+        # When
+        second_run = UploadManifest(manifest_file)
+
+        # Then
+        assert second_run.is_uploaded(target)
+        assert not second_run.is_uploaded(UploadTarget(local_file, "SFB/F2"))
+        assert (second_run.skipped, second_run.skipped_bytes) == (1, len("payload"))
+
+    def test_changed_local_file_is_uploaded_again(self, tmp_path: Path) -> None:
+        # Given
+        local_file = tmp_path / "F1"
+        local_file.write_text("payload")
+        target = UploadTarget(local_file, "SFB/F1")
+        manifest_file = tmp_path / "upload_manifest.tsv"
+        UploadManifest(manifest_file).record([target])
+        stat = local_file.stat()
+        os.utime(local_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+        # When
+        manifest = UploadManifest(manifest_file)
+
+        # Then
+        assert not manifest.is_uploaded(target)
+        assert manifest.skipped == 0
+
+    def test_truncated_last_line_is_ignored(self, tmp_path: Path) -> None:
+        # Given
+        manifest_file = tmp_path / "upload_manifest.tsv"
+        manifest_file.write_text("SFB/F1\t7\t100\nSFB/F2\t7")
+
+        # When
+        manifest = UploadManifest(manifest_file)
+
+        # Then
+        assert list(manifest._completed) == ["SFB/F1"]
+
+    def test_checksums_are_persisted(self, tmp_path: Path) -> None:
+        # Given
+        local_file = tmp_path / "F1"
+        local_file.write_text("payload")
+        manifest_file = tmp_path / "upload_manifest.tsv"
+        first_run = UploadManifest(manifest_file)
+        first_run.record([UploadTarget(local_file, "SFB/F1")], ["0f1e2d"])
+        first_run.close()
+
+        # When
+        manifest = UploadManifest(manifest_file)
+
+        # Then
+        assert manifest.checksum("SFB/F1") == "0f1e2d"
+        assert manifest.checksum("SFB/F2") is None
+
+    def test_checksums_recorded_in_this_run_are_returned(self, tmp_path: Path) -> None:
+        # Given
+        local_file = tmp_path / "F1"
+        local_file.write_text("payload")
+        manifest = UploadManifest(tmp_path / "upload_manifest.tsv")
+
+        # When
+        manifest.record([UploadTarget(local_file, "SFB/F1")], ["0f1e2d"])
+        manifest.record([UploadTarget(local_file, "SFB/F2")])
+
+        # Then
+        assert manifest.checksum("SFB/F1") == "0f1e2d"
+        assert manifest.checksum("SFB/F2") is None
+        manifest.close()
@@ -0,0 +1,88 @@
+import threading
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from unit_of_work.utils.background_deleter import BackgroundDeleter
+
+
+@pytest.fixture
+def tree(tmp_path: Path) -> Path:
+    root = tmp_path / "work" / "slicer"
+    (root / "sub").mkdir(parents=True)
+    for i in range(10):
+        (root / "sub" / f"F{i}").write_text("data")
+    return root
+
+
+class TestBackgroundDeleter:
+    def test_path_is_gone_before_data_is_reclaimed(self, tmp_path: Path, tree: Path) -> None:
+        # Given
+        deleter = BackgroundDeleter(tmp_path / "work" / ".trash")
+        release = threading.Event()
+        original_reclaim = BackgroundDeleter._reclaim
+
+        def slow_reclaim(path, future):
+            release.wait(5)
+            original_reclaim(path, future)
+
+        # When
+        with patch.object(BackgroundDeleter, "_reclaim", side_effect=slow_reclaim):
+            future = deleter.delete(tree)
+            gone_before_reclaim = not tree.exists() and not future.done()
+            release.set()
+            future.result(timeout=5)
+        deleter.close()
+
+        # Then
+        assert gone_before_reclaim
+        assert list((tmp_path / "work" / ".trash").iterdir()) == []
+
+    def test_close_waits_for_pending_deletions(self, tmp_path: Path, tree: Path) -> None:
+        # Given
+        deleter = BackgroundDeleter(tmp_path / ".trash", max_queued=1)
+        futures = [deleter.delete(tree)]
+        second = tmp_path / "linker"
+        second.mkdir()
+        futures.append(deleter.delete(second))
+
+        # When
+        deleter.close(wait=True)
+
+        # Then
+        assert all(future.done() and future.exception() is None for future in futures)
+        assert list((tmp_path / ".trash").iterdir()) == []
+
+    def test_missing_path_completes_immediately(self, tmp_path: Path) -> None:
+        # Given
+        deleter = BackgroundDeleter(tmp_path / ".trash")
+
+        # When
+        future = deleter.delete(tmp_path / "missing")
+        deleter.close()
+
+        # Then
+        assert future.done()
+
+    def test_leftovers_of_earlier_run_are_reclaimed(self, tmp_path: Path) -> None:
+        # Given
+        leftover = tmp_path / ".trash" / "slicer.1.0"
+        leftover.mkdir(parents=True)
+        (leftover / "F1").write_text("data")
+
+        # When
+        deleter = BackgroundDeleter(tmp_path / ".trash")
+        deleter.close()
+
+        # Then
+        assert not leftover.exists()
+
+    def test_delete_after_close_is_rejected(self, tmp_path: Path, tree: Path) -> None:
+        # Given
+        deleter = BackgroundDeleter(tmp_path / ".trash")
+        deleter.close()
+
+        # When/Then
+        with pytest.raises(RuntimeError):
+            deleter.delete(tree)
@@ -0,0 +1,76 @@
+import os
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from unit_of_work.utils.remove_tree import remove_tree
+
+
+@pytest.fixture
+def linker_tree(tmp_path: Path) -> Path:
+    root = tmp_path / "linker"
+    for agid in ["SFB", "TGC"]:
+        for load in range(3):
+            directory = root / agid / f"{load}FAA"
+            directory.mkdir(parents=True)
+            for i in range(20):
+                (directory / f"{load}FAA{i}").write_text("data")
+    (root / "SFB" / "RES").mkdir()
+    (root / "SFB" / "RES" / "1").write_text("resource")
+    return root
+
+
+class TestRemoveTree:
+    def test_removes_whole_tree_and_counts_entries(self, linker_tree: Path) -> None:
+        # When
+        stats = remove_tree(linker_tree, max_workers=4, batch_size=7, max_open_directories=2)
+
+        # Then
+        assert not linker_tree.exists()
+        assert stats.files == 2 * 3 * 20 + 1
+        assert stats.directories == 1 + 2 + 2 * 3 + 1
+        assert stats.files_per_second > 0
+
+    def test_symlinks_are_removed_not_followed(self, tmp_path: Path) -> None:
+        # Given
+        outside = tmp_path / "outside"
+        outside.mkdir()
+        (outside / "keep").write_text("keep")
+        root = tmp_path / "slicer"
+        root.mkdir()
+        os.symlink(outside, root / "link")
+
+        # When
+        remove_tree(root)
+
+        # Then
+        assert not root.exists()
+        assert (outside / "keep").exists()
+
+    def test_unlinks_relative_to_directory_descriptor(self, linker_tree: Path) -> None:
+        # When
+        with patch("unit_of_work.utils.remove_tree.os.unlink", wraps=os.unlink) as unlink:
+            remove_tree(linker_tree)
+
+        # Then
+        assert all("dir_fd" in unlink_call.kwargs and "/" not in unlink_call.args[0]
+                   for unlink_call in unlink.call_args_list)
+
+    def test_error_is_raised_after_removing_the_rest(self, linker_tree: Path) -> None:
+        # Given
+        original_unlink = os.unlink
+
+        def failing_unlink(name, dir_fd=None):
+            if name == "0FAA0":
+                raise PermissionError(13, "Permission denied", name)
+            original_unlink(name, dir_fd=dir_fd)
+
+        # When
+        with patch("unit_of_work.utils.remove_tree.os.unlink", side_effect=failing_unlink):
+            with pytest.raises(PermissionError):
+                remove_tree(linker_tree, batch_size=5)
+
+        # Then
+        remaining = sorted(path.name for path in linker_tree.rglob("*") if path.is_file())
+        assert remaining == ["0FAA0", "0FAA0"]
@@ -1,30 +1,47 @@
 import logging
+import signal
 from logging import Logger
+from dataclasses import dataclass
 from pathlib import Path
+from typing import Optional
 
 from unit_of_work.config.payload_migration_config import PayloadMigrationConfig, load_config
+from unit_of_work.daemon.tape_daemon import TapeDaemon
+from unit_of_work.daemon.tape_daemon_impl import TapeDaemonImpl
 from unit_of_work.linker.agid_name_lookup.agid_name_lookup import AgidNameLookup
 from unit_of_work.linker.agid_name_lookup.agid_name_lookup_impl import AgidNameLookupImpl
+from unit_of_work.linker.agid_name_lookup.cached_agid_name_lookup_impl import CachedAgidNameLookupImpl
+from unit_of_work.linker.agid_name_lookup.tape_scoped_agid_name_lookup_impl import TapeScopedAgidNameLookupImpl
 from unit_of_work.linker.link_creator.link_creator import LinkCreator
 from unit_of_work.linker.link_creator.link_creator_impl import LinkCreatorImpl
+from unit_of_work.linker.link_creator.threaded_link_creator_impl import ThreadedLinkCreatorImpl
 from unit_of_work.linker.path_transformer.path_transformer import PathTransformer
 from unit_of_work.linker.path_transformer.path_transformer_impl import PathTransformerImpl
 from unit_of_work.logging import logging_setup
+from unit_of_work.metrics.metrics_publisher import MetricsPublisher
+from unit_of_work.metrics.metrics_publisher_impl import MetricsPublisherImpl
+from unit_of_work.processor.stage_marker import StageMarker
 from unit_of_work.processor.unit_of_work_processor_impl import UnitOfWorkProcessorImpl
 from unit_of_work.processor.unit_of_work_processor import UnitOfWorkProcessor
+from unit_of_work.processor.streaming_unit_of_work_processor_impl import StreamingUnitOfWorkProcessorImpl
+from unit_of_work.processor.direct_upload_unit_of_work_processor_impl import DirectUploadUnitOfWorkProcessorImpl
 from unit_of_work.sanity_checker.sanity_checker import SanityChecker
 from unit_of_work.sanity_checker.sanity_checker_impl import SanityCheckerImpl
 from unit_of_work.slicer.slicer import Slicer
 from unit_of_work.slicer.slicer_impl import SlicerImpl
 from unit_of_work.tape_import_confirmer.tape_import_confirmer import TapeImportConfirmer
 from unit_of_work.tape_import_confirmer.tape_import_confirmer_impl import TapeImportConfirmerImpl
+from unit_of_work.tape_import_confirmer.inotify_tape_import_confirmer_impl import InotifyTapeImportConfirmerImpl
 from unit_of_work.tape_register.tape_register import TapeRegister
 from unit_of_work.tape_register.tape_register_impl import TapeRegisterImpl
 from unit_of_work.uploader.hcp_uploader import HcpUploader
 from unit_of_work.uploader.hcp_uploader_aws_cli import HcpUploaderAwsCliImpl
+from unit_of_work.uploader.hcp_uploader_boto3_impl import HcpUploaderBoto3Impl
+from unit_of_work.utils.background_deleter import BackgroundDeleter
 import argparse
 from unit_of_work.db2.db2_connection_impl import DB2ConnectionImpl
 from unit_of_work.db2.db_connection import DBConnection
+from unit_of_work.db2.pooled_db_connection_impl import PooledDBConnectionImpl
 
 logger: Logger = logging.getLogger(__name__)
 
@@ -33,75 +50,309 @@ def parse_args():
                                                  'named "Unit of Work." It extracts by waiting for and confirming the existence of an imported tape, '
                                                  'transforms by slicing the tape, performing sanity checks, and creating a future directory structure via symbolic links, '
                                                  'and loads by uploading the processed data to S3.')
-    parser.add_argument('--tape-name', type=str, required=True, help='Tape Name (vTapeFile)')
+    mode = parser.add_mutually_exclusive_group(required=True)
+    mode.add_argument('--tape-name', type=str, help='Tape Name (vTapeFile)')
+    mode.add_argument('--daemon', action='store_true',
+                      help='Run as a long-lived worker claiming new/requested tapes from the tape register')
+    parser.add_argument('--max-concurrent-tapes', type=int, default=None,
+                        help='Daemon mode: number of tapes processed concurrently (overrides daemon_config)')
     return parser.parse_args()
-    
-    
-def main():
-    args = parse_args()
-    payload_migration_config: PayloadMigrationConfig = load_config("./unit_of_work/resources/payload_migration_config.yaml")
-    
-    tape_name: str = args.tape_name
-    
-    working_directory: Path = payload_migration_config.output_working_directory / tape_name
-    slicer_output_directory: Path = working_directory / 'slicer'
-    linker_output_directory: Path = working_directory / 'linker'
-    unit_our_work_log: Path = working_directory / 'log' / f'unit_of_work_{tape_name}.log'
-    slicer_log: Path = working_directory / 'log' / f'slicer_{tape_name}.log'
-    sanity_checker_log: Path = working_directory / 'log' / f'sanity_checker_{tape_name}.log'
 
-    logging_setup.setup_logging(unit_our_work_log)
-    tape_location: Path = payload_migration_config.tape_import_confirmer_config.tape_directory / tape_name
-    logger.info(f"Starting unit of work, tape name: {tape_name}, tape location: {tape_location}")
-    
-    
+
+@dataclass
+class SharedComponents:
+    """Components that are tape independent and therefore built once per process."""
+    db2_connection: DBConnection
+    tape_register: TapeRegister
+    tape_import_confirmer: TapeImportConfirmer
+    slicer: Slicer
+    sanity_checker: SanityChecker
+    path_transformer: PathTransformer
+    hcp_uploader: HcpUploader
+    background_deleter: Optional[BackgroundDeleter]
+    metrics_publisher: Optional[MetricsPublisher]
+
+
+def build_shared_components(payload_migration_config: PayloadMigrationConfig) -> SharedComponents:
     db2_connection: DBConnection = DB2ConnectionImpl(
         database = payload_migration_config.db_config.database,
         user = payload_migration_config.db_config.user,
         password = payload_migration_config.db_config.password
     )
+    if payload_migration_config.db_config.pool_size > 0:
+        db2_connection = PooledDBConnectionImpl(
+            connect = db2_connection.open,
+            pool_size = payload_migration_config.db_config.pool_size,
+            health_check_query = DB2ConnectionImpl.HEALTH_CHECK_QUERY
+        )
     tape_register: TapeRegister = TapeRegisterImpl(db2_connection, payload_migration_config.tape_register_table)
-    tape_import_confirmer: TapeImportConfirmer = TapeImportConfirmerImpl(
-        ready_extension=payload_migration_config.tape_import_confirmer_config.ready_extension,
-        timeout=payload_migration_config.tape_import_confirmer_config.timeout,
-        check_interval=payload_migration_config.tape_import_confirmer_config.check_interval
-    )
+    confirmer_config = payload_migration_config.tape_import_confirmer_config
+    tape_import_confirmer: TapeImportConfirmer
+    if confirmer_config.use_inotify:
+        tape_import_confirmer = InotifyTapeImportConfirmerImpl(
+            ready_extension=confirmer_config.ready_extension,
+            timeout=confirmer_config.timeout,
+            check_interval=confirmer_config.check_interval
+        )
+    else:
+        tape_import_confirmer = TapeImportConfirmerImpl(
+            ready_extension=confirmer_config.ready_extension,
+            timeout=confirmer_config.timeout,
+            check_interval=confirmer_config.check_interval
+        )
     slicer: Slicer = SlicerImpl(
         slicer_path = payload_migration_config.slicer_config.slicer_path
     )
     sanity_checker: SanityChecker = SanityCheckerImpl(
         sanity_checker_path = payload_migration_config.sanity_checker_config.sanity_checker_path
     )
-    agid_name_lookup: AgidNameLookup = AgidNameLookupImpl(db2_connection)
+    linker_config = payload_migration_config.linker_config
+    agid_name_lookup: AgidNameLookup
+    if linker_config.agid_name_lookup_mode == 'tape_scoped':
+        agid_name_lookup = TapeScopedAgidNameLookupImpl(db2_connection)
+    elif linker_config.agid_name_lookup_mode == 'full' and linker_config.agid_name_cache_ttl > 0:
+        agid_name_lookup = CachedAgidNameLookupImpl(
+            db2_connection,
+            cache_file = payload_migration_config.output_working_directory / "agid_name_cache.sqlite",
+            ttl = linker_config.agid_name_cache_ttl
+        )
+    elif linker_config.agid_name_lookup_mode == 'full':
+        agid_name_lookup = AgidNameLookupImpl(
+            db2_connection,
+            refresh_interval = linker_config.agid_name_refresh_interval
+        )
+    else:
+        raise ValueError(f"Unknown agid_name_lookup_mode: {linker_config.agid_name_lookup_mode}")
     path_transformer: PathTransformer = PathTransformerImpl(agid_name_lookup)
-    link_creator: LinkCreator = LinkCreatorImpl(
-        source_dir = slicer_output_directory,
-        output_directory= linker_output_directory,
-        file_patterns = payload_migration_config.linker_config.file_patterns,
-        path_transformer = path_transformer
+
+    uploader_config = payload_migration_config.uploader_config
+    hcp_uploader: HcpUploader
+    if uploader_config.implementation == 'boto3':
+        hcp_uploader = HcpUploaderBoto3Impl(
+            s3_bucket = uploader_config.s3_bucket,
+            s3_prefix = uploader_config.s3_prefix,
+            verify_ssl = uploader_config.verify_ssl,
+            endpoint_url = uploader_config.endpoint_url,
+            multipart_threshold = uploader_config.multipart_threshold,
+            multipart_chunksize = uploader_config.multipart_chunksize,
+            max_concurrency = uploader_config.max_concurrency,
+            max_workers = uploader_config.max_workers,
+            adaptive_concurrency = uploader_config.adaptive_concurrency,
+            upload_checksums = uploader_config.upload_checksums,
+            delete_uploaded = uploader_config.delete_uploaded
+        )
+    elif uploader_config.implementation == 'aws_cli':
+        hcp_uploader = HcpUploaderAwsCliImpl(
+            s3_bucket = uploader_config.s3_bucket,
+            s3_prefix = uploader_config.s3_prefix,
+            verify_ssl = uploader_config.verify_ssl,
+            delete_uploaded = uploader_config.delete_uploaded
+        )
+    else:
+        raise ValueError(f"Unknown uploader implementation: {uploader_config.implementation}")
+
+    background_deleter: Optional[BackgroundDeleter] = None
+    if payload_migration_config.processor_config.background_delete:
+        background_deleter = BackgroundDeleter(payload_migration_config.output_working_directory / '.trash')
+
+    metrics_config = payload_migration_config.metrics_config
+    metrics_publisher: Optional[MetricsPublisher] = None
+    if metrics_config.history or metrics_config.textfile:
+        metrics_publisher = MetricsPublisherImpl(
+            textfile = Path(metrics_config.textfile) if metrics_config.textfile else None,
+            history_file = (
+                payload_migration_config.output_working_directory / 'log' / 'unit_of_work_metrics.jsonl'
+                if metrics_config.history else None
+            ),
+            gauges = hcp_uploader.metrics if isinstance(hcp_uploader, HcpUploaderBoto3Impl) else None
+        )
+
+    return SharedComponents(
+        db2_connection=db2_connection,
+        tape_register=tape_register,
+        tape_import_confirmer=tape_import_confirmer,
+        slicer=slicer,
+        sanity_checker=sanity_checker,
+        path_transformer=path_transformer,
+        hcp_uploader=hcp_uploader,
+        background_deleter=background_deleter,
+        metrics_publisher=metrics_publisher
     )
-    
-    hcp_uploader: HcpUploader = HcpUploaderAwsCliImpl(
-        s3_bucket = payload_migration_config.uploader_config.s3_bucket,
-        s3_prefix = payload_migration_config.uploader_config.s3_prefix,
-        verify_ssl = payload_migration_config.uploader_config.verify_ssl
+
+
+def close_shared_components(shared: SharedComponents) -> None:
+    if isinstance(shared.tape_import_confirmer, InotifyTapeImportConfirmerImpl):
+        shared.tape_import_confirmer.close()
+    if shared.background_deleter is not None:
+        # Deletions still running would otherwise be cut off by the interpreter exit
+        shared.background_deleter.close(wait=True)
+
+
+def build_processor(
+    payload_migration_config: PayloadMigrationConfig,
+    shared: SharedComponents,
+    tape_name: str
+) -> UnitOfWorkProcessor:
+    working_directory: Path = payload_migration_config.output_working_directory / tape_name
+    slicer_output_directory: Path = working_directory / 'slicer'
+    linker_output_directory: Path = working_directory / 'linker'
+    slicer_log: Path = working_directory / 'log' / f'slicer_{tape_name}.log'
+    sanity_checker_log: Path = working_directory / 'log' / f'sanity_checker_{tape_name}.log'
+    link_failure_file: Path = working_directory / 'log' / f'link_failures_{tape_name}.tsv'
+    upload_manifest_file: Path = working_directory / 'log' / f'upload_manifest_{tape_name}.tsv'
+
+    processor_config = payload_migration_config.processor_config
+    stage_marker: Optional[StageMarker] = (
+        StageMarker(working_directory / 'stage_marker.json') if processor_config.resume else None
     )
-    
-    processor: UnitOfWorkProcessor = UnitOfWorkProcessorImpl(
-        tape_import_confirmer = tape_import_confirmer,
-        tape_register = tape_register,
-        slicer = slicer,
-        sanity_checker = sanity_checker,
+    # The manifest is also where the uploader keeps the checksums of the objects
+    upload_manifest: Optional[Path] = (
+        upload_manifest_file
+        if processor_config.resume or payload_migration_config.uploader_config.upload_checksums
+        else None
+    )
+    if processor_config.direct_upload:
+        if processor_config.streaming:
+            raise ValueError("processor_config.direct_upload cannot be combined with processor_config.streaming")
+        if payload_migration_config.uploader_config.implementation == 'aws_cli':
+            # Slicer keys never mirror their local paths, so the CLI would run once per file
+            raise ValueError("processor_config.direct_upload requires uploader_config.implementation: boto3")
+        return DirectUploadUnitOfWorkProcessorImpl(
+            tape_import_confirmer = shared.tape_import_confirmer,
+            tape_register = shared.tape_register,
+            slicer = shared.slicer,
+            sanity_checker = shared.sanity_checker,
+            path_transformer = shared.path_transformer,
+            hcp_uploader = shared.hcp_uploader,
+            slicer_output_directory=slicer_output_directory,
+            slicer_log=slicer_log,
+            sanity_checker_log=sanity_checker_log,
+            linked_output_directory=linker_output_directory,
+            file_patterns=payload_migration_config.linker_config.file_patterns,
+            upload_batch_size=processor_config.upload_batch_size,
+            key_failure_file=link_failure_file,
+            stage_marker=stage_marker,
+            upload_manifest_file=upload_manifest,
+            background_deleter=shared.background_deleter,
+            metrics_publisher=shared.metrics_publisher
+        )
+
+    link_creator: LinkCreator
+    if payload_migration_config.linker_config.max_workers > 1:
+        link_creator = ThreadedLinkCreatorImpl(
+            source_dir = slicer_output_directory,
+            output_directory= linker_output_directory,
+            file_patterns = payload_migration_config.linker_config.file_patterns,
+            path_transformer = shared.path_transformer,
+            max_workers = payload_migration_config.linker_config.max_workers,
+            failure_file = link_failure_file
+        )
+    else:
+        link_creator = LinkCreatorImpl(
+            source_dir = slicer_output_directory,
+            output_directory= linker_output_directory,
+            file_patterns = payload_migration_config.linker_config.file_patterns,
+            path_transformer = shared.path_transformer,
+            failure_file = link_failure_file
+        )
+
+    if processor_config.streaming:
+        return StreamingUnitOfWorkProcessorImpl(
+            tape_import_confirmer = shared.tape_import_confirmer,
+            tape_register = shared.tape_register,
+            slicer = shared.slicer,
+            sanity_checker = shared.sanity_checker,
+            link_creator = link_creator,
+            hcp_uploader = shared.hcp_uploader,
+            slicer_output_directory=slicer_output_directory,
+            slicer_log=slicer_log,
+            sanity_checker_log=sanity_checker_log,
+            linked_output_directory=linker_output_directory,
+            file_patterns=payload_migration_config.linker_config.file_patterns,
+            poll_interval=processor_config.poll_interval,
+            settle_seconds=processor_config.settle_seconds,
+            upload_batch_size=processor_config.upload_batch_size,
+            stage_marker=stage_marker,
+            upload_manifest_file=upload_manifest,
+            background_deleter=shared.background_deleter,
+            metrics_publisher=shared.metrics_publisher
+        )
+
+    return UnitOfWorkProcessorImpl(
+        tape_import_confirmer = shared.tape_import_confirmer,
+        tape_register = shared.tape_register,
+        slicer = shared.slicer,
+        sanity_checker = shared.sanity_checker,
         link_creator = link_creator,
-        hcp_uploader = hcp_uploader,
+        hcp_uploader = shared.hcp_uploader,
         slicer_output_directory=slicer_output_directory,
         slicer_log=slicer_log,
         sanity_checker_log=sanity_checker_log,
-        linked_output_directory=linker_output_directory
+        linked_output_directory=linker_output_directory,
+        stage_marker=stage_marker,
+        upload_manifest_file=upload_manifest,
+        background_deleter=shared.background_deleter,
+        metrics_publisher=shared.metrics_publisher
     )
-    
-    
-    processor.process(tape_name, tape_location)
+
+
+def run_single_tape(payload_migration_config: PayloadMigrationConfig, tape_name: str) -> None:
+    working_directory: Path = payload_migration_config.output_working_directory / tape_name
+    unit_our_work_log: Path = working_directory / 'log' / f'unit_of_work_{tape_name}.log'
+
+    logging_setup.setup_logging(unit_our_work_log)
+    tape_location: Path = payload_migration_config.tape_import_confirmer_config.tape_directory / tape_name
+    logger.info(f"Starting unit of work, tape name: {tape_name}, tape location: {tape_location}")
+
+    shared: SharedComponents = build_shared_components(payload_migration_config)
+    processor: UnitOfWorkProcessor = build_processor(payload_migration_config, shared, tape_name)
+
+    try:
+        processor.process(tape_name, tape_location)
+    finally:
+        close_shared_components(shared)
+
+
+def run_daemon(payload_migration_config: PayloadMigrationConfig, max_concurrent_tapes: int) -> None:
+    daemon_log: Path = payload_migration_config.output_working_directory / 'log' / 'unit_of_work_daemon.log'
+    logging_setup.setup_logging(daemon_log)
+
+    shared: SharedComponents = build_shared_components(payload_migration_config)
+    daemon: TapeDaemon = TapeDaemonImpl(
+        tape_register=shared.tape_register,
+        processor_factory=lambda tape_name: build_processor(payload_migration_config, shared, tape_name),
+        tape_directory=payload_migration_config.tape_import_confirmer_config.tape_directory,
+        max_concurrent_tapes=max_concurrent_tapes,
+        poll_interval=payload_migration_config.daemon_config.poll_interval,
+        release_claims_on_start=payload_migration_config.daemon_config.release_claims_on_start
+    )
+
+    def _request_stop(signum, frame) -> None:
+        logger.info(f"Received signal {signum}, finishing tapes in flight before exit")
+        daemon.stop()
+
+    signal.signal(signal.SIGTERM, _request_stop)
+    signal.signal(signal.SIGINT, _request_stop)
+
+    try:
+        daemon.run()
+    finally:
+        close_shared_components(shared)
+
+
+def main():
+    args = parse_args()
+    payload_migration_config: PayloadMigrationConfig = load_config("./unit_of_work/resources/payload_migration_config.yaml")
+
+    if args.daemon:
+        max_concurrent_tapes: int = (
+            args.max_concurrent_tapes
+            if args.max_concurrent_tapes is not None
+            else payload_migration_config.daemon_config.max_concurrent_tapes
+        )
+        run_daemon(payload_migration_config, max_concurrent_tapes)
+    else:
+        run_single_tape(payload_migration_config, args.tape_name)
     
 if __name__ == '__main__':
     main()
\ No newline at end of file
@@ -9,6 +9,8 @@ class DbConfig:
     database: str
     user: str
     password: str
+    # Connections shared by all pipelines of the process; 0 connects per call
+    pool_size: int = 4
     
 @dataclass
 class TapeImportConfirmerConfig:
@@ -16,6 +18,8 @@ class TapeImportConfirmerConfig:
     ready_extension: str
     timeout: int
     check_interval: int
+    # Wait for the ready file with inotify where available instead of polling
+    use_inotify: bool = True
 
 @dataclass
 class SlicerConfig:
@@ -30,12 +34,62 @@ class LinkerConfig:
     # output_directory: Path
     agid_name_lookup_table: str
     file_patterns: [str]
+    # Concurrent link calls; 1 links sequentially
+    max_workers: int = 1
+    # 'full' loads the whole mig_mapping table, 'tape_scoped' only the AGIDs on the tape
+    agid_name_lookup_mode: str = 'full'
+    # Seconds the local AGID name cache is trusted without asking DB2; 0 disables it
+    agid_name_cache_ttl: float = 3600
+    # Without the cache: age after which a lookup miss reloads the mapping from DB2
+    agid_name_refresh_interval: float = 3600
     
 @dataclass
 class UploaderConfig:
     verify_ssl: bool
     s3_bucket: str
     s3_prefix: str
+    # 'aws_cli' shells out to `aws s3 cp`, 'boto3' uploads in process
+    implementation: str = 'aws_cli'
+    endpoint_url: Optional[str] = None
+    multipart_threshold: int = 64 * 1024 * 1024
+    multipart_chunksize: int = 16 * 1024 * 1024
+    max_concurrency: int = 4
+    max_workers: int = 16
+    # boto3: back off from max_workers objects in flight when HCP throttles
+    adaptive_concurrency: bool = True
+    # boto3: send a Content-MD5 with every request and record checksums in the upload manifest
+    upload_checksums: bool = False
+    # Unlink each local file as soon as its upload was acknowledged
+    delete_uploaded: bool = False
+
+@dataclass
+class ProcessorConfig:
+    # Skip stages whose output a failed run left intact
+    resume: bool = True
+    # Link and upload slicer output while the slicer is still running
+    streaming: bool = False
+    # Upload slicer output straight to its final object keys instead of linking it first
+    direct_upload: bool = False
+    # Move finished working directories to a trash directory and delete them on a background thread
+    background_delete: bool = True
+    poll_interval: float = 5
+    settle_seconds: float = 10
+    upload_batch_size: int = 1000
+
+@dataclass
+class DaemonConfig:
+    max_concurrent_tapes: int = 4
+    poll_interval: int = 30
+    # Return tapes left claimed by a crashed daemon to the requested status on start;
+    # only safe while a single daemon works on the tape register
+    release_claims_on_start: bool = False
+
+@dataclass
+class MetricsConfig:
+    # Append every unit of work to <output_working_directory>/log/unit_of_work_metrics.jsonl
+    history: bool = True
+    # Prometheus textfile, e.g. in the node exporter's textfile collector directory
+    textfile: Optional[str] = None
 
 @dataclass
 class PayloadMigrationConfig:
@@ -47,6 +101,9 @@ class PayloadMigrationConfig:
     sanity_checker_config: SanityCheckerConfig
     linker_config: LinkerConfig
     uploader_config: UploaderConfig
+    daemon_config: DaemonConfig
+    processor_config: ProcessorConfig
+    metrics_config: MetricsConfig
 
 
 def load_config(config_path: Optional[str] = None) -> PayloadMigrationConfig:
@@ -62,13 +119,15 @@ def load_config(config_path: Optional[str] = None) -> PayloadMigrationConfig:
         db_config=DbConfig(
           database=yaml_config['db_config']['database'],
           user=yaml_config['db_config']['user'],
-          password=yaml_config['db_config']['password']
+          password=yaml_config['db_config']['password'],
+          pool_size=yaml_config['db_config'].get('pool_size', 4)
         ),
         tape_import_confirmer_config=TapeImportConfirmerConfig(
             tape_directory=Path(yaml_config['tape_import_confirmer_config']['tape_directory']),
             ready_extension=yaml_config['tape_import_confirmer_config']['ready_extension'],
             timeout=yaml_config['tape_import_confirmer_config']['timeout'],
-            check_interval=yaml_config['tape_import_confirmer_config']['check_interval']
+            check_interval=yaml_config['tape_import_confirmer_config']['check_interval'],
+            use_inotify=yaml_config['tape_import_confirmer_config'].get('use_inotify', True)
         ),
         slicer_config=SlicerConfig(
             slicer_path=Path(yaml_config['slicer_config']['slicer_path']),
@@ -78,11 +137,14 @@ def load_config(config_path: Optional[str] = None) -> PayloadMigrationConfig:
         ),
         linker_config=LinkerConfig(
             agid_name_lookup_table=yaml_config['linker_config']['agid_name_lookup_table'],
-            file_patterns=yaml_config['linker_config']['file_patterns']
+            file_patterns=yaml_config['linker_config']['file_patterns'],
+            max_workers=yaml_config['linker_config'].get('max_workers', 1),
+            agid_name_lookup_mode=yaml_config['linker_config'].get('agid_name_lookup_mode', 'full'),
+            agid_name_cache_ttl=yaml_config['linker_config'].get('agid_name_cache_ttl', 3600),
+            agid_name_refresh_interval=yaml_config['linker_config'].get('agid_name_refresh_interval', 3600)
         ),
-        uploader_config=UploaderConfig(
-            verify_ssl=yaml_config['uploader_config']['verify_ssl'],
-            s3_bucket=yaml_config['uploader_config']['s3_bucket'],
-            s3_prefix=yaml_config['uploader_config']['s3_prefix'],
-        )
+        uploader_config=UploaderConfig(**yaml_config['uploader_config']),
+        daemon_config=DaemonConfig(**yaml_config.get('daemon_config', {})),
+        processor_config=ProcessorConfig(**yaml_config.get('processor_config', {})),
+        metrics_config=MetricsConfig(**yaml_config.get('metrics_config', {}))
     )
\ No newline at end of file
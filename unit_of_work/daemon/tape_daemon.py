@@ -0,0 +1,11 @@
+from abc import ABC, abstractmethod
+
+
+class TapeDaemon(ABC):
+    @abstractmethod
+    def run(self) -> None:
+        pass
+
+    @abstractmethod
+    def stop(self) -> None:
+        pass
@@ -0,0 +1,93 @@
+import logging
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+from typing import Callable, Dict
+
+from unit_of_work.daemon.tape_daemon import TapeDaemon
+from unit_of_work.processor.unit_of_work_processor import UnitOfWorkProcessor
+from unit_of_work.tape_register.tape_register import TapeRegister
+
+logger = logging.getLogger(__name__)
+
+
+class TapeDaemonImpl(TapeDaemon):
+    def __init__(
+        self,
+        tape_register: TapeRegister,
+        processor_factory: Callable[[str], UnitOfWorkProcessor],
+        tape_directory: Path,
+        max_concurrent_tapes: int,
+        poll_interval: float,
+        release_claims_on_start: bool = False
+    ) -> None:
+        if max_concurrent_tapes < 1:
+            raise ValueError(f"max_concurrent_tapes must be positive, got {max_concurrent_tapes}")
+        self._tape_register: TapeRegister = tape_register
+        self._processor_factory: Callable[[str], UnitOfWorkProcessor] = processor_factory
+        self._tape_directory: Path = tape_directory
+        self._max_concurrent_tapes: int = max_concurrent_tapes
+        self._poll_interval: float = poll_interval
+        self._release_claims_on_start: bool = release_claims_on_start
+        self._stop_event: threading.Event = threading.Event()
+        self._in_flight: Dict[str, Future] = {}
+        self._lock: threading.Lock = threading.Lock()
+
+    def run(self) -> None:
+        logger.info(
+            f"Tape daemon starting, max concurrent tapes: {self._max_concurrent_tapes}, "
+            f"poll interval: {self._poll_interval}s"
+        )
+        if self._release_claims_on_start:
+            # No tape is in flight yet, so every claimed tape belongs to a dead worker
+            self._tape_register.release_claims()
+        with ThreadPoolExecutor(
+            max_workers=self._max_concurrent_tapes,
+            thread_name_prefix="unit_of_work"
+        ) as executor:
+            while not self._stop_event.is_set():
+                self._claim_and_submit(executor)
+                self._stop_event.wait(self._poll_interval)
+
+            logger.info(f"Tape daemon stopping, waiting for {self.in_flight_count()} tape(s) in flight")
+        logger.info("Tape daemon stopped")
+
+    def stop(self) -> None:
+        self._stop_event.set()
+
+    def in_flight_count(self) -> int:
+        with self._lock:
+            return len(self._in_flight)
+
+    def _claim_and_submit(self, executor: ThreadPoolExecutor) -> None:
+        free_slots = self._max_concurrent_tapes - self.in_flight_count()
+        if free_slots <= 0:
+            return
+        try:
+            tape_names = self._tape_register.claim_tapes(free_slots)
+        except Exception as e:
+            logger.error(f"Claiming tapes failed, retrying in {self._poll_interval}s: {str(e)}")
+            return
+
+        for tape_name in tape_names:
+            logger.info(f"Claimed tape {tape_name}")
+            with self._lock:
+                future = executor.submit(self._process_tape, tape_name)
+                self._in_flight[tape_name] = future
+            future.add_done_callback(lambda _, name=tape_name: self._release(name))
+
+    def _process_tape(self, tape_name: str) -> None:
+        tape_location: Path = self._tape_directory / tape_name
+        try:
+            self._processor_factory(tape_name).process(tape_name, tape_location)
+        except Exception as e:
+            # process() reports its own failures; this only guards the worker slot.
+            logger.error(f"Unit of work crashed, tape name: {tape_name}, {str(e)}", exc_info=True)
+            try:
+                self._tape_register.set_status_failed(tape_name)
+            except Exception:
+                logger.exception(f"Failed to set status failed, tape stays claimed, tape name: {tape_name}")
+
+    def _release(self, tape_name: str) -> None:
+        with self._lock:
+            self._in_flight.pop(tape_name, None)
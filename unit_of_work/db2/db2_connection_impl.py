@@ -1,5 +1,5 @@
 from contextlib import contextmanager
-from typing import Generator, Optional, Dict
+from typing import Generator, Iterable, Iterator, Optional, Dict, Sequence
 
 from ibm_db_dbi import connect, Connection, Error as DB2Error
 import logging
@@ -9,6 +9,9 @@ from unit_of_work.db2.db_connection import DBConnection
 logger = logging.getLogger(__name__)
 
 class DB2ConnectionImpl(DBConnection):
+    # Cheapest statement DB2 can answer, used to validate pooled connections
+    HEALTH_CHECK_QUERY: str = "SELECT 1 FROM SYSIBM.SYSDUMMY1"
+
     def __init__(
         self,
         database: str,
@@ -19,11 +22,15 @@ class DB2ConnectionImpl(DBConnection):
         self._user = user
         self._password = password
 
+    def open(self) -> Connection:
+        """Opens a new connection that the caller must close."""
+        return connect(self._database, self._user, self._password)
+
     @contextmanager
     def _connect(self) -> Generator[Connection, None, None]:
         conn: Optional[Connection] = None
         try:
-            conn = connect(self._database, self._user, self._password)
+            conn = self.open()
             yield conn
         except DB2Error as e:
             logger.error("DB2 connection error",
@@ -47,22 +54,43 @@ class DB2ConnectionImpl(DBConnection):
             if conn is not None:
                 conn.close()
 
-    def fetch_all(self, query: str) -> Dict[str, tuple]:
+    def fetch_all(self, query: str, params: Sequence = ()) -> Dict[str, tuple]:
         with self._connect() as connection:
             cursor = connection.cursor()
-            cursor.execute(query)
+            cursor.execute(query, tuple(params))
             return {row[0]: (row[1],) if len(row) == 2 else row[1:]
                     for row in cursor.fetchall()}
         
-    def fetch_one(self, query: str) -> Optional[tuple]:
+    def fetch_one(self, query: str, params: Sequence = ()) -> Optional[tuple]:
         with self._connect() as connection:
             cursor = connection.cursor()
-            cursor.execute(query)
+            cursor.execute(query, tuple(params))
             return cursor.fetchone()
 
-    def update(self, query: str) -> None:
+    def iter_rows(self, query: str, params: Sequence = (), batch_size: int = 10000) -> Iterator[tuple]:
+        with self._connect() as connection:
+            cursor = connection.cursor()
+            cursor.execute(query, tuple(params))
+            while rows := cursor.fetchmany(batch_size):
+                yield from rows
+
+    def update(self, query: str) -> int:
         with self._connect() as connection:
             cursor = connection.cursor()
             cursor.execute(query)
             connection.commit()
+            return cursor.rowcount
 
+    def execute(self, query: str, params: Sequence = ()) -> int:
+        with self._connect() as connection:
+            cursor = connection.cursor()
+            cursor.execute(query, tuple(params))
+            connection.commit()
+            return cursor.rowcount
+
+    def executemany(self, query: str, params_seq: Iterable[Sequence]) -> int:
+        with self._connect() as connection:
+            cursor = connection.cursor()
+            cursor.executemany(query, [tuple(params) for params in params_seq])
+            connection.commit()
+            return cursor.rowcount
@@ -1,17 +1,36 @@
 from abc import ABC, abstractmethod
-from typing import Dict, Optional
+from typing import Dict, Iterable, Iterator, Optional, Sequence
 
 
 class DBConnection(ABC):
     @abstractmethod
-    def fetch_all(self, query: str) -> Dict[str, tuple]:
+    def fetch_all(self, query: str, params: Sequence = ()) -> Dict[str, tuple]:
         pass
     
     @abstractmethod
-    def fetch_one(self, query: str) -> Optional[tuple]:
+    def fetch_one(self, query: str, params: Sequence = ()) -> Optional[tuple]:
         pass
     
     @abstractmethod
-    def update(self, query: str) -> None:
+    def iter_rows(self, query: str, params: Sequence = (), batch_size: int = 10000) -> Iterator[tuple]:
+        """Yields the result rows, fetched from the database `batch_size` at a time,
+        so that only one batch is held in memory. The connection stays in use until
+        the iterator is exhausted or closed."""
         pass
 
+    @abstractmethod
+    def update(self, query: str) -> int:
+        """Returns the number of rows affected by the statement."""
+        pass
+
+    @abstractmethod
+    def execute(self, query: str, params: Sequence = ()) -> int:
+        """Executes and commits a statement with `params` bound to its `?` markers.
+        Returns the number of rows affected."""
+        pass
+
+    @abstractmethod
+    def executemany(self, query: str, params_seq: Iterable[Sequence]) -> int:
+        """Executes and commits a statement once per parameter set. Returns the
+        number of rows affected, where the driver reports it."""
+        pass
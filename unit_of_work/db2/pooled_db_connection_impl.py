@@ -0,0 +1,170 @@
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Generator, Iterable, Iterator, List, Optional, Sequence, Tuple
+import logging
+import threading
+import time
+
+from unit_of_work.db2.db_connection import DBConnection
+from unit_of_work.db2.statement_cache import StatementCache
+
+logger = logging.getLogger(__name__)
+
+class PooledDBConnectionImpl(DBConnection):
+    """DBConnection that reuses up to `pool_size` DB-API connections across calls and threads.
+
+    Connections are opened by `connect` on demand and handed out last-in first-out,
+    so a quiet process keeps reusing its most recently used connection while the
+    others age out. A connection idle for more than `health_check_interval` seconds is
+    validated with `health_check_query` before use and replaced if that fails. A
+    connection that raised during a call is closed rather than returned to the pool,
+    so a stale handle is never reused; the failed call itself is not retried. Each
+    connection keeps its own StatementCache, so parameterised statements are
+    prepared once per connection.
+    """
+
+    def __init__(
+        self,
+        connect: Callable[[], Any],
+        pool_size: int,
+        health_check_query: str,
+        health_check_interval: float = 30
+    ):
+        if pool_size < 1:
+            raise ValueError(f"pool_size must be positive, got {pool_size}")
+        self._connect_function: Callable[[], Any] = connect
+        self._pool_size: int = pool_size
+        self._health_check_query: str = health_check_query
+        self._health_check_interval: float = health_check_interval
+        self._condition: threading.Condition = threading.Condition()
+        # Idle connections, with their prepared statements and the time they were
+        # returned, most recent last
+        self._idle: List[Tuple[StatementCache, float]] = []
+        self._open: int = 0
+        self._closed: bool = False
+
+    def fetch_all(self, query: str, params: Sequence = ()) -> Dict[str, tuple]:
+        with self._connection() as statements:
+            cursor = statements.execute(query, params)
+            return {row[0]: (row[1],) if len(row) == 2 else row[1:]
+                    for row in cursor.fetchall()}
+
+    def fetch_one(self, query: str, params: Sequence = ()) -> Optional[tuple]:
+        with self._connection() as statements:
+            cursor = statements.execute(query, params)
+            return cursor.fetchone()
+
+    def iter_rows(self, query: str, params: Sequence = (), batch_size: int = 10000) -> Iterator[tuple]:
+        with self._connection() as statements:
+            cursor = statements.execute(query, params)
+            while rows := cursor.fetchmany(batch_size):
+                yield from rows
+
+    def update(self, query: str) -> int:
+        with self._connection() as statements:
+            cursor = statements.connection.cursor()
+            cursor.execute(query)
+            statements.connection.commit()
+            return cursor.rowcount
+
+    def execute(self, query: str, params: Sequence = ()) -> int:
+        with self._connection() as statements:
+            cursor = statements.execute(query, params)
+            statements.connection.commit()
+            return cursor.rowcount
+
+    def executemany(self, query: str, params_seq: Iterable[Sequence]) -> int:
+        with self._connection() as statements:
+            rowcount = statements.executemany(query, params_seq)
+            statements.connection.commit()
+            return rowcount
+
+    def close(self) -> None:
+        """Closes the idle connections; connections in use are closed when returned."""
+        with self._condition:
+            self._closed = True
+            idle, self._idle = self._idle, []
+            self._open -= len(idle)
+            self._condition.notify_all()
+        for statements, _ in idle:
+            self._close_quietly(statements.connection)
+
+    def size(self) -> Tuple[int, int]:
+        """Returns the number of open and of idle connections."""
+        with self._condition:
+            return self._open, len(self._idle)
+
+    @contextmanager
+    def _connection(self) -> Generator[StatementCache, None, None]:
+        statements = self._checkout()
+        try:
+            yield statements
+        except BaseException as e:
+            # Includes GeneratorExit from an iter_rows abandoned mid-result
+            if isinstance(e, Exception):
+                logger.error("Database call failed, discarding its connection",
+                             extra={'error_type': type(e).__name__},
+                             exc_info=e)
+            self._discard(statements)
+            raise
+        self._checkin(statements)
+
+    def _checkout(self) -> StatementCache:
+        with self._condition:
+            while True:
+                if self._closed:
+                    raise RuntimeError("Connection pool is closed")
+                if self._idle:
+                    statements, returned_at = self._idle.pop()
+                    break
+                if self._open < self._pool_size:
+                    # Reserve the slot now, connect outside the lock
+                    self._open += 1
+                    statements, returned_at = None, None
+                    break
+                self._condition.wait()
+
+        if statements is not None:
+            if time.monotonic() - returned_at < self._health_check_interval or self._is_healthy(statements.connection):
+                return statements
+            logger.warning("Replacing stale pooled database connection")
+            self._close_quietly(statements.connection)
+
+        try:
+            return StatementCache(self._connect_function())
+        except Exception:
+            self._release_slot()
+            raise
+
+    def _checkin(self, statements: StatementCache) -> None:
+        with self._condition:
+            if not self._closed:
+                self._idle.append((statements, time.monotonic()))
+                self._condition.notify()
+                return
+        self._discard(statements)
+
+    def _discard(self, statements: StatementCache) -> None:
+        self._close_quietly(statements.connection)
+        self._release_slot()
+
+    def _release_slot(self) -> None:
+        with self._condition:
+            self._open -= 1
+            self._condition.notify()
+
+    def _is_healthy(self, connection: Any) -> bool:
+        try:
+            cursor = connection.cursor()
+            cursor.execute(self._health_check_query)
+            cursor.fetchone()
+            return True
+        except Exception as e:
+            logger.debug("Pooled database connection failed its health check: %s", e)
+            return False
+
+    @staticmethod
+    def _close_quietly(connection: Any) -> None:
+        try:
+            connection.close()
+        except Exception as e:
+            logger.debug("Ignoring error while closing database connection: %s", e)
@@ -0,0 +1,73 @@
+from collections import OrderedDict
+from typing import Any, Iterable, Sequence, Tuple
+import logging
+
+import ibm_db
+import ibm_db_dbi
+
+logger = logging.getLogger(__name__)
+
+class StatementCache:
+    """Prepared statements of one DB-API connection, keyed by their SQL text.
+
+    Each distinct statement gets its own cursor. Drivers whose cursors can `prepare`
+    (ibm_db_dbi from ibm_db 3.3.0) compile the statement once and afterwards only
+    bind new parameters; for other drivers (sqlite3) the cursor is reused and the
+    driver's own statement cache does the rest. The least recently used statements
+    are dropped beyond `max_size`.
+    """
+
+    def __init__(self, connection: Any, max_size: int = 64):
+        self.connection: Any = connection
+        self._max_size: int = max_size
+        self._cursors: "OrderedDict[str, Tuple[Any, bool]]" = OrderedDict()
+
+    def execute(self, query: str, params: Sequence = ()) -> Any:
+        """Executes the query with `params` bound to its `?` markers and returns the
+        cursor holding its result."""
+        cursor, prepared = self._cursor(query)
+        if prepared:
+            cursor.execute(None, tuple(params))
+        else:
+            cursor.execute(query, tuple(params))
+        return cursor
+
+    def executemany(self, query: str, params_seq: Iterable[Sequence]) -> int:
+        """Executes the query once for every parameter set in one round trip and returns
+        the number of affected rows."""
+        cursor, prepared = self._cursor(query)
+        params = tuple(tuple(p) for p in params_seq)
+        if not params:
+            return 0
+        if prepared:
+            # ibm_db_dbi's executemany prepares the SQL text again; execute_many runs the
+            # statement the cursor already holds
+            rowcount = ibm_db.execute_many(cursor.stmt_handler, params)
+            if rowcount is None or rowcount < 0:
+                raise ibm_db_dbi.Error(ibm_db.stmt_errormsg())
+            return rowcount
+        cursor.executemany(query, params)
+        return cursor.rowcount
+
+    def _cursor(self, query: str) -> Tuple[Any, bool]:
+        entry = self._cursors.get(query)
+        if entry is not None:
+            self._cursors.move_to_end(query)
+            return entry
+
+        cursor = self.connection.cursor()
+        prepared = callable(getattr(cursor, "prepare", None))
+        if prepared:
+            cursor.prepare(query)
+        self._cursors[query] = entry = (cursor, prepared)
+        if len(self._cursors) > self._max_size:
+            _, (evicted, _) = self._cursors.popitem(last=False)
+            self._close_quietly(evicted)
+        return entry
+
+    @staticmethod
+    def _close_quietly(cursor: Any) -> None:
+        try:
+            cursor.close()
+        except Exception as e:
+            logger.debug("Ignoring error while closing cursor: %s", e)
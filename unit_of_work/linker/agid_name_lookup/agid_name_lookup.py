@@ -1,6 +1,13 @@
 from abc import ABC, abstractmethod
+from typing import Iterable
 
 class AgidNameLookup(ABC):
     @abstractmethod
     def dest_agid_name(self, src_agid_name: str) -> str:
-        pass
\ No newline at end of file
+        pass
+
+    def prefetch(self, src_agid_names: Iterable[str]) -> None:
+        """Hints the source AGIDs about to be looked up, so that lookups loading
+        mappings lazily can fetch them in bulk. Lookups holding the full mapping
+        ignore it."""
+        pass
@@ -1,5 +1,8 @@
 import logging
-from typing import Dict
+import sys
+import threading
+import time
+from typing import Dict, Iterable, Optional, Set
 
 from unit_of_work.db2.db_connection import DBConnection
 from unit_of_work.linker.agid_name_lookup.agid_name_lookup import AgidNameLookup
@@ -12,23 +15,66 @@ class RemagError(Exception):
 
 
 class AgidNameLookupImpl(AgidNameLookup):
+    """Holds the whole mig_mapping table in memory.
+
+    A long-lived worker shares one lookup across tapes, so with `refresh_interval`
+    a miss reloads the table once the mapping is older than that, and AGIDs mapped
+    since are found without a restart. The new mapping is swapped in under a lock.
+    """
     _QUERY: str = "SELECT distinct(agid_name_src), agid_name_dst FROM mig_mapping"
     
     def __init__(
         self,
-        _db_connection: DBConnection         
+        _db_connection: DBConnection,
+        refresh_interval: Optional[float] = None
     ) -> None:
         self._db2_connection = _db_connection
+        self._refresh_interval: Optional[float] = refresh_interval
+        self._reported_missing: Set[str] = set()
+        self._lock: threading.Lock = threading.Lock()
         
-        self._dict: Dict[str, str] = {
-            k: v[0] 
-            for k, v in self._db2_connection.fetch_all(self._QUERY).items()
+        self._dict: Dict[str, str] = self._load()
+        self._loaded_at: float = time.monotonic()
+
+    def _load(self) -> Dict[str, str]:
+        # Rows are streamed into the dict, so only one batch of raw rows is held
+        # next to it; many source AGIDs share a destination name, which is interned
+        return {
+            sys.intern(row[0]): sys.intern(row[1])
+            for row in self._db2_connection.iter_rows(self._QUERY)
         }
 
     def dest_agid_name(self, src_agid_name: str) -> str:
-        try:
-            return self._dict[src_agid_name]
-        except KeyError:
-            logger.warning(f"Missing entry in remag table for src_agid_name: {src_agid_name}")
+        dest_agid_name: Optional[str] = self._dict.get(src_agid_name)
+        if dest_agid_name is None:
+            self._reload_if_stale()
+            dest_agid_name = self._dict.get(src_agid_name)
+        if dest_agid_name is None:
+            # Every file of an unmapped AGID fails; warning once per AGID is enough
+            if src_agid_name not in self._reported_missing:
+                self._reported_missing.add(src_agid_name)
+                logger.warning(f"Missing entry in remag table for src_agid_name: {src_agid_name}")
             raise RemagError(f"Missing entry in remag table for src_agid_name: {src_agid_name}")
+        return dest_agid_name
+
+    def prefetch(self, src_agid_names: Iterable[str]) -> None:
+        # One reload for the whole batch rather than on the first file that misses
+        if any(name not in self._dict for name in src_agid_names):
+            self._reload_if_stale()
+
+    def _reload_if_stale(self) -> None:
+        if self._refresh_interval is None:
+            return
+        with self._lock:
+            if time.monotonic() - self._loaded_at < self._refresh_interval:
+                return
+            try:
+                mapping: Dict[str, str] = self._load()
+            except Exception as e:
+                logger.warning(f"Cannot reload AGID name mapping, keeping {len(self._dict)} entries: {str(e)}")
+            else:
+                self._dict = mapping
+                logger.info(f"AGID name mapping reloaded, {len(mapping)} entries")
+            # A failed reload is retried only after another interval, not on every miss
+            self._loaded_at = time.monotonic()
 
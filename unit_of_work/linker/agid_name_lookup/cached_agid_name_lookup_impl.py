@@ -0,0 +1,105 @@
+import fcntl
+import logging
+import os
+import sqlite3
+import time
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+from unit_of_work.db2.db_connection import DBConnection
+from unit_of_work.linker.agid_name_lookup.agid_name_lookup_impl import AgidNameLookupImpl
+
+logger = logging.getLogger(__name__)
+
+
+class CachedAgidNameLookupImpl(AgidNameLookupImpl):
+    """AgidNameLookupImpl that shares the mig_mapping table through a local SQLite file.
+
+    Within `ttl` seconds of the last check, workers load the mapping from the cache
+    file without touching DB2. After that, one worker compares the row count of
+    mig_mapping with the one the cache was built from and reloads the table only if
+    it changed. Refreshes are serialised with a lock file and published by an atomic
+    rename, so readers never see a partial cache. If DB2 cannot be reached, a stale
+    cache is used rather than failing. A lookup that misses once its mapping is
+    older than `ttl` goes through the same check again.
+    """
+    _SIGNATURE_QUERY: str = "SELECT COUNT(*) FROM mig_mapping"
+
+    def __init__(
+        self,
+        _db_connection: DBConnection,
+        cache_file: Path,
+        ttl: float
+    ) -> None:
+        self._cache_file: Path = cache_file
+        self._lock_file: Path = cache_file.with_name(cache_file.name + ".lock")
+        self._ttl: float = ttl
+        super().__init__(_db_connection, refresh_interval=ttl)
+
+    def _load(self) -> Dict[str, str]:
+        cached = self._read_cache()
+        if cached is not None and self._is_fresh(cached[1]):
+            return cached[2]
+
+        self._cache_file.parent.mkdir(parents=True, exist_ok=True)
+        with open(self._lock_file, "a") as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            # Another worker may have refreshed the cache while we waited for the lock
+            cached = self._read_cache()
+            if cached is not None and self._is_fresh(cached[1]):
+                return cached[2]
+            return self._refresh(cached)
+
+    def _refresh(self, cached: Optional[Tuple[int, float, Dict[str, str]]]) -> Dict[str, str]:
+        try:
+            signature: int = int(self._db2_connection.fetch_one(self._SIGNATURE_QUERY)[0])
+            if cached is not None and cached[0] == signature:
+                logger.info(f"AGID name cache unchanged, {len(cached[2])} entries: {self._cache_file}")
+                self._write_cache(signature, cached[2])
+                return cached[2]
+            mapping: Dict[str, str] = super()._load()
+        except Exception as e:
+            if cached is None:
+                raise
+            logger.warning(f"Cannot refresh AGID name cache, using stale entries from {self._cache_file}: {str(e)}")
+            return cached[2]
+
+        self._write_cache(signature, mapping)
+        logger.info(f"AGID name cache refreshed, {len(mapping)} entries: {self._cache_file}")
+        return mapping
+
+    def _is_fresh(self, checked_at: float) -> bool:
+        return 0 <= time.time() - checked_at < self._ttl
+
+    def _read_cache(self) -> Optional[Tuple[int, float, Dict[str, str]]]:
+        """Returns (signature, checked_at, mapping), or None if there is no usable cache."""
+        if not self._cache_file.exists():
+            return None
+        try:
+            connection = sqlite3.connect(f"file:{self._cache_file}?mode=ro", uri=True)
+            try:
+                meta = dict(connection.execute("SELECT key, value FROM meta"))
+                mapping = dict(connection.execute("SELECT agid_name_src, agid_name_dst FROM mapping"))
+            finally:
+                connection.close()
+            return int(meta["signature"]), float(meta["checked_at"]), mapping
+        except (sqlite3.Error, KeyError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable AGID name cache {self._cache_file}: {str(e)}")
+            return None
+
+    def _write_cache(self, signature: int, mapping: Dict[str, str]) -> None:
+        tmp_file: Path = self._cache_file.with_name(f"{self._cache_file.name}.{os.getpid()}.tmp")
+        tmp_file.unlink(missing_ok=True)
+        connection = sqlite3.connect(tmp_file)
+        try:
+            connection.execute("CREATE TABLE meta (key TEXT PRIMARY KEY, value TEXT NOT NULL)")
+            connection.execute("CREATE TABLE mapping (agid_name_src TEXT PRIMARY KEY, agid_name_dst TEXT NOT NULL)")
+            connection.executemany(
+                "INSERT INTO meta VALUES (?, ?)",
+                [("signature", str(signature)), ("checked_at", repr(time.time()))]
+            )
+            connection.executemany("INSERT INTO mapping VALUES (?, ?)", mapping.items())
+            connection.commit()
+        finally:
+            connection.close()
+        os.replace(tmp_file, self._cache_file)
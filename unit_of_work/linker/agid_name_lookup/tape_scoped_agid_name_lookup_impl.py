@@ -0,0 +1,79 @@
+import logging
+import sys
+import threading
+import time
+from typing import Dict, Iterable, List, Optional, Set
+
+from unit_of_work.db2.db_connection import DBConnection
+from unit_of_work.linker.agid_name_lookup.agid_name_lookup import AgidNameLookup
+from unit_of_work.linker.agid_name_lookup.agid_name_lookup_impl import RemagError
+
+logger = logging.getLogger(__name__)
+
+
+class TapeScopedAgidNameLookupImpl(AgidNameLookup):
+    """Fetches only the mig_mapping entries of the AGIDs actually present on a tape.
+
+    `prefetch` is given the distinct source AGIDs of the slicer output and loads the
+    ones not cached yet with batched `IN (...)` queries. AGIDs without a mapping are
+    cached as missing for `negative_ttl` seconds, so a tape full of unmapped files
+    costs one query per AGID, not one per file. A lookup of an AGID that was not
+    prefetched fetches it on its own.
+    """
+    _QUERY: str = "SELECT agid_name_src, agid_name_dst FROM mig_mapping WHERE agid_name_src IN ({markers})"
+
+    def __init__(
+        self,
+        _db_connection: DBConnection,
+        batch_size: int = 500,
+        negative_ttl: float = 300
+    ) -> None:
+        self._db2_connection = _db_connection
+        self._batch_size: int = batch_size
+        self._negative_ttl: float = negative_ttl
+        self._lock: threading.Lock = threading.Lock()
+        self._dict: Dict[str, str] = {}
+        # Source AGIDs without a mapping, with the time they were found missing
+        self._missing: Dict[str, float] = {}
+        self._reported_missing: Set[str] = set()
+
+    def dest_agid_name(self, src_agid_name: str) -> str:
+        dest_agid_name: Optional[str] = self._dict.get(src_agid_name)
+        if dest_agid_name is None:
+            self.prefetch((src_agid_name,))
+            dest_agid_name = self._dict.get(src_agid_name)
+        if dest_agid_name is None:
+            if src_agid_name not in self._reported_missing:
+                self._reported_missing.add(src_agid_name)
+                logger.warning(f"Missing entry in remag table for src_agid_name: {src_agid_name}")
+            raise RemagError(f"Missing entry in remag table for src_agid_name: {src_agid_name}")
+        return dest_agid_name
+
+    def prefetch(self, src_agid_names: Iterable[str]) -> None:
+        with self._lock:
+            now = time.monotonic()
+            unknown: List[str] = sorted({name for name in src_agid_names if not self._is_known(name, now)})
+            for i in range(0, len(unknown), self._batch_size):
+                batch = unknown[i:i + self._batch_size]
+                found = self._fetch(batch)
+                self._dict.update(found)
+                for name in batch:
+                    if name in found:
+                        self._missing.pop(name, None)
+                    else:
+                        self._missing[name] = now
+            if unknown:
+                logger.info(f"Fetched AGID mappings for {len(unknown)} source AGIDs, {len(self._dict)} cached")
+
+    def _is_known(self, src_agid_name: str, now: float) -> bool:
+        if src_agid_name in self._dict:
+            return True
+        missing_since: Optional[float] = self._missing.get(src_agid_name)
+        return missing_since is not None and now - missing_since < self._negative_ttl
+
+    def _fetch(self, src_agid_names: List[str]) -> Dict[str, str]:
+        query = self._QUERY.format(markers=", ".join("?" for _ in src_agid_names))
+        return {
+            sys.intern(row[0]): sys.intern(row[1])
+            for row in self._db2_connection.iter_rows(query, tuple(src_agid_names))
+        }
@@ -1,9 +1,21 @@
 from abc import ABC, abstractmethod
 from pathlib import Path
-from typing import Dict
+from typing import Callable, Iterable, Optional
+
+from unit_of_work.linker.link_creator.link_result import LinkResult
 
 
 class LinkCreator(ABC):
     @abstractmethod
-    def create_links(self) -> Dict[Path, Exception]:
+    def create_links(self) -> LinkResult:
+        pass
+
+    @abstractmethod
+    def link_files(
+        self,
+        source_files: Iterable[Path],
+        on_linked: Optional[Callable[[Path, Path], None]] = None
+    ) -> LinkResult:
+        """Links only the given source files. `on_linked(source_file, target_path)`
+        is called for every link that was created, in source order."""
         pass
\ No newline at end of file
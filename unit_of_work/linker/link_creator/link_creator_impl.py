@@ -1,60 +1,166 @@
 from pathlib import Path
-from typing import Dict, Optional, List
+from typing import Callable, Dict, Iterable, Iterator, Optional, List, Pattern, Set
 import logging
+import os
+from itertools import islice
 
 from unit_of_work.linker.path_transformer.path_transformer import PathTransformer
 from unit_of_work.linker.link_creator.link_creator import LinkCreator
+from unit_of_work.linker.link_creator.link_result import LinkResult
+from unit_of_work.utils.file_scanner import compile_file_patterns, scan_files
 
 logger = logging.getLogger(__name__)
 
 class LinkCreatorImpl(LinkCreator):
+    # Source files transformed and linked at a time
+    _CHUNK_SIZE: int = 4096
+
     def __init__(
         self,
         source_dir: Path,
         output_directory: Path,
         file_patterns: list[str],
-        path_transformer: PathTransformer
+        path_transformer: PathTransformer,
+        failure_file: Optional[Path] = None
     ):
         self._source_dir: Path = source_dir
         self._output_directory: Path = output_directory
         self._file_patterns: list[str]= file_patterns
+        self._file_pattern: Pattern[str] = compile_file_patterns(file_patterns)
         self._path_transformer: PathTransformer  = path_transformer
+        self._failure_file: Optional[Path] = failure_file
+
+    def create_links(self) -> LinkResult:
+        return self.link_files(self._get_source_files())
+
+    def link_files(
+        self,
+        source_files: Iterable[Path],
+        on_linked: Optional[Callable[[Path, Path], None]] = None
+    ) -> LinkResult:
+        result = LinkResult(self._failure_file)
+        try:
+            self._link_batches(source_files, result, on_linked)
+        finally:
+            result.close()
+
+        if result.failed:
+            logger.error(result.summary())
+        else:
+            logger.info(result.summary())
+        return result
+
+    def _link_batches(
+        self,
+        source_files: Iterable[Path],
+        result: LinkResult,
+        on_linked: Optional[Callable[[Path, Path], None]]
+    ) -> None:
+        # Bounded chunks keep memory flat however many files the lazy scan yields
+        created_directories: Set[str] = set()
+        for chunk in self._chunks(source_files, self._CHUNK_SIZE):
+            self._link_batch(chunk, created_directories, result, on_linked)
+
+    @staticmethod
+    def _chunks(source_files: Iterable[Path], size: int) -> Iterator[List[Path]]:
+        iterator = iter(source_files)
+        while chunk := list(islice(iterator, size)):
+            yield chunk
 
-    def create_links(self) -> Dict[Path, Optional[Exception]]:
-        results: Dict[Path, Optional[Exception]] = {}
-        for source_file in self._get_source_files():
+    def _link_batch(
+        self,
+        source_files: List[Path],
+        created_directories: Set[str],
+        result: LinkResult,
+        on_linked: Optional[Callable[[Path, Path], None]],
+        map_function: Callable = map
+    ) -> None:
+        """Transforms every source file first, creates the distinct target directories
+        once and only then issues the link calls, through `map_function`. Results are
+        recorded in source order. Targets stay strings, which os.link accepts, since
+        building a Path per file would cost more than the transform itself."""
+        directories: List[Optional[str]] = []
+        targets: List[Optional[str]] = []
+        errors: List[Optional[Exception]] = []
+        located = self._path_transformer.target_locations(
+            [source_file.name for source_file in source_files],
+            self._output_directory
+        )
+        for location_or_error in located:
+            if isinstance(location_or_error, Exception):
+                directories.append(None)
+                targets.append(None)
+                errors.append(location_or_error)
+            else:
+                directory, name = location_or_error
+                directories.append(directory)
+                targets.append(f"{directory}/{name}")
+                errors.append(None)
+
+        failed_directories: Dict[str, Exception] = self._create_directories(
+            {directory for directory in directories if directory is not None},
+            created_directories
+        )
+
+        pending: List[int] = []
+        for i, directory in enumerate(directories):
+            if directory is not None:
+                errors[i] = failed_directories.get(directory)
+                if errors[i] is None:
+                    pending.append(i)
+        link_errors = map_function(
+            self._create_link,
+            [source_files[i] for i in pending],
+            [targets[i] for i in pending]
+        )
+        for i, error in zip(pending, link_errors):
+            errors[i] = error
+
+        for source_file, target_path, error in zip(source_files, targets, errors):
+            self._record(result, source_file, target_path, error, on_linked)
+
+    @staticmethod
+    def _create_directories(directories: Set[str], created_directories: Set[str]) -> Dict[str, Exception]:
+        """Creates the directories not created yet, parents first. Returns the ones that
+        could not be created, so that only the files below them fail."""
+        failed: Dict[str, Exception] = {}
+        for directory in sorted(directories - created_directories):
             try:
-                target_path = self._path_transformer.transform(source_file, self._output_directory)                
-                LinkCreatorImpl._create_link(source_file, target_path)
-                results[source_file] = None
-                logging.debug(f"Created symlink, source_file={source_file}, target_path{target_path}")
-            except Exception as e:
-                results[source_file] = e
-                logger.error(
-                    f"Failed to create symlink, source_file={source_file}, error_message={str(e)}",
-                    exc_info=True
-                )
-
-        logger.info(f"Link creation completed: {len([v for v in results.values() if v is None])} successful, {len([v for v in results.values() if v is not None])} failed")
-        
-        return results
-
-    def _get_source_files(self) -> List[Path]:
-        src_files = list(set(
-            src_file
-            for pattern in self._file_patterns
-            for src_file in self._source_dir.glob(pattern)
-        ))
-        logger.debug(f"Found {len(src_files)} source files")
-        return src_files
+                os.makedirs(directory, exist_ok=True)
+                created_directories.add(directory)
+            except OSError as e:
+                failed[directory] = e
+        return failed
+
+    @staticmethod
+    def _record(
+        result: LinkResult,
+        source_file: Path,
+        target_path: Optional[str],
+        error: Optional[Exception],
+        on_linked: Optional[Callable[[Path, Path], None]]
+    ) -> None:
+        if error is None:
+            result.add_success()
+            if on_linked is not None:
+                on_linked(source_file, Path(target_path))
+            # Runs per file, so the message is only built when debug logging is on
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Created link, source_file=%s, target_path=%s", source_file, target_path)
+        else:
+            result.add_failure(source_file, error)
+
+    def _get_source_files(self) -> Iterator[Path]:
+        for entry in scan_files(self._source_dir, self._file_pattern):
+            yield Path(entry.path)
 
     @staticmethod
-    def _create_link(source_file: Path, target_path: Path) -> None:
-        """Raises:
-            FileExistsError: If target_path already exists
-            OSError: If hardlink creation fails (permissions, etc.)
-        """
-        target_path.parent.mkdir(parents=True, exist_ok=True)
-        if target_path.exists():
-            raise FileExistsError(f"Target path already exists: {target_path}")
-        source_file.link_to(target_path)
\ No newline at end of file
+    def _create_link(source_file: Path, target_path: str) -> Optional[Exception]:
+        """Returns the error of the link call instead of raising it: FileExistsError if
+        target_path already exists, OSError if the hardlink cannot be created otherwise.
+        The target directory must exist."""
+        try:
+            os.link(source_file, target_path)
+            return None
+        except OSError as e:
+            return e
@@ -0,0 +1,84 @@
+from pathlib import Path
+from typing import Dict, List, Optional, TextIO
+
+
+class LinkFailure:
+    __slots__ = ("source_file", "reason", "message")
+
+    def __init__(self, source_file: Path, reason: str, message: str) -> None:
+        self.source_file: Path = source_file
+        self.reason: str = reason
+        self.message: str = message
+
+    def __repr__(self) -> str:
+        return f"LinkFailure({self.source_file!r}, {self.reason!r}, {self.message!r})"
+
+
+class LinkResult:
+    """Outcome of a link run whose size does not depend on the number of files.
+
+    Successes are only counted. Failures are counted per reason (the exception type),
+    and only the first `max_samples` failures of each reason are kept in memory as
+    examples. If `failure_manifest` is set, every failing file is also appended to it,
+    one `source_file<TAB>reason<TAB>message` line each.
+    """
+
+    def __init__(self, failure_manifest: Optional[Path] = None, max_samples: int = 5) -> None:
+        self.succeeded: int = 0
+        self.failure_manifest: Optional[Path] = failure_manifest
+        self._max_samples: int = max_samples
+        self._counts: Dict[str, int] = {}
+        self._failures: List[LinkFailure] = []
+        self._file: Optional[TextIO] = None
+
+    @property
+    def failed(self) -> int:
+        return sum(self._counts.values())
+
+    @property
+    def failure_counts(self) -> Dict[str, int]:
+        return dict(self._counts)
+
+    @property
+    def failures(self) -> List[LinkFailure]:
+        """The sampled failures, in the order they occurred."""
+        return list(self._failures)
+
+    def add_success(self) -> None:
+        self.succeeded += 1
+
+    def add_failure(self, source_file: Path, error: Exception) -> None:
+        reason: str = type(error).__name__
+        count: int = self._counts.get(reason, 0)
+        self._counts[reason] = count + 1
+        if count < self._max_samples:
+            self._failures.append(LinkFailure(source_file, reason, str(error)))
+        if self.failure_manifest is not None:
+            if self._file is None:
+                self.failure_manifest.parent.mkdir(parents=True, exist_ok=True)
+                self._file = open(self.failure_manifest, "a")
+            self._file.write(f"{source_file}\t{reason}\t{error}\n")
+
+    def summary(self) -> str:
+        """Returns one line describing the whole run, with the failures per reason."""
+        summary = f"Link creation completed: {self.succeeded} successful, {self.failed} failed"
+        if not self._counts:
+            return summary
+        reasons = "; ".join(
+            f"{reason}: {count} (e.g. "
+            + ", ".join(
+                f"{failure.source_file} [{failure.message}]"
+                for failure in self._failures if failure.reason == reason
+            )
+            + ")"
+            for reason, count in sorted(self._counts.items(), key=lambda item: -item[1])
+        )
+        if self.failure_manifest is not None:
+            summary += f", all failures in {self.failure_manifest}"
+        return f"{summary}; {reasons}"
+
+    def close(self) -> None:
+        """Flushes the failure manifest."""
+        if self._file is not None:
+            self._file.close()
+            self._file = None
@@ -1,8 +1,30 @@
 from abc import ABC, abstractmethod
 from pathlib import Path
+from typing import Iterable, List, Tuple, Union
 
 
 class PathTransformer(ABC):
     @abstractmethod
     def transform(self, path: Path, target_base_dir: Path) -> Path:
-        pass
\ No newline at end of file
+        pass
+
+    @abstractmethod
+    def transform_batch(self, names: Iterable[str], target_base_dir: Path) -> List[Union[Path, Exception]]:
+        """Transforms file names (without directory) in one call. Returns, in input
+        order, the target path of each name or the exception transform would raise."""
+        pass
+
+    def target_locations(self, names: Iterable[str], target_base_dir: Path) -> List[Union[Tuple[str, str], Exception]]:
+        """Like `transform_batch`, but returns the target directory and file name of
+        each name as strings, for callers that need no Path per file."""
+        return [
+            result if isinstance(result, Exception) else (str(result.parent), result.name)
+            for result in self.transform_batch(names, target_base_dir)
+        ]
+
+    @abstractmethod
+    def object_keys(self, names: Iterable[str]) -> List[Union[str, Exception]]:
+        """Returns, in input order, the object key of each file name, i.e. its target
+        path relative to the target base directory in posix form, or the exception
+        transform would raise."""
+        pass
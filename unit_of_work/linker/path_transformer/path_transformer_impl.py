@@ -1,6 +1,6 @@
 from pathlib import Path
 import re
-from typing import Final
+from typing import Dict, Final, Iterable, List, Optional, Pattern, Tuple, Union
 import logging
 
 from unit_of_work.linker.agid_name_lookup.agid_name_lookup import AgidNameLookup
@@ -8,8 +8,15 @@ from unit_of_work.linker.path_transformer.path_transformer import PathTransforme
 
 logger = logging.getLogger(__name__)
 
+class _UnsupportedPathError(Exception):
+    """Raised internally for a file name that is neither an object nor a resource."""
+    pass
+
+
 class PathTransformerImpl(PathTransformer):
     RESOURCE_DIR: Final[str] = "RES"
+    _OBJECT_PATTERN: Final[Pattern[str]] = re.compile(r"\w+\.\w+\.\w+")
+    _RESOURCE_PATTERN: Final[Pattern[str]] = re.compile(r"\w+\.\w+")
 
     def __init__(
         self,
@@ -31,32 +38,9 @@ class PathTransformerImpl(PathTransformer):
        """
         # in:  /ars/data/spool/output/A12345/slicer/AAG.L123.FAAA
         # out: /ars/data/spool/output/A12345/linker/SFB/123FAA/123FAAB
-        is_object: bool = bool(re.match(r"\w+\.\w+\.\w+", path.name))
-        is_resource: bool = bool(re.match(r"\w+\.\w+", path.name))
-
-        if is_object:
-            agid_name_src, load_id, load_id_suffix = path.name.split(".")
-            agid_name_dst: str = self._lookup.dest_agid_name(agid_name_src)
-
-            return (
-                target_base_dir
-                / agid_name_dst
-                / (load_id[1:] + load_id_suffix[:3])
-                / (load_id[1:] + load_id_suffix)
-            )
-
-        elif is_resource:
-            agid_name_src, load_id = path.name.split(".")
-            agid_name_dst: str = self._lookup.dest_agid_name(agid_name_src)
-
-            return (
-                target_base_dir
-                / agid_name_dst
-                / self.RESOURCE_DIR
-                / load_id[1:]
-            )
-
-        else:
+        try:
+            directory, name = self._transform_name(path.name, str(target_base_dir), {})
+        except _UnsupportedPathError:
             error = ValueError(f"Unsupported path type: {path}")
             logger.error(
                 "Unsupported path type",
@@ -65,4 +49,108 @@ class PathTransformerImpl(PathTransformer):
                 },
                 exc_info=error
             )
-            raise error
\ No newline at end of file
+            raise error
+        return Path(directory, name)
+
+    def transform_batch(self, names: Iterable[str], target_base_dir: Path) -> List[Union[Path, Exception]]:
+        # A tape holds few load directories, so their Path objects are built once per
+        # batch and each file only appends its name
+        directories: Dict[str, Path] = {}
+        results: List[Union[Path, Exception]] = []
+        for result in self._transform_names(names, str(target_base_dir)):
+            if isinstance(result, Exception):
+                results.append(result)
+                continue
+            directory, name = result
+            directory_path = directories.get(directory)
+            if directory_path is None:
+                directory_path = directories[directory] = Path(directory)
+            results.append(directory_path / name)
+        return results
+
+    def target_locations(self, names: Iterable[str], target_base_dir: Path) -> List[Union[Tuple[str, str], Exception]]:
+        return self._transform_names(names, str(target_base_dir))
+
+    def object_keys(self, names: Iterable[str]) -> List[Union[str, Exception]]:
+        return [
+            result if isinstance(result, Exception) else f"{result[0]}/{result[1]}"
+            for result in self._transform_names(names, "")
+        ]
+
+    def _transform_names(self, names: Iterable[str], base_dir: str) -> List[Union[Tuple[str, str], Exception]]:
+        """Returns, in input order, the target directory and file name of each name or
+        the exception transform would raise for it.
+
+        This runs once per file of a tape, so `_parse_name`, `_prefix` and `_target`
+        are inlined: each name is split once and matched against one pattern."""
+        names = list(names)
+        self._lookup.prefetch({name.split(".", 1)[0] for name in names})
+        object_match = self._OBJECT_PATTERN.match
+        resource_match = self._RESOURCE_PATTERN.match
+        # A tape holds few AGIDs, so their prefixes are built once per batch
+        prefixes: Dict[str, str] = {}
+        # The lookup error of an AGID is reported for all its files as one object
+        failed_agids: Dict[str, Exception] = {}
+        results: List[Union[Tuple[str, str], Exception]] = []
+        append = results.append
+        for file_name in names:
+            parts = file_name.split(".")
+            if len(parts) == 3 and object_match(file_name) is not None:
+                agid_name_src, load_id, load_id_suffix = parts
+            elif len(parts) == 2 and resource_match(file_name) is not None:
+                agid_name_src, load_id = parts
+                load_id_suffix = None
+            else:
+                # Concerns this one file only, never its AGID
+                append(ValueError(f"Unsupported path type: {file_name}"))
+                continue
+
+            prefix = prefixes.get(agid_name_src)
+            if prefix is None:
+                error = failed_agids.get(agid_name_src)
+                if error is None:
+                    try:
+                        prefix = self._prefix(agid_name_src, base_dir, prefixes)
+                    except Exception as e:
+                        failed_agids[agid_name_src] = error = e
+                if error is not None:
+                    append(error)
+                    continue
+
+            load = load_id[1:]
+            if load_id_suffix is None:
+                append((prefix + self.RESOURCE_DIR, load))
+            else:
+                append((f"{prefix}{load}{load_id_suffix[:3]}", load + load_id_suffix))
+        return results
+
+    def _transform_name(self, name: str, base_dir: str, prefixes: Dict[str, str]) -> Tuple[str, str]:
+        """Returns the target directory and file name as strings, using and filling the
+        per-AGID `{base_dir}/{agid_name_dst}/` prefix cache `prefixes`. An empty
+        `base_dir` yields directories relative to the target base directory."""
+        parsed = self._parse_name(name)
+        return self._target(parsed, self._prefix(parsed[0], base_dir, prefixes))
+
+    def _parse_name(self, name: str) -> Tuple[str, str, Optional[str]]:
+        """Splits a name into AGID, load id and, for objects, load id suffix; the suffix
+        is None for resources. Raises _UnsupportedPathError for any other name, also
+        one with more dots than the pattern matched, e.g. AAA.L1.F1.extra."""
+        parts = name.split(".")
+        if len(parts) == 3 and self._OBJECT_PATTERN.match(name):
+            return parts[0], parts[1], parts[2]
+        if len(parts) == 2 and self._RESOURCE_PATTERN.match(name):
+            return parts[0], parts[1], None
+        raise _UnsupportedPathError(name)
+
+    def _prefix(self, agid_name_src: str, base_dir: str, prefixes: Dict[str, str]) -> str:
+        prefix = prefixes.get(agid_name_src)
+        if prefix is None:
+            agid_name_dst = self._lookup.dest_agid_name(agid_name_src)
+            prefix = prefixes[agid_name_src] = f"{base_dir}/{agid_name_dst}/" if base_dir else f"{agid_name_dst}/"
+        return prefix
+
+    def _target(self, parsed: Tuple[str, str, Optional[str]], prefix: str) -> Tuple[str, str]:
+        _, load_id, load_id_suffix = parsed
+        if load_id_suffix is None:
+            return prefix + self.RESOURCE_DIR, load_id[1:]
+        return f"{prefix}{load_id[1:]}{load_id_suffix[:3]}", load_id[1:] + load_id_suffix
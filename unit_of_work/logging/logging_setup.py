@@ -1,9 +1,24 @@
+import atexit
 import logging
+import logging.handlers
+import queue
 from pathlib import Path
+from typing import Optional
+
+_listener: Optional[logging.handlers.QueueListener] = None
 
 
 def setup_logging(log_file: Path) -> None:
+    """Routes all records through a queue to the console and `log_file`.
+
+    The root logger only gets a QueueHandler, so a logging call on a worker thread
+    merely enqueues the record; a QueueListener thread formats it and does the
+    console and file I/O. The listener is flushed and stopped at exit, or earlier by
+    `shutdown_logging`. Calling this again replaces the previous setup.
+    """
+    global _listener
     log_file.parent.mkdir(parents=True, exist_ok=True)
+    shutdown_logging()
 
     formatter = logging.Formatter(
         '%(asctime)s - %(levelname)s - %(message)s',
@@ -18,8 +33,35 @@ def setup_logging(log_file: Path) -> None:
     file_handler = logging.FileHandler(log_file)
     file_handler.setFormatter(formatter)
 
+    # Unbounded, so that a slow disk never blocks the thread that logs
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+    _listener = logging.handlers.QueueListener(
+        log_queue,
+        console_handler,
+        file_handler,
+        respect_handler_level=True
+    )
+    _listener.start()
+
     # Root logger
     root_logger = logging.getLogger()
     root_logger.setLevel(logging.INFO)
-    root_logger.addHandler(console_handler)
-    root_logger.addHandler(file_handler)
\ No newline at end of file
+    root_logger.addHandler(logging.handlers.QueueHandler(log_queue))
+
+
+def shutdown_logging() -> None:
+    """Writes out every queued record and closes the handlers of `setup_logging`."""
+    global _listener
+    if _listener is None:
+        return
+    root_logger = logging.getLogger()
+    for handler in list(root_logger.handlers):
+        if isinstance(handler, logging.handlers.QueueHandler) and handler.queue is _listener.queue:
+            root_logger.removeHandler(handler)
+    _listener.stop()
+    for handler in _listener.handlers:
+        handler.close()
+    _listener = None
+
+
+atexit.register(shutdown_logging)
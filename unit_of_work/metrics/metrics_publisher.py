@@ -0,0 +1,10 @@
+from abc import ABC, abstractmethod
+
+from unit_of_work.metrics.unit_of_work_metrics import UnitOfWorkMetrics
+
+
+class MetricsPublisher(ABC):
+    @abstractmethod
+    def publish(self, tape_name: str, metrics: UnitOfWorkMetrics) -> None:
+        """Publishes the metrics of a finished or failed unit of work."""
+        pass
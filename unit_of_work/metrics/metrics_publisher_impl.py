@@ -0,0 +1,159 @@
+import fcntl
+import json
+import logging
+import os
+import tempfile
+import threading
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+from unit_of_work.metrics.metrics_publisher import MetricsPublisher
+from unit_of_work.metrics.unit_of_work_metrics import UnitOfWorkMetrics
+
+logger = logging.getLogger(__name__)
+
+# Series key: metric name and its rendered label set, e.g. ('..._total', '{stage="linker"}')
+_Series = Tuple[str, str]
+
+
+class MetricsPublisherImpl(MetricsPublisher):
+    """Publishes unit of work metrics to a Prometheus textfile and a JSONL history.
+
+    The textfile is meant for the node exporter's textfile collector. Its counters
+    accumulate over every tape published: runs, failures, seconds, files and bytes
+    per stage, and tapes per outcome. Gauges hold the last run of each stage and,
+    if `gauges` is given, its current values, such as the uploader's concurrency.
+    The file is replaced atomically, so the collector never reads half of it. Every
+    publish merges into the file under an exclusive `flock` on `<textfile>.lock`,
+    re-reading it first, so that several processes sharing one textfile add to the
+    same counters instead of overwriting each other's.
+    Every run is also appended as one JSON line to `history_file`.
+    """
+
+    _PREFIX: str = "unit_of_work_"
+    _HELP: Dict[str, str] = {
+        "stage_runs_total": "Stage runs",
+        "stage_failures_total": "Stage runs that raised",
+        "stage_seconds_total": "Seconds spent in the stage",
+        "stage_files_total": "Files processed by the stage",
+        "stage_bytes_total": "Bytes processed by the stage",
+        "stage_failed_files_total": "Files the stage could not process",
+        "tapes_total": "Units of work by outcome",
+        "stage_last_seconds": "Duration of the last run of the stage",
+        "stage_last_bytes_per_second": "Throughput of the last run of the stage",
+        "stage_last_files_per_second": "Files per second of the last run of the stage",
+        "last_run_timestamp_seconds": "Time the last unit of work ended",
+    }
+
+    def __init__(
+        self,
+        textfile: Optional[Path] = None,
+        history_file: Optional[Path] = None,
+        gauges: Optional[Callable[[], Dict[str, float]]] = None
+    ) -> None:
+        self._textfile: Optional[Path] = textfile
+        self._history_file: Optional[Path] = history_file
+        self._gauges: Optional[Callable[[], Dict[str, float]]] = gauges
+        self._lock: threading.Lock = threading.Lock()
+        self._counters: Dict[_Series, float] = {}
+        self._last: Dict[_Series, float] = {}
+
+    def publish(self, tape_name: str, metrics: UnitOfWorkMetrics) -> None:
+        with self._lock:
+            if self._history_file is not None:
+                self._append_history(tape_name, metrics)
+            if self._textfile is not None:
+                self._merge_textfile(metrics)
+
+    def _merge_textfile(self, metrics: UnitOfWorkMetrics) -> None:
+        self._textfile.parent.mkdir(parents=True, exist_ok=True)
+        lock_file = self._textfile.with_name(self._textfile.name + ".lock")
+        # The textfile itself is replaced on every write, so the lock lives beside it
+        with open(lock_file, "a") as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            try:
+                self._counters.clear()
+                self._last.clear()
+                self._read_textfile()
+                self._count(metrics)
+                self._write_textfile()
+            finally:
+                fcntl.flock(lock, fcntl.LOCK_UN)
+
+    def _count(self, metrics: UnitOfWorkMetrics) -> None:
+        for stage in metrics.stages:
+            labels = f'{{stage="{stage.stage}"}}'
+            self._add("stage_runs_total", labels, 1)
+            self._add("stage_failures_total", labels, int(stage.failed))
+            self._add("stage_seconds_total", labels, stage.seconds)
+            self._add("stage_files_total", labels, stage.files)
+            self._add("stage_bytes_total", labels, stage.bytes)
+            self._add("stage_failed_files_total", labels, stage.failed_files)
+            self._last[("stage_last_seconds", labels)] = stage.seconds
+            self._last[("stage_last_bytes_per_second", labels)] = stage.bytes_per_second
+            self._last[("stage_last_files_per_second", labels)] = stage.files_per_second
+        self._add("tapes_total", f'{{outcome="{"finished" if metrics.succeeded else "failed"}"}}', 1)
+        self._last[("last_run_timestamp_seconds", "")] = metrics.started_at + metrics.seconds
+
+    def _add(self, name: str, labels: str, value: float) -> None:
+        self._counters[(name, labels)] = self._counters.get((name, labels), 0) + value
+
+    def _append_history(self, tape_name: str, metrics: UnitOfWorkMetrics) -> None:
+        self._history_file.parent.mkdir(parents=True, exist_ok=True)
+        with open(self._history_file, "a") as f:
+            f.write(json.dumps({"tape": tape_name, **metrics.to_dict()}) + "\n")
+
+    def _write_textfile(self) -> None:
+        series: Dict[_Series, float] = {**self._counters, **self._last}
+        if self._gauges is not None:
+            try:
+                for name, value in self._gauges().items():
+                    series[(name, "")] = value
+            except Exception as e:
+                logger.warning(f"Failed to collect gauges for {self._textfile}: {str(e)}")
+
+        lines: List[str] = []
+        written_families = set()
+        for name, labels in sorted(series):
+            if name not in written_families:
+                written_families.add(name)
+                kind = "counter" if name.endswith("_total") else "gauge"
+                lines.append(f"# HELP {self._PREFIX}{name} {self._HELP.get(name, name.replace('_', ' '))}\n")
+                lines.append(f"# TYPE {self._PREFIX}{name} {kind}\n")
+            value = series[(name, labels)]
+            # Integral values as integers, so byte counters keep all their digits
+            rendered = str(int(value)) if float(value).is_integer() else repr(float(value))
+            lines.append(f"{self._PREFIX}{name}{labels} {rendered}\n")
+
+        # A unique name in the same directory, so that os.replace stays atomic and no
+        # other writer ever shares the temporary file
+        fd, tmp_name = tempfile.mkstemp(dir=self._textfile.parent, prefix=f".{self._textfile.name}.")
+        try:
+            with os.fdopen(fd, "w") as f:
+                f.writelines(lines)
+            os.chmod(tmp_name, 0o644)
+            os.replace(tmp_name, self._textfile)
+        except BaseException:
+            os.unlink(tmp_name)
+            raise
+
+    def _read_textfile(self) -> None:
+        """Loads the series last written by any process: counters to add to, and
+        gauges of stages that this run does not overwrite."""
+        try:
+            with open(self._textfile) as f:
+                for line in f:
+                    if line.startswith("#") or not line.startswith(self._PREFIX):
+                        continue
+                    metric, _, value = line.rstrip("\n").rpartition(" ")
+                    name, brace, labels = metric[len(self._PREFIX):].partition("{")
+                    try:
+                        parsed = float(value)
+                    except ValueError:
+                        continue
+                    if name.endswith("_total"):
+                        self._counters[(name, brace + labels)] = parsed
+                    else:
+                        self._last[(name, brace + labels)] = parsed
+        except FileNotFoundError:
+            pass
@@ -0,0 +1,85 @@
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Any, Dict, Iterator, List, Optional
+
+
+@dataclass
+class StageMetrics:
+    stage: str
+    seconds: float = 0.0
+    files: int = 0
+    bytes: int = 0
+    # Files the stage could not process although the stage itself completed
+    failed_files: int = 0
+    failed: bool = False
+
+    @property
+    def files_per_second(self) -> float:
+        return self.files / self.seconds if self.seconds > 0 else 0.0
+
+    @property
+    def bytes_per_second(self) -> float:
+        return self.bytes / self.seconds if self.seconds > 0 else 0.0
+
+
+class UnitOfWorkMetrics:
+    """Measurements of one run of a unit of work, one StageMetrics per stage run.
+
+    Durations come from time.monotonic, so they are immune to clock adjustments. A
+    stage that raises is recorded as failed with the time it ran until then. Stages
+    may be recorded from several threads, as the streaming pipeline does.
+    """
+
+    def __init__(self) -> None:
+        # Wall clock, only to place the run in the history
+        self.started_at: float = time.time()
+        self.seconds: float = 0.0
+        self.succeeded: Optional[bool] = None
+        self._start: float = time.monotonic()
+        self._stages: List[StageMetrics] = []
+        self._lock: threading.Lock = threading.Lock()
+
+    @property
+    def stages(self) -> List[StageMetrics]:
+        with self._lock:
+            return list(self._stages)
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[StageMetrics]:
+        """Times the block as stage `name`; the block fills in files and bytes."""
+        stage = StageMetrics(name)
+        start = time.monotonic()
+        try:
+            yield stage
+        except BaseException:
+            stage.failed = True
+            raise
+        finally:
+            stage.seconds = time.monotonic() - start
+            with self._lock:
+                self._stages.append(stage)
+
+    def finish(self, succeeded: bool) -> None:
+        self.succeeded = succeeded
+        self.seconds = time.monotonic() - self._start
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "started_at": self.started_at,
+            "seconds": self.seconds,
+            "succeeded": self.succeeded,
+            "stages": [
+                {
+                    "stage": stage.stage,
+                    "seconds": stage.seconds,
+                    "files": stage.files,
+                    "bytes": stage.bytes,
+                    "failed_files": stage.failed_files,
+                    "failed": stage.failed,
+                    "bytes_per_second": stage.bytes_per_second
+                }
+                for stage in self.stages
+            ]
+        }
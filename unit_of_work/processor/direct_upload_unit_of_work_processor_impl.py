@@ -0,0 +1,161 @@
+import logging
+from itertools import islice
+from pathlib import Path
+from typing import Iterator, List, Optional, Pattern, Union
+
+from unit_of_work.linker.link_creator.link_result import LinkResult
+from unit_of_work.linker.path_transformer.path_transformer import PathTransformer
+from unit_of_work.metrics.metrics_publisher import MetricsPublisher
+from unit_of_work.processor.stage_marker import StageMarker
+from unit_of_work.processor.unit_of_work_processor_impl import UnitOfWorkProcessorImpl
+from unit_of_work.sanity_checker.sanity_checker import SanityChecker
+from unit_of_work.slicer.slicer import Slicer
+from unit_of_work.tape_import_confirmer.tape_import_confirmer import TapeImportConfirmer
+from unit_of_work.tape_register.tape_register import TapeRegister
+from unit_of_work.tape_register.tape_status import TapeStatus
+from unit_of_work.uploader.hcp_uploader import HcpUploader
+from unit_of_work.uploader.upload_manifest import UploadManifest
+from unit_of_work.uploader.upload_result import UploadResult
+from unit_of_work.uploader.upload_target import UploadTarget
+from unit_of_work.utils.background_deleter import BackgroundDeleter
+from unit_of_work.utils.file_scanner import compile_file_patterns, scan_files
+
+logger = logging.getLogger(__name__)
+
+
+class DirectUploadUnitOfWorkProcessorImpl(UnitOfWorkProcessorImpl):
+    """Uploads slicer output straight to its final object keys, without linking.
+
+    The path transformer computes the key each file would have below the linker
+    directory, so the uploaded layout is the same as after linking, but no hardlinks
+    or linker directory are created. Files whose key cannot be computed are skipped
+    and reported like link failures. The tape goes from SANITIZED straight to FINISHED.
+    """
+
+    def __init__(
+        self,
+        tape_import_confirmer: TapeImportConfirmer,
+        tape_register: TapeRegister,
+        slicer: Slicer,
+        sanity_checker: SanityChecker,
+        path_transformer: PathTransformer,
+        hcp_uploader: HcpUploader,
+        slicer_output_directory: Path,
+        slicer_log: Path,
+        sanity_checker_log: Path,
+        linked_output_directory: Path,
+        file_patterns: List[str],
+        upload_batch_size: int,
+        key_failure_file: Optional[Path] = None,
+        stage_marker: Optional[StageMarker] = None,
+        upload_manifest_file: Optional[Path] = None,
+        background_deleter: Optional[BackgroundDeleter] = None,
+        metrics_publisher: Optional[MetricsPublisher] = None
+    ):
+        super().__init__(
+            tape_import_confirmer=tape_import_confirmer,
+            tape_register=tape_register,
+            slicer=slicer,
+            sanity_checker=sanity_checker,
+            # A tape an earlier run left LINKED only needs its linker directory uploaded
+            link_creator=None,
+            hcp_uploader=hcp_uploader,
+            slicer_output_directory=slicer_output_directory,
+            slicer_log=slicer_log,
+            sanity_checker_log=sanity_checker_log,
+            linked_output_directory=linked_output_directory,
+            stage_marker=stage_marker,
+            upload_manifest_file=upload_manifest_file,
+            background_deleter=background_deleter,
+            metrics_publisher=metrics_publisher
+        )
+        self._path_transformer: PathTransformer = path_transformer
+        self._file_pattern: Pattern[str] = compile_file_patterns(file_patterns)
+        self._upload_batch_size: int = upload_batch_size
+        self._key_failure_file: Optional[Path] = key_failure_file
+
+    def _process(
+        self,
+        tape_name: str,
+        tape_location: Path,
+        completed_stage: Optional[TapeStatus]
+    ) -> None:
+        if completed_stage == TapeStatus.LINKED:
+            # The slicer output is gone, only the linker directory is left to upload
+            super()._process(tape_name, tape_location, completed_stage)
+            return
+
+        tape_confirmer_waiting_time: float = 0.0
+        slicer_duration: float = 0.0
+        sanity_checker_duration: float = 0.0
+
+        if not self._is_completed(TapeStatus.SLICED, completed_stage):
+            tape_confirmer_waiting_time = self._run_tape_import_confirmer(tape_name, tape_location)
+            slicer_duration = self._run_slicer(tape_name, tape_location)
+        if not self._is_completed(TapeStatus.SANITIZED, completed_stage):
+            sanity_checker_duration = self._run_sanity_checker(tape_name)
+        uploader_duration: float = self._run_direct_uploader(tape_name)
+        self._clean_working_dir()
+        self._clean_tape_and_tape_confirmation_file(
+            tape_location,
+            self._tape_import_confirmer.get_tape_confirmation_file(tape_name, tape_location)
+        )
+
+        logger.info(f"Uploader finished, working directory deleted, tape name: {tape_name}")
+        logger.info(
+            f"Statistics for unit of work: "
+            f"[tape={tape_name}] "
+            f"[location={tape_location}] "
+            f"[confirmer_wait={tape_confirmer_waiting_time}] "
+            f"[slicer={slicer_duration}] "
+            f"[sanity_checker={sanity_checker_duration}] "
+            f"[direct_uploader={uploader_duration}] "
+            f"[upload_skipped_bytes={self._upload_skipped_bytes}]"
+        )
+
+    def _run_direct_uploader(self, tape_name: str) -> float:
+        try:
+            logger.info(f"Direct uploader started, tape name: {tape_name}")
+            with self._metrics.stage("direct_uploader") as stage:
+                key_result = LinkResult(self._key_failure_file)
+                manifest: Optional[UploadManifest] = self._open_upload_manifest()
+                try:
+                    for targets in self._upload_batches(key_result):
+                        results: List[UploadResult] = self._hcp_uploader.upload_files(targets, manifest)
+                        stage.files += len(results)
+                        stage.bytes += sum(result.size for result in results)
+                finally:
+                    key_result.close()
+                    self._close_upload_manifest(manifest)
+                stage.failed_files = key_result.failed
+                if key_result.failed:
+                    logger.warning(
+                        f"Direct uploader could not compute the key of {key_result.failed} of "
+                        f"{key_result.succeeded + key_result.failed} files, tape name: {tape_name}, "
+                        f"failures: {key_result.failure_manifest}"
+                    )
+                self._tape_register.set_status_finished(tape_name)
+            self._delete(self._slicer_output_directory, False)
+            return stage.seconds
+        except Exception as e:
+            logger.error(f"Direct uploader failed, tape name: {tape_name} {str(e)}")
+            raise
+
+    def _upload_batches(self, key_result: LinkResult) -> Iterator[List[UploadTarget]]:
+        """Yields the upload targets of the slicer output in batches of at most
+        `upload_batch_size`, recording every file whose key failed in `key_result`."""
+        source_files = scan_files(self._slicer_output_directory, self._file_pattern)
+        while True:
+            batch = list(islice(source_files, self._upload_batch_size))
+            if not batch:
+                return
+            keys: List[Union[str, Exception]] = self._path_transformer.object_keys(entry.name for entry in batch)
+            targets: List[UploadTarget] = []
+            for entry, key_or_error in zip(batch, keys):
+                if isinstance(key_or_error, Exception):
+                    key_result.add_failure(Path(entry.path), key_or_error)
+                else:
+                    key_result.add_success()
+                    targets.append(UploadTarget(local_path=Path(entry.path), s3_key=key_or_error))
+            if targets:
+                yield targets
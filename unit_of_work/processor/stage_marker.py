@@ -0,0 +1,65 @@
+import json
+import logging
+import os
+from pathlib import Path
+from typing import Dict
+
+from unit_of_work.tape_register.tape_status import TapeStatus
+
+logger = logging.getLogger(__name__)
+
+
+class StageMarker:
+    """On-disk record of the stages a unit of work completed in its working directory.
+
+    Each completed stage is stored with the number of files its output held, so that
+    a later run can check the output is still intact before skipping the stage.
+    """
+
+    def __init__(self, marker_file: Path) -> None:
+        self._marker_file: Path = marker_file
+
+    def read(self) -> Dict[TapeStatus, int]:
+        try:
+            with open(self._marker_file) as f:
+                recorded = json.load(f)
+            return {TapeStatus(status): file_count for status, file_count in recorded.items()}
+        except FileNotFoundError:
+            return {}
+        except (ValueError, AttributeError) as e:
+            logger.warning(f"Ignoring unreadable stage marker {self._marker_file}: {str(e)}")
+            return {}
+
+    def record(self, stage: TapeStatus, file_count: int) -> None:
+        recorded = {str(status): count for status, count in self.read().items()}
+        recorded[str(stage)] = file_count
+
+        self._marker_file.parent.mkdir(parents=True, exist_ok=True)
+        tmp_file = self._marker_file.with_name(self._marker_file.name + ".tmp")
+        with open(tmp_file, "w") as f:
+            json.dump(recorded, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_file, self._marker_file)
+
+    def clear(self) -> None:
+        try:
+            self._marker_file.unlink()
+        except FileNotFoundError:
+            pass
+
+    @staticmethod
+    def count_files(directory: Path) -> int:
+        """Counts regular files below directory, -1 if the directory does not exist."""
+        if not directory.is_dir():
+            return -1
+        count = 0
+        pending = [str(directory)]
+        while pending:
+            with os.scandir(pending.pop()) as it:
+                for entry in it:
+                    if entry.is_dir(follow_symlinks=False):
+                        pending.append(entry.path)
+                    elif entry.is_file(follow_symlinks=False):
+                        count += 1
+        return count
@@ -0,0 +1,191 @@
+import logging
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from pathlib import Path
+from typing import List, Optional
+
+from unit_of_work.linker.link_creator.link_creator import LinkCreator
+from unit_of_work.metrics.metrics_publisher import MetricsPublisher
+from unit_of_work.metrics.unit_of_work_metrics import StageMetrics
+from unit_of_work.processor.stage_marker import StageMarker
+from unit_of_work.processor.unit_of_work_processor_impl import UnitOfWorkProcessorImpl
+from unit_of_work.sanity_checker.sanity_checker import SanityChecker
+from unit_of_work.slicer.slicer import Slicer
+from unit_of_work.slicer.slicer_output_watcher import SlicerOutputWatcher
+from unit_of_work.tape_import_confirmer.tape_import_confirmer import TapeImportConfirmer
+from unit_of_work.tape_register.tape_register import TapeRegister
+from unit_of_work.tape_register.tape_status import TapeStatus
+from unit_of_work.uploader.hcp_uploader import HcpUploader
+from unit_of_work.uploader.upload_manifest import UploadManifest
+from unit_of_work.uploader.upload_result import UploadResult
+from unit_of_work.uploader.upload_target import UploadTarget
+from unit_of_work.utils.background_deleter import BackgroundDeleter
+
+logger = logging.getLogger(__name__)
+
+
+class StreamingUnitOfWorkProcessorImpl(UnitOfWorkProcessorImpl):
+    """Links and uploads slicer output while the slicer is still running.
+
+    Files are picked up by a SlicerOutputWatcher as soon as they are complete, linked
+    in batches and handed to a single background upload worker. The sanity checker
+    runs once the slicer has exited and only gates the final FINISHED status.
+    """
+
+    def __init__(
+        self,
+        tape_import_confirmer: TapeImportConfirmer,
+        tape_register: TapeRegister,
+        slicer: Slicer,
+        sanity_checker: SanityChecker,
+        link_creator: LinkCreator,
+        hcp_uploader: HcpUploader,
+        slicer_output_directory: Path,
+        slicer_log: Path,
+        sanity_checker_log: Path,
+        linked_output_directory: Path,
+        file_patterns: List[str],
+        poll_interval: float,
+        settle_seconds: float,
+        upload_batch_size: int,
+        stage_marker: Optional[StageMarker] = None,
+        upload_manifest_file: Optional[Path] = None,
+        background_deleter: Optional[BackgroundDeleter] = None,
+        metrics_publisher: Optional[MetricsPublisher] = None
+    ):
+        super().__init__(
+            tape_import_confirmer=tape_import_confirmer,
+            tape_register=tape_register,
+            slicer=slicer,
+            sanity_checker=sanity_checker,
+            link_creator=link_creator,
+            hcp_uploader=hcp_uploader,
+            slicer_output_directory=slicer_output_directory,
+            slicer_log=slicer_log,
+            sanity_checker_log=sanity_checker_log,
+            linked_output_directory=linked_output_directory,
+            stage_marker=stage_marker,
+            upload_manifest_file=upload_manifest_file,
+            background_deleter=background_deleter,
+            metrics_publisher=metrics_publisher
+        )
+        self._file_patterns: List[str] = file_patterns
+        self._poll_interval: float = poll_interval
+        self._settle_seconds: float = settle_seconds
+        self._upload_batch_size: int = upload_batch_size
+
+    def _process(
+        self,
+        tape_name: str,
+        tape_location: Path,
+        completed_stage: Optional[TapeStatus]
+    ) -> None:
+        if completed_stage is not None:
+            # The slicer already ran, so there is nothing left to overlap with it
+            super()._process(tape_name, tape_location, completed_stage)
+            return
+
+        tape_confirmer_waiting_time: float = self._run_tape_import_confirmer(tape_name, tape_location)
+        pipeline_duration: float = self._run_pipeline(tape_name, tape_location)
+        self._clean_working_dir()
+        self._clean_tape_and_tape_confirmation_file(
+            tape_location,
+            self._tape_import_confirmer.get_tape_confirmation_file(tape_name, tape_location)
+        )
+
+        logger.info(f"Uploader finished, working directory deleted, tape name: {tape_name}")
+        logger.info(
+            f"Statistics for unit of work: "
+            f"[tape={tape_name}] "
+            f"[location={tape_location}] "
+            f"[confirmer_wait={tape_confirmer_waiting_time}] "
+            f"[streaming_pipeline={pipeline_duration}] "
+            f"[upload_skipped_bytes={self._upload_skipped_bytes}]"
+        )
+
+    def _run_pipeline(self, tape_name: str, tape_location: Path) -> float:
+        logger.info(f"Streaming pipeline starting, tape name: {tape_name}")
+        with self._metrics.stage("streaming_pipeline") as stage:
+            self._stream(tape_name, tape_location, stage)
+        return stage.seconds
+
+    def _stream(self, tape_name: str, tape_location: Path, stage: StageMetrics) -> None:
+        watcher = SlicerOutputWatcher(self._slicer_output_directory, self._file_patterns, self._settle_seconds)
+        uploads: List[Future] = []
+        manifest: Optional[UploadManifest] = self._open_upload_manifest()
+
+        with ThreadPoolExecutor(max_workers=1, thread_name_prefix=f"slicer_{tape_name}") as slicer_executor, \
+                ThreadPoolExecutor(max_workers=1, thread_name_prefix=f"uploader_{tape_name}") as upload_executor:
+            slicer_future: Future = slicer_executor.submit(self._run_slicer, tape_name, tape_location)
+
+            try:
+                while not slicer_future.done():
+                    self._link_and_submit_upload(watcher.poll(), upload_executor, uploads, manifest, stage)
+                    self._raise_failed_upload(tape_name, uploads)
+                    wait([slicer_future], timeout=self._poll_interval)
+
+                # _run_slicer logs its own failure and has already set SLICED on success
+                slicer_future.result()
+
+                self._link_and_submit_upload(watcher.drain(), upload_executor, uploads, manifest, stage)
+                self._run_sanity_checker(tape_name)
+                self._tape_register.set_status_linked(tape_name)
+                self._mark_stage_completed(TapeStatus.LINKED)
+                # Every slicer file has its linked twin now, so each upload the uploader
+                # deletes from here on frees its space right away
+                self._delete(self._slicer_output_directory, False)
+
+                wait(uploads)
+                self._raise_failed_upload(tape_name, uploads)
+            except Exception:
+                # Drop queued batches; leaving the block still waits for a running slicer.
+                upload_executor.shutdown(wait=False, cancel_futures=True)
+                raise
+            finally:
+                # A running upload may still record into the manifest, so let it finish first
+                upload_executor.shutdown(wait=True)
+                self._close_upload_manifest(manifest)
+
+        self._tape_register.set_status_finished(tape_name)
+
+    def _link_and_submit_upload(
+        self,
+        source_files: List[Path],
+        upload_executor: ThreadPoolExecutor,
+        uploads: List[Future],
+        manifest: Optional[UploadManifest],
+        stage: StageMetrics
+    ) -> None:
+        if not source_files:
+            return
+
+        targets: List[UploadTarget] = []
+        link_result = self._link_creator.link_files(
+            source_files,
+            on_linked=lambda source_file, target_path: targets.append(
+                UploadTarget(
+                    local_path=target_path,
+                    s3_key=target_path.relative_to(self._linker_output_directory).as_posix()
+                )
+            )
+        )
+
+        stage.failed_files += link_result.failed
+
+        for i in range(0, len(targets), self._upload_batch_size):
+            uploads.append(
+                upload_executor.submit(self._upload_batch, targets[i:i + self._upload_batch_size], manifest, stage)
+            )
+
+    def _upload_batch(self, targets: List[UploadTarget], manifest: Optional[UploadManifest], stage: StageMetrics) -> None:
+        # Runs on the single upload worker, the only writer of the stage's counts
+        results: List[UploadResult] = self._hcp_uploader.upload_files(targets, manifest)
+        stage.files += len(results)
+        stage.bytes += sum(result.size for result in results)
+
+    @staticmethod
+    def _raise_failed_upload(tape_name: str, uploads: List[Future]) -> None:
+        for future in uploads:
+            if future.done() and future.exception() is not None:
+                logger.error(f"Uploader failed, tape name: {tape_name} {str(future.exception())}")
+                raise future.exception()
+        uploads[:] = [future for future in uploads if not future.done()]
@@ -1,81 +1,177 @@
 import logging
+import os
 from pathlib import Path
-import time
+from typing import Optional, Tuple
 from unit_of_work.linker.link_creator.link_creator import LinkCreator
+from unit_of_work.linker.link_creator.link_result import LinkResult
+from unit_of_work.metrics.metrics_publisher import MetricsPublisher
+from unit_of_work.metrics.unit_of_work_metrics import UnitOfWorkMetrics
+from unit_of_work.processor.stage_marker import StageMarker
 from unit_of_work.processor.unit_of_work_processor import UnitOfWorkProcessor
 from unit_of_work.sanity_checker.sanity_checker import SanityChecker
 from unit_of_work.slicer.slicer import Slicer
 from unit_of_work.tape_import_confirmer.tape_import_confirmer import TapeImportConfirmer
 from unit_of_work.tape_register.tape_register import TapeRegister
+from unit_of_work.tape_register.tape_status import TapeStatus
 from unit_of_work.uploader.hcp_uploader import HcpUploader
+from unit_of_work.uploader.upload_manifest import UploadManifest
+from unit_of_work.uploader.upload_summary import UploadSummary
+from unit_of_work.utils.background_deleter import BackgroundDeleter
 from unit_of_work.utils.delete_path import delete_path
 
 logger = logging.getLogger(__name__)
 
 class UnitOfWorkProcessorImpl(UnitOfWorkProcessor):
+    # Stages whose output survives a failed run, in pipeline order
+    _RESUMABLE_STAGES: Tuple[TapeStatus, ...] = (TapeStatus.SLICED, TapeStatus.SANITIZED, TapeStatus.LINKED)
+
     def __init__(
         self,
         tape_import_confirmer: TapeImportConfirmer,
         tape_register: TapeRegister,
         slicer: Slicer,
         sanity_checker: SanityChecker,
-        link_creator: LinkCreator,
+        link_creator: Optional[LinkCreator],
         hcp_uploader: HcpUploader,
         slicer_output_directory: Path,
         slicer_log: Path,
         sanity_checker_log: Path,
-        linked_output_directory: Path
+        linked_output_directory: Path,
+        stage_marker: Optional[StageMarker] = None,
+        upload_manifest_file: Optional[Path] = None,
+        background_deleter: Optional[BackgroundDeleter] = None,
+        metrics_publisher: Optional[MetricsPublisher] = None
     ):
         self._tape_register: TapeRegister = tape_register
         self._tape_import_confirmer: TapeImportConfirmer = tape_import_confirmer
         self._slicer: Slicer = slicer
         self._sanity_checker: SanityChecker = sanity_checker
-        self._link_creator: LinkCreator = link_creator
+        self._link_creator: Optional[LinkCreator] = link_creator
         self._hcp_uploader: HcpUploader = hcp_uploader
         self._slicer_output_directory: Path = slicer_output_directory
         self._slicer_log: Path = slicer_log
         self._sanity_checker_log: Path = sanity_checker_log
         self._linker_output_directory = linked_output_directory
+        self._stage_marker: Optional[StageMarker] = stage_marker
+        self._upload_manifest_file: Optional[Path] = upload_manifest_file
+        # Bytes an earlier run of the tape had already uploaded
+        self._upload_skipped_bytes: int = 0
+        self._background_deleter: Optional[BackgroundDeleter] = background_deleter
+        self._metrics_publisher: Optional[MetricsPublisher] = metrics_publisher
+        self._metrics: UnitOfWorkMetrics = UnitOfWorkMetrics()
+
     def process(
         self, 
         tape_name: str,
         tape_location: Path
     ) -> None:
+        self._metrics = UnitOfWorkMetrics()
+        succeeded: bool = False
         try:
-            tape_confirmer_waiting_time: float = self._run_tape_import_confirmer(tape_name, tape_location)
-            slicer_duration: float = self._run_slicer(tape_name, tape_location)
-            sanity_checker_duration: float = self._run_sanity_checker(tape_name)
-            linker_duration: float = self._run_linker(tape_name)
-            uploader_duration: float = self._run_uploader(tape_name)
-            self._clean_working_dir()
-            self._clean_tape_and_tape_confirmation_file(
-                tape_location, 
-                self._tape_import_confirmer.get_tape_confirmation_file(tape_name, tape_location)
-            )
-
-            logger.info(f"Uploader finished, working directory deleted, tape name: {tape_name}")
-            logger.info(
-                f"Statistics for unit of work: "
-                f"[tape={tape_name}] "
-                f"[location={tape_location}] "
-                f"[confirmer_wait={tape_confirmer_waiting_time}] "
-                f"[slicer={slicer_duration}] "
-                f"[sanity_checker={sanity_checker_duration}] "
-                f"[linker={linker_duration}] "
-                f"[uploader={uploader_duration}]"
-            )
-
+            completed_stage: Optional[TapeStatus] = self._completed_stage(tape_name)
+            self._process(tape_name, tape_location, completed_stage)
+            succeeded = True
         except Exception as e:
             logger.error(f"Unit of work failed, tape name: {tape_name}, {str(e)}")
             self._tape_register.set_status_failed(tape_name)
+        finally:
+            self._publish_metrics(tape_name, succeeded)
+
+    def _publish_metrics(self, tape_name: str, succeeded: bool) -> None:
+        self._metrics.finish(succeeded)
+        if self._metrics_publisher is None:
+            return
+        try:
+            self._metrics_publisher.publish(tape_name, self._metrics)
+        except Exception as e:
+            # Losing the metrics of one tape must not fail the tape
+            logger.warning(f"Failed to publish metrics, tape name: {tape_name}, {str(e)}")
+
+    def _process(
+        self,
+        tape_name: str,
+        tape_location: Path,
+        completed_stage: Optional[TapeStatus]
+    ) -> None:
+        tape_confirmer_waiting_time: float = 0.0
+        slicer_duration: float = 0.0
+        sanity_checker_duration: float = 0.0
+        linker_duration: float = 0.0
+
+        if not self._is_completed(TapeStatus.SLICED, completed_stage):
+            tape_confirmer_waiting_time = self._run_tape_import_confirmer(tape_name, tape_location)
+            slicer_duration = self._run_slicer(tape_name, tape_location)
+        if not self._is_completed(TapeStatus.SANITIZED, completed_stage):
+            sanity_checker_duration = self._run_sanity_checker(tape_name)
+        if not self._is_completed(TapeStatus.LINKED, completed_stage):
+            if completed_stage is not None:
+                # Links left behind by the failed run would collide with the new ones
+                self._delete(self._linker_output_directory, True)
+            linker_duration = self._run_linker(tape_name)
+        uploader_duration: float = self._run_uploader(tape_name)
+        self._clean_working_dir()
+        self._clean_tape_and_tape_confirmation_file(
+            tape_location, 
+            self._tape_import_confirmer.get_tape_confirmation_file(tape_name, tape_location)
+        )
+
+        logger.info(f"Uploader finished, working directory deleted, tape name: {tape_name}")
+        logger.info(
+            f"Statistics for unit of work: "
+            f"[tape={tape_name}] "
+            f"[location={tape_location}] "
+            f"[confirmer_wait={tape_confirmer_waiting_time}] "
+            f"[slicer={slicer_duration}] "
+            f"[sanity_checker={sanity_checker_duration}] "
+            f"[linker={linker_duration}] "
+            f"[uploader={uploader_duration}] "
+            f"[upload_skipped_bytes={self._upload_skipped_bytes}]"
+        )
+
+    def _completed_stage(self, tape_name: str) -> Optional[TapeStatus]:
+        """Returns the last stage whose output a previous run left intact, None to start over.
+
+        The stage marker in the working directory is authoritative, because a failed run
+        always ends in the FAILED status. A progress status in the tape register caps it.
+        """
+        if self._stage_marker is None:
+            return None
+        recorded = self._stage_marker.read()
+        if not recorded:
+            return None
+
+        register_status: Optional[TapeStatus] = self._tape_register.get_status(tape_name)
+        for stage in reversed(self._RESUMABLE_STAGES):
+            if stage not in recorded:
+                continue
+            if register_status in self._RESUMABLE_STAGES and \
+                    self._RESUMABLE_STAGES.index(stage) > self._RESUMABLE_STAGES.index(register_status):
+                continue
+            file_count: int = StageMarker.count_files(self._stage_output_directory(stage))
+            if file_count >= 0 and file_count == recorded[stage]:
+                logger.info(f"Resuming unit of work after stage {stage}, tape name: {tape_name}")
+                return stage
+            logger.warning(f"Output of stage {stage} is not intact, not resuming from it, tape name: {tape_name}")
+        return None
+
+    def _is_completed(self, stage: TapeStatus, completed_stage: Optional[TapeStatus]) -> bool:
+        return completed_stage is not None and \
+            self._RESUMABLE_STAGES.index(stage) <= self._RESUMABLE_STAGES.index(completed_stage)
+
+    def _stage_output_directory(self, stage: TapeStatus) -> Path:
+        return self._linker_output_directory if stage == TapeStatus.LINKED else self._slicer_output_directory
+
+    def _mark_stage_completed(self, stage: TapeStatus) -> None:
+        if self._stage_marker is not None:
+            self._stage_marker.record(stage, StageMarker.count_files(self._stage_output_directory(stage)))
     
     def _run_tape_import_confirmer(self, tape_name: str, tape_location: Path) -> float:
         try:
             logger.info(f"Tape record confirmer starting, tape name: {tape_name}")
-            start_time = time.time()
-            self._tape_import_confirmer.wait_for_confirmation(tape_name, tape_location)
-            self._tape_register.set_status_exported(tape_name)
-            return time.time() - start_time
+            with self._metrics.stage("confirmer_wait") as stage:
+                self._tape_import_confirmer.wait_for_confirmation(tape_name, tape_location)
+                self._tape_register.set_status_exported(tape_name)
+            return stage.seconds
         except Exception as e:
             logger.error(f"Tape record confirmer wait failed, tape name: {tape_name}, tape location: {tape_location}, {str(e)}")
             raise
@@ -83,14 +179,16 @@ class UnitOfWorkProcessorImpl(UnitOfWorkProcessor):
     def _run_slicer(self, tape_name: str, tape_location: Path) -> float:
         try:
             logger.info(f"Slicer starting, tape name: {tape_name}")
-            start_time = time.time()
-            self._slicer.execute(
-                tape_location=tape_location,
-                output_directory=self._slicer_output_directory,
-                log_file=self._slicer_log
-            )
-            self._tape_register.set_status_sliced(tape_name)
-            return time.time() - start_time
+            with self._metrics.stage("slicer") as stage:
+                stage.bytes = self._tape_size(tape_location)
+                self._slicer.execute(
+                    tape_location=tape_location,
+                    output_directory=self._slicer_output_directory,
+                    log_file=self._slicer_log
+                )
+                self._tape_register.set_status_sliced(tape_name)
+                self._mark_stage_completed(TapeStatus.SLICED)
+            return stage.seconds
         except Exception as e:
             logger.error(f"Slicer failed, tape name: {tape_name}, {str(e)}")
             raise
@@ -98,15 +196,16 @@ class UnitOfWorkProcessorImpl(UnitOfWorkProcessor):
     def _run_sanity_checker(self, tape_name: str) -> float:
         try:
             logger.info(f"Sanity checker starting, tape name: {tape_name}")
-            start_time = time.time()
-            self._sanity_checker.execute(
-                tape_name=tape_name,
-                slicer_log=self._slicer_log,
-                slicer_output_directory=self._slicer_output_directory,
-                sanity_checker_log=self._sanity_checker_log
-            )
-            self._tape_register.set_status_sanitized(tape_name)
-            return time.time() - start_time
+            with self._metrics.stage("sanity_checker") as stage:
+                self._sanity_checker.execute(
+                    tape_name=tape_name,
+                    slicer_log=self._slicer_log,
+                    slicer_output_directory=self._slicer_output_directory,
+                    sanity_checker_log=self._sanity_checker_log
+                )
+                self._tape_register.set_status_sanitized(tape_name)
+                self._mark_stage_completed(TapeStatus.SANITIZED)
+            return stage.seconds
         except Exception as e:
             logger.error(f"Sanity checker failed, tape name: {tape_name}, {str(e)}")
             raise
@@ -114,12 +213,19 @@ class UnitOfWorkProcessorImpl(UnitOfWorkProcessor):
     def _run_linker(self, tape_name: str) -> float:
         try:
             logger.info(f"Linker starting, tape name: {tape_name}")
-            start_time = time.time()
-            self._link_creator.create_links()
-            self._tape_register.set_status_linked(tape_name)
-            duration = time.time() - start_time
-            delete_path(self._slicer_output_directory, False)
-            return duration
+            with self._metrics.stage("linker") as stage:
+                link_result: LinkResult = self._link_creator.create_links()
+                stage.files = link_result.succeeded
+                stage.failed_files = link_result.failed
+                if link_result.failed:
+                    logger.warning(
+                        f"Linker could not link {link_result.failed} of {link_result.succeeded + link_result.failed} files, "
+                        f"tape name: {tape_name}, failures: {link_result.failure_manifest}"
+                    )
+                self._tape_register.set_status_linked(tape_name)
+                self._mark_stage_completed(TapeStatus.LINKED)
+            self._delete(self._slicer_output_directory, False)
+            return stage.seconds
         except Exception as e:
             logger.error(f"Linker failed, tape name: {tape_name} {str(e)}")
             raise
@@ -127,22 +233,60 @@ class UnitOfWorkProcessorImpl(UnitOfWorkProcessor):
     def _run_uploader(self, tape_name: str) -> float:
         try:
             logger.info(f"Uploader started, tape name: {tape_name}")
-            start_time = time.time()
-            self._hcp_uploader.upload_dir(self._linker_output_directory)
-            self._tape_register.set_status_finished(tape_name)
-            duration = time.time() - start_time
-            delete_path(self._linker_output_directory, False)
-            return duration
+            with self._metrics.stage("uploader") as stage:
+                manifest: Optional[UploadManifest] = self._open_upload_manifest()
+                try:
+                    summary: UploadSummary = self._hcp_uploader.upload_dir(self._linker_output_directory, manifest)
+                finally:
+                    self._close_upload_manifest(manifest)
+                stage.files = summary.objects
+                stage.bytes = summary.bytes
+                self._tape_register.set_status_finished(tape_name)
+            self._delete(self._linker_output_directory, False)
+            return stage.seconds
         except Exception as e:
             logger.error(f"Uploader failed, tape name: {tape_name} {str(e)}")
             raise
 
+    def _open_upload_manifest(self) -> Optional[UploadManifest]:
+        if self._upload_manifest_file is None:
+            return None
+        return UploadManifest(self._upload_manifest_file)
+
+    def _close_upload_manifest(self, manifest: Optional[UploadManifest]) -> None:
+        if manifest is None:
+            return
+        manifest.close()
+        self._upload_skipped_bytes += manifest.skipped_bytes
+        if manifest.skipped:
+            logger.info(
+                f"Uploader skipped {manifest.skipped} objects ({manifest.skipped_bytes} bytes) "
+                f"uploaded by an earlier run, manifest: {manifest.path}"
+            )
+
+    @staticmethod
+    def _tape_size(tape_location: Path) -> int:
+        try:
+            return os.stat(tape_location).st_size
+        except OSError:
+            return 0
+
+    def _delete(self, path: Path, synchronous: bool) -> None:
+        # Once the background deleter has renamed the path away it is gone for every
+        # caller, so even synchronous deletions need not wait for the data
+        if self._background_deleter is not None:
+            self._background_deleter.delete(path)
+        else:
+            delete_path(path, synchronous)
+
     def _clean_working_dir(self) -> None:
         for working_dir in [
             self._slicer_output_directory,
             self._linker_output_directory
         ]:
-            delete_path(working_dir, True)
+            self._delete(working_dir, True)
+        if self._stage_marker is not None:
+            self._stage_marker.clear()
         
     def _clean_tape_and_tape_confirmation_file(self, tape: Path, tape_confirmation_file: Path) -> None:
         for working_dir in [
@@ -0,0 +1,94 @@
+import logging
+import time
+from pathlib import Path
+from typing import Container, Dict, List, Pattern, Set, Tuple
+
+from unit_of_work.utils.file_scanner import compile_file_patterns, scan_files
+
+logger = logging.getLogger(__name__)
+
+
+class SlicerOutputModifiedError(Exception):
+    """Raised when a file changed after it had been handed out as complete."""
+    pass
+
+
+class SlicerOutputWatcher:
+    """Detects slicer output files that are finished while the slicer is still running.
+
+    The slicer gives no completion signal per file, so a file is considered finished
+    once its size and mtime are unchanged between two polls and its mtime is at least
+    `settle_seconds` old. Once the slicer has exited, `drain` hands out everything left.
+    """
+
+    def __init__(
+        self,
+        directory: Path,
+        file_patterns: List[str],
+        settle_seconds: float
+    ) -> None:
+        self._directory: Path = directory
+        self._pattern: Pattern[str] = compile_file_patterns(file_patterns)
+        self._settle_seconds: float = settle_seconds
+        self._pending: Dict[str, Tuple[int, int]] = {}
+        self._emitted: Dict[str, Tuple[int, int]] = {}
+
+    def poll(self) -> List[Path]:
+        """Returns files that became complete since the previous call."""
+        now_ns: int = time.time_ns()
+        settle_ns: int = int(self._settle_seconds * 1_000_000_000)
+        ready: List[Path] = []
+
+        # Files handed out already are not stat'ed again until `drain` verifies them
+        for name, signature in self._scan(skip=self._emitted):
+            if self._pending.get(name) == signature and now_ns - signature[1] >= settle_ns:
+                del self._pending[name]
+                self._emitted[name] = signature
+                ready.append(self._directory / name)
+            else:
+                self._pending[name] = signature
+
+        return ready
+
+    def drain(self) -> List[Path]:
+        """Returns every file not handed out yet. Must only be called after the slicer
+        has exited; raises SlicerOutputModifiedError if an already handed out file
+        has changed since."""
+        remaining: List[Path] = []
+        seen: Set[str] = set()
+
+        for name, signature in self._scan():
+            seen.add(name)
+            emitted_signature = self._emitted.get(name)
+            if emitted_signature is None:
+                self._emitted[name] = signature
+                remaining.append(self._directory / name)
+            elif emitted_signature != signature:
+                raise SlicerOutputModifiedError(
+                    f"Slicer output file changed after it was processed: {self._directory / name}"
+                )
+
+        missing = self._emitted.keys() - seen
+        if missing:
+            raise SlicerOutputModifiedError(
+                f"{len(missing)} slicer output file(s) disappeared after they were processed, "
+                f"e.g. {self._directory / next(iter(missing))}"
+            )
+
+        self._pending.clear()
+        return remaining
+
+    def _scan(self, skip: Container[str] = ()) -> List[Tuple[str, Tuple[int, int]]]:
+        entries: List[Tuple[str, Tuple[int, int]]] = []
+        try:
+            for entry in scan_files(self._directory, self._pattern):
+                if entry.name in skip:
+                    continue
+                try:
+                    stat = entry.stat()
+                except FileNotFoundError:
+                    continue
+                entries.append((entry.name, (stat.st_size, stat.st_mtime_ns)))
+        except FileNotFoundError:
+            logger.debug("Slicer output directory does not exist yet: %s", self._directory)
+        return entries
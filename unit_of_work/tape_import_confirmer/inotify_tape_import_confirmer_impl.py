@@ -0,0 +1,197 @@
+import ctypes
+import ctypes.util
+import logging
+import os
+import select
+import struct
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Optional, Set
+
+from unit_of_work.tape_import_confirmer.tape_import_confirmer_impl import TapeImportConfirmerImpl
+
+logger = logging.getLogger(__name__)
+
+
+class _Inotify:
+    """Minimal ctypes binding of the Linux inotify API."""
+    IN_ATTRIB: int = 0x00000004
+    IN_CLOSE_WRITE: int = 0x00000008
+    IN_MOVED_TO: int = 0x00000080
+    IN_CREATE: int = 0x00000100
+    IN_Q_OVERFLOW: int = 0x00004000
+    IN_NONBLOCK: int = os.O_NONBLOCK
+    IN_CLOEXEC: int = getattr(os, "O_CLOEXEC", 0o2000000)
+
+    _EVENT_HEADER: struct.Struct = struct.Struct("iIII")
+
+    def __init__(self) -> None:
+        if not sys.platform.startswith("linux"):
+            raise OSError(f"inotify is not available on {sys.platform}")
+        libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+        self._add_watch = libc.inotify_add_watch
+        self._add_watch.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+        self._add_watch.restype = ctypes.c_int
+
+        self.fd: int = libc.inotify_init1(self.IN_NONBLOCK | self.IN_CLOEXEC)
+        if self.fd < 0:
+            errno = ctypes.get_errno()
+            raise OSError(errno, f"inotify_init1 failed: {os.strerror(errno)}")
+
+    def add_watch(self, directory: Path, mask: int) -> int:
+        wd: int = self._add_watch(self.fd, os.fsencode(str(directory)), mask)
+        if wd < 0:
+            errno = ctypes.get_errno()
+            raise OSError(errno, f"inotify_add_watch failed for {directory}: {os.strerror(errno)}")
+        return wd
+
+    def read_events(self):
+        """Yields (wd, mask, name) for all queued events."""
+        try:
+            buffer = os.read(self.fd, 64 * 1024)
+        except BlockingIOError:
+            return
+        offset = 0
+        while offset < len(buffer):
+            wd, mask, _, name_length = self._EVENT_HEADER.unpack_from(buffer, offset)
+            offset += self._EVENT_HEADER.size
+            name = buffer[offset:offset + name_length].rstrip(b"\0").decode(errors="surrogateescape")
+            offset += name_length
+            yield wd, mask, name
+
+    def close(self) -> None:
+        os.close(self.fd)
+
+
+class InotifyTapeImportConfirmerImpl(TapeImportConfirmerImpl):
+    """Waits for the tape and its ready file using inotify instead of sleep polling.
+
+    A single inotify instance and reader thread serve every tape waiting in the same
+    process; each tape directory is watched once, however many tapes wait in it.
+    Changes made by other NFS clients do not raise inotify events, so waiters still
+    re-check the files every `check_interval` seconds, and a tape is never confirmed
+    later than with polling. Where inotify is unavailable the polling implementation
+    is used. `close` stops the reader thread and releases the inotify descriptor.
+    """
+
+    _WATCH_MASK: int = _Inotify.IN_CREATE | _Inotify.IN_MOVED_TO | _Inotify.IN_CLOSE_WRITE | _Inotify.IN_ATTRIB
+
+    def __init__(
+        self,
+        ready_extension: str,
+        timeout: int,
+        check_interval: int
+    ) -> None:
+        super().__init__(ready_extension, timeout, check_interval)
+        self._condition: threading.Condition = threading.Condition()
+        self._watches: Dict[Path, int] = {}
+        self._directories: Dict[int, Path] = {}
+        # Names some waiter is interested in, with the number of waiters, per directory
+        self._interests: Dict[Path, Dict[str, int]] = {}
+        self._arrived: Dict[Path, Set[str]] = {}
+        self._inotify: Optional[_Inotify] = None
+        self._reader: Optional[threading.Thread] = None
+        self._closed: bool = False
+        self._wakeup_read, self._wakeup_write = os.pipe()
+
+        try:
+            self._inotify = _Inotify()
+        except (OSError, AttributeError) as e:
+            logger.warning(f"inotify unavailable, falling back to polling every {check_interval}s: {str(e)}")
+
+    def wait_for_confirmation(self, tape_name: str, tape_location: Path) -> None:
+        if self._inotify is None:
+            super().wait_for_confirmation(tape_name, tape_location)
+            return
+
+        confirmation_file: Path = self.get_tape_confirmation_file(tape_name, tape_location)
+        directory: Path = tape_location.parent
+        names: Set[str] = {tape_location.name, confirmation_file.name}
+
+        try:
+            self._register(directory, names)
+        except OSError as e:
+            logger.warning(f"Cannot watch {directory}, polling instead: {str(e)}")
+            super().wait_for_confirmation(tape_name, tape_location)
+            return
+
+        deadline = time.monotonic() + self.timeout
+        try:
+            # The watch is in place before the first check, so no event can be missed
+            while not (tape_location.exists() and confirmation_file.exists()):
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise TimeoutError(f"Timeout waiting for {tape_location} and {confirmation_file}")
+                rescan_at = time.monotonic() + min(remaining, self.check_interval)
+                with self._condition:
+                    while not (self._arrived[directory] & names) and time.monotonic() < rescan_at:
+                        self._condition.wait(rescan_at - time.monotonic())
+                    self._arrived[directory] -= names
+        finally:
+            self._unregister(directory, names)
+
+    def close(self) -> None:
+        with self._condition:
+            self._closed = True
+        os.write(self._wakeup_write, b"\0")
+        if self._reader is not None:
+            self._reader.join()
+        if self._inotify is not None:
+            self._inotify.close()
+            self._inotify = None
+        os.close(self._wakeup_read)
+        os.close(self._wakeup_write)
+
+    def _register(self, directory: Path, names: Set[str]) -> None:
+        with self._condition:
+            if directory not in self._watches:
+                wd = self._inotify.add_watch(directory, self._WATCH_MASK)
+                self._watches[directory] = wd
+                self._directories[wd] = directory
+                self._interests[directory] = {}
+                self._arrived[directory] = set()
+            interests = self._interests[directory]
+            for name in names:
+                interests[name] = interests.get(name, 0) + 1
+            if self._reader is None:
+                self._reader = threading.Thread(
+                    target=self._read_events,
+                    name="tape_import_confirmer_inotify",
+                    daemon=True
+                )
+                self._reader.start()
+
+    def _unregister(self, directory: Path, names: Set[str]) -> None:
+        with self._condition:
+            interests = self._interests[directory]
+            for name in names:
+                interests[name] -= 1
+                if interests[name] == 0:
+                    del interests[name]
+                    self._arrived[directory].discard(name)
+
+    def _read_events(self) -> None:
+        while True:
+            with self._condition:
+                if self._closed:
+                    return
+            readable, _, _ = select.select([self._inotify.fd, self._wakeup_read], [], [])
+            if self._inotify.fd not in readable:
+                continue
+            with self._condition:
+                notify = False
+                for wd, mask, name in self._inotify.read_events():
+                    if mask & _Inotify.IN_Q_OVERFLOW:
+                        # Events were dropped: make every waiter re-check its files
+                        for directory, interests in self._interests.items():
+                            self._arrived[directory].update(interests)
+                        notify = True
+                        continue
+                    directory = self._directories.get(wd)
+                    if directory is not None and name in self._interests[directory]:
+                        self._arrived[directory].add(name)
+                        notify = True
+                if notify:
+                    self._condition.notify_all()
@@ -1,4 +1,7 @@
 from abc import ABC, abstractmethod
+from typing import List, Optional
+
+from unit_of_work.tape_register.tape_status import TapeStatus
 
 class TapeRegister(ABC):
     @abstractmethod
@@ -23,4 +26,20 @@ class TapeRegister(ABC):
 
     @abstractmethod
     def set_status_finished(self, tape_name: str) -> None:
+        pass
+
+    @abstractmethod
+    def claim_tapes(self, limit: int) -> List[str]:
+        """Atomically moves up to `limit` new or requested tapes to the claimed
+        status and returns the names of the tapes claimed by this caller."""
+        pass
+
+    @abstractmethod
+    def release_claims(self) -> int:
+        """Moves every claimed tape back to the requested status, so that tapes left
+        claimed by a crashed worker are claimed again. Returns their number."""
+        pass
+
+    @abstractmethod
+    def get_status(self, tape_name: str) -> Optional[TapeStatus]:
         pass
\ No newline at end of file
@@ -1,4 +1,5 @@
 import logging
+from typing import List, Optional, Tuple
 
 from unit_of_work.db2.db_connection import DBConnection
 from unit_of_work.tape_register.tape_register import TapeRegister
@@ -7,6 +8,8 @@ from unit_of_work.tape_register.tape_status import TapeStatus
 logger = logging.getLogger(__name__)
 
 class TapeRegisterImpl(TapeRegister):
+    _CLAIMABLE_STATUSES: Tuple[TapeStatus, ...] = (TapeStatus.NEW, TapeStatus.REQUESTED)
+
     def __init__(
         self,
         _db_connection: DBConnection,
@@ -16,13 +19,30 @@ class TapeRegisterImpl(TapeRegister):
         self._tape_register_table = tape_register_table
         
     def _set_status(self, tape_name: str, status: TapeStatus) -> None:
-        query = f"UPDATE {self._tape_register_table} SET status = '{status}' WHERE volser = '{tape_name}'"
+        # Only the table name is part of the SQL text, so one prepared statement
+        # serves every status transition of every tape
+        query = f"UPDATE {self._tape_register_table} SET status = ? WHERE volser = ?"
         try:
-            self._db2_connection.update(query)
+            self._db2_connection.execute(query, (status.value, tape_name))
         except Exception as e:
             logger.error(f"Failed to update status to {status} for tape {tape_name}: {e}")
             raise
 
+    def get_status(self, tape_name: str) -> Optional[TapeStatus]:
+        query = f"SELECT status FROM {self._tape_register_table} WHERE volser = ?"
+        try:
+            row = self._db2_connection.fetch_one(query, (tape_name,))
+        except Exception as e:
+            logger.error(f"Failed to read status for tape {tape_name}: {e}")
+            raise
+        if row is None:
+            return None
+        try:
+            return TapeStatus(str(row[0]).strip())
+        except ValueError:
+            logger.warning(f"Unknown status {row[0]} for tape {tape_name}")
+            return None
+
     def set_status_failed(self, tape_name: str) -> None:
         self._set_status(tape_name, TapeStatus.FAILED)
 
@@ -41,3 +61,46 @@ class TapeRegisterImpl(TapeRegister):
     def set_status_finished(self, tape_name: str) -> None:
         self._set_status(tape_name, TapeStatus.FINISHED)
 
+    def claim_tapes(self, limit: int) -> List[str]:
+        claimable = ", ".join("?" for _ in self._CLAIMABLE_STATUSES)
+        claimable_values = tuple(status.value for status in self._CLAIMABLE_STATUSES)
+        candidates_query = (
+            f"SELECT volser FROM {self._tape_register_table} "
+            f"WHERE status IN ({claimable}) FETCH FIRST {int(limit)} ROWS ONLY"
+        )
+        try:
+            candidates = list(self._db2_connection.fetch_all(candidates_query, claimable_values))
+        except Exception as e:
+            logger.error(f"Failed to fetch claimable tapes: {e}")
+            raise
+
+        claimed: List[str] = []
+        for tape_name in candidates:
+            # The status guard makes the claim atomic: when several workers race for
+            # the same tape only one UPDATE matches a row.
+            claim_query = (
+                f"UPDATE {self._tape_register_table} SET status = ? "
+                f"WHERE volser = ? AND status IN ({claimable})"
+            )
+            try:
+                if self._db2_connection.execute(claim_query, (TapeStatus.CLAIMED.value, tape_name) + claimable_values) == 1:
+                    claimed.append(tape_name)
+            except Exception as e:
+                logger.error(f"Failed to claim tape {tape_name}: {e}")
+                if not claimed:
+                    raise
+                # The tapes won so far are claimed already, so hand them to the caller
+                # rather than leave them claimed without a worker
+                break
+        return claimed
+
+    def release_claims(self) -> int:
+        query = f"UPDATE {self._tape_register_table} SET status = ? WHERE status = ?"
+        try:
+            released = self._db2_connection.execute(query, (TapeStatus.REQUESTED.value, TapeStatus.CLAIMED.value))
+        except Exception as e:
+            logger.error(f"Failed to release claimed tapes: {e}")
+            raise
+        if released:
+            logger.warning(f"Released {released} tapes left claimed by an earlier run")
+        return released
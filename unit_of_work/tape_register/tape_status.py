@@ -5,6 +5,7 @@ class TapeStatus(Enum):
     EXPORTED: str = "exported"
     NEW: str = "new"
     REQUESTED: str = "requested"
+    CLAIMED: str = "claimed"
     SLICED: str = "sliced"
     SANITIZED: str = "sanitized"
     LINKED: str = "linked"
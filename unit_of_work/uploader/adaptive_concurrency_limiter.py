@@ -0,0 +1,113 @@
+import logging
+import threading
+import time
+from collections import deque
+from typing import Deque, Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class AdaptiveConcurrencyLimiter:
+    """Caps the uploads in flight with an AIMD (additive increase, multiplicative
+    decrease) limit, shared by every tape that uses the same uploader.
+
+    Each healthy completion raises the limit by 1/limit, i.e. by one per round of
+    uploads, up to `max_limit`. A completion is healthy if it was not throttled and
+    its latency per MiB stays within `latency_tolerance` times the best latency seen
+    recently. A throttled request multiplies the limit by `decrease_factor`, at most
+    once per `cooldown` seconds, so that one burst of 503 SlowDown answers counts as
+    one signal. An upload that failed otherwise only frees its slot: its latency
+    says nothing about the endpoint, and it must not grow the limit either.
+    Independent workers throttled by one endpoint thereby converge on its capacity
+    instead of oscillating between overload and idling.
+    """
+
+    _LATENCY_UNIT: int = 1024 * 1024
+    # Share of the gap by which the latency baseline follows slower uploads
+    _BASELINE_DRIFT: float = 0.01
+
+    def __init__(
+        self,
+        max_limit: int,
+        min_limit: int = 1,
+        initial_limit: Optional[int] = None,
+        decrease_factor: float = 0.5,
+        latency_tolerance: float = 2.0,
+        cooldown: float = 1.0,
+        throughput_window: float = 60.0
+    ) -> None:
+        if not 1 <= min_limit <= max_limit:
+            raise ValueError(f"Invalid concurrency limits: min {min_limit}, max {max_limit}")
+        self._max_limit: int = max_limit
+        self._min_limit: int = min_limit
+        self._limit: float = float(initial_limit if initial_limit is not None else max_limit)
+        self._decrease_factor: float = decrease_factor
+        self._latency_tolerance: float = latency_tolerance
+        self._cooldown: float = cooldown
+        self._throughput_window: float = throughput_window
+        self._condition: threading.Condition = threading.Condition()
+        self._in_flight: int = 0
+        self._baseline: Optional[float] = None
+        self._last_decrease: float = float("-inf")
+        self._completed: Deque[Tuple[float, int]] = deque()
+        self._completed_bytes: int = 0
+        self.throttled: int = 0
+
+    @property
+    def limit(self) -> int:
+        return max(self._min_limit, int(self._limit))
+
+    def acquire(self) -> float:
+        """Blocks until an upload may start; returns its start time for `release`."""
+        with self._condition:
+            while self._in_flight >= self.limit:
+                self._condition.wait()
+            self._in_flight += 1
+        return time.monotonic()
+
+    def release(self, started: float, size: int, throttled: bool = False, errored: bool = False) -> None:
+        now = time.monotonic()
+        with self._condition:
+            self._in_flight -= 1
+            if throttled:
+                self._decrease(now)
+            elif not errored:
+                self._record_throughput(now, size)
+                latency = (now - started) / max(size / self._LATENCY_UNIT, 1.0)
+                if self._baseline is None or latency < self._baseline:
+                    self._baseline = latency
+                else:
+                    self._baseline += (latency - self._baseline) * self._BASELINE_DRIFT
+                if latency <= self._latency_tolerance * self._baseline:
+                    self._limit = min(float(self._max_limit), self._limit + 1.0 / self._limit)
+            self._condition.notify_all()
+
+    def on_throttle(self) -> None:
+        """Reports throttling seen outside of a completion, e.g. on a retried request."""
+        with self._condition:
+            self._decrease(time.monotonic())
+
+    def metrics(self) -> Dict[str, float]:
+        with self._condition:
+            self._record_throughput(time.monotonic(), 0)
+            return {
+                "upload_concurrency_limit": self.limit,
+                "upload_in_flight": self._in_flight,
+                "upload_throughput_bytes_per_second": self._completed_bytes / self._throughput_window,
+                "upload_throttled_total": self.throttled
+            }
+
+    def _decrease(self, now: float) -> None:
+        self.throttled += 1
+        if now - self._last_decrease < self._cooldown:
+            return
+        self._last_decrease = now
+        self._limit = max(float(self._min_limit), self._limit * self._decrease_factor)
+        logger.warning(f"Upload throttled, concurrency limit lowered to {self.limit}")
+
+    def _record_throughput(self, now: float, size: int) -> None:
+        if size:
+            self._completed.append((now, size))
+            self._completed_bytes += size
+        while self._completed and now - self._completed[0][0] > self._throughput_window:
+            self._completed_bytes -= self._completed.popleft()[1]
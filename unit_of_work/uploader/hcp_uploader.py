@@ -1,11 +1,30 @@
 from abc import ABC, abstractmethod
 from pathlib import Path
+from typing import List, Optional
+
+from unit_of_work.uploader.upload_manifest import UploadManifest
+from unit_of_work.uploader.upload_result import UploadResult
+from unit_of_work.uploader.upload_summary import UploadSummary
+from unit_of_work.uploader.upload_target import UploadTarget
 
 class HcpUploader(ABC):
     @abstractmethod
 
     def upload_dir(
         self,
-        directory: Path
-    ) -> None:
+        directory: Path,
+        manifest: Optional[UploadManifest] = None
+    ) -> UploadSummary:
+        """Skips the objects `manifest` lists as uploaded and records the uploaded ones.
+        Returns what this call uploaded."""
+        pass
+
+    @abstractmethod
+    def upload_files(
+        self,
+        targets: List[UploadTarget],
+        manifest: Optional[UploadManifest] = None
+    ) -> List[UploadResult]:
+        """Raises an error if any target failed to upload. Targets `manifest` lists as
+        uploaded are skipped and have no result."""
         pass
\ No newline at end of file
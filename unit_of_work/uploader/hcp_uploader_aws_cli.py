@@ -1,49 +1,192 @@
+import glob
 import logging
 import subprocess
+from itertools import islice
 from pathlib import Path
-from typing import Optional
+from typing import Dict, Iterator, List, Optional, Tuple
 
 from unit_of_work.uploader.hcp_uploader import HcpUploader
+from unit_of_work.uploader.upload_manifest import UploadManifest
+from unit_of_work.uploader.upload_result import UploadResult
+from unit_of_work.uploader.upload_summary import UploadSummary
+from unit_of_work.uploader.upload_target import UploadTarget, delete_uploaded_file, walk_upload_targets
 
 logger = logging.getLogger(__name__)
 
 
 class CliS3UploadError(Exception):
-    pass
+    def __init__(self, message: str, output: str = "") -> None:
+        super().__init__(message)
+        # Standard output of the failed command, which lists the files it did upload
+        self.output: str = output
 
 
 class HcpUploaderAwsCliImpl(HcpUploader):
+    # Keeps a single `aws s3 cp` command line well below ARG_MAX
+    _MAX_INCLUDES_PER_COMMAND: int = 500
+    # Files recorded in the manifest at a time after a recursive copy
+    _MANIFEST_PAGE_SIZE: int = 1000
+
     def __init__(
         self,
         s3_bucket: str,
         s3_prefix: str,
-        verify_ssl: bool
+        verify_ssl: bool,
+        delete_uploaded: bool = False
     ):
         self._s3_bucket = s3_bucket
         self._s3_prefix = s3_prefix
         self._verify_ssl = verify_ssl
+        self._delete_uploaded = delete_uploaded
 
     def upload_dir(
         self,
         directory: Path,
+        manifest: Optional[UploadManifest] = None,
         extra_args: Optional[list[str]] = None
-    ) -> None:
+    ) -> UploadSummary:
+        """Copies the directory with a single `aws s3 cp --recursive`, which cannot
+        skip objects. With `manifest`, the files are recorded once the copy succeeded,
+        and deleted then if the uploader deletes uploaded files, page by page. If the
+        copy fails, the files it reported as uploaded are recorded. A rerun whose
+        manifest lists uploads of an earlier run passes only the files missing from it
+        to `upload_files`, which counts the ones it skips in the manifest."""
+        if manifest is not None and len(manifest) > 0:
+            return self._upload_missing(directory, manifest)
+
         source_path = str(directory)
         if not source_path.endswith('/'):
             source_path += '/'
 
-        destination = f"s3://{self._s3_bucket}/{self._s3_prefix}"
-        if not destination.endswith('/'):
-            destination += '/'
-
         cmd = [
             "aws", "s3", "cp",
             source_path,
-            destination,
+            self._destination(),
             "--no-progress",
             "--recursive"
         ]
+        try:
+            self._run(cmd)
+        except CliS3UploadError as e:
+            if manifest is not None:
+                # The CLI goes on after a failed file, so most of the tape may be uploaded
+                self._record_reported_uploads(directory, e.output, manifest)
+            raise
+
+        # The recursive copy does not report what it transferred, so the tree is sized afterwards
+        summary = UploadSummary()
+        targets = walk_upload_targets(directory)
+        while True:
+            page: List[UploadTarget] = list(islice(targets, self._MANIFEST_PAGE_SIZE))
+            if not page:
+                return summary
+            sizes: Dict[str, int] = {}
+            self._uploaded(page, manifest, sizes)
+            summary.objects += len(page)
+            summary.bytes += sum(sizes.values())
+
+    def upload_files(
+        self,
+        targets: List[UploadTarget],
+        manifest: Optional[UploadManifest] = None
+    ) -> List[UploadResult]:
+        """Uploads the targets with one `aws s3 cp --recursive` per local directory,
+        selecting the files through --include filters. Targets whose key does not
+        mirror their local path are copied one by one. Each command's targets are
+        recorded in `manifest` as soon as it succeeded, and deleted then if the
+        uploader deletes uploaded files."""
+        groups: Dict[Tuple[Path, str], List[UploadTarget]] = {}
+        singles: List[UploadTarget] = []
+        uploaded: List[UploadTarget] = []
+        # Sized once their command succeeded, before they may be deleted
+        sizes: Dict[str, int] = {}
+
+        for target in targets:
+            if manifest is not None and manifest.is_uploaded(target):
+                continue
+            uploaded.append(target)
+            local_path = target.local_path.as_posix()
+            if local_path.endswith('/' + target.s3_key):
+                key_dir, _, _ = target.s3_key.rpartition('/')
+                groups.setdefault((target.local_path.parent, key_dir), []).append(target)
+            else:
+                singles.append(target)
+
+        for (local_dir, key_dir), group in groups.items():
+            destination = self._destination() + (key_dir + '/' if key_dir else '')
+            for i in range(0, len(group), self._MAX_INCLUDES_PER_COMMAND):
+                chunk = group[i:i + self._MAX_INCLUDES_PER_COMMAND]
+                cmd = [
+                    "aws", "s3", "cp",
+                    str(local_dir) + '/',
+                    destination,
+                    "--no-progress",
+                    "--recursive",
+                    "--exclude", "*"
+                ]
+                for target in chunk:
+                    # Filters are fnmatch patterns, so [, * and ? in names must not act as wildcards
+                    cmd.extend(["--include", glob.escape(target.local_path.name)])
+                self._run(cmd)
+                self._uploaded(chunk, manifest, sizes)
+
+        for target in singles:
+            self._run([
+                "aws", "s3", "cp",
+                str(target.local_path),
+                self._destination() + target.s3_key,
+                "--no-progress"
+            ])
+            self._uploaded([target], manifest, sizes)
+
+        # The CLI reports success only for a whole command, which covered every target
+        return [UploadResult(s3_key=target.s3_key, size=sizes[target.s3_key]) for target in uploaded]
+
+    def _upload_missing(self, directory: Path, manifest: UploadManifest) -> UploadSummary:
+        summary = UploadSummary()
+        targets = walk_upload_targets(directory)
+        while True:
+            page: List[UploadTarget] = list(islice(targets, self._MANIFEST_PAGE_SIZE))
+            if not page:
+                return summary
+            results = self.upload_files(page, manifest)
+            summary.objects += len(results)
+            summary.bytes += sum(result.size for result in results)
+
+    def _record_reported_uploads(self, directory: Path, output: str, manifest: UploadManifest) -> None:
+        reported: Iterator[UploadTarget] = self._reported_uploads(directory, output)
+        while True:
+            page: List[UploadTarget] = list(islice(reported, self._MANIFEST_PAGE_SIZE))
+            if not page:
+                return
+            self._uploaded(page, manifest, {})
+
+    def _reported_uploads(self, directory: Path, output: str) -> Iterator[UploadTarget]:
+        """Yields the targets of the `upload: <file> to <url>` lines the CLI prints."""
+        marker = " to " + self._destination()
+        for line in output.splitlines():
+            if not line.startswith("upload: "):
+                continue
+            _, found, s3_key = line.rpartition(marker)
+            if found and s3_key and (directory / s3_key).is_file():
+                yield UploadTarget(local_path=directory / s3_key, s3_key=s3_key)
+
+    def _uploaded(self, targets: List[UploadTarget], manifest: Optional[UploadManifest], sizes: Dict[str, int]) -> None:
+        for target in targets:
+            sizes[target.s3_key] = target.local_path.stat().st_size
+        if manifest is not None:
+            manifest.record(targets)
+        if self._delete_uploaded:
+            for target in targets:
+                delete_uploaded_file(target)
+
+    def _destination(self) -> str:
+        destination = f"s3://{self._s3_bucket}/{self._s3_prefix}"
+        if not destination.endswith('/'):
+            destination += '/'
+        return destination
 
+    def _run(self, cmd: List[str]) -> None:
         if not self._verify_ssl:
             cmd.append("--no-verify-ssl")
 
@@ -66,7 +209,7 @@ class HcpUploaderAwsCliImpl(HcpUploader):
         except subprocess.CalledProcessError as e:
             error_msg = f"Upload failed: {e.stderr}"
             logger.error(error_msg)
-            raise CliS3UploadError(error_msg) from e
+            raise CliS3UploadError(error_msg, e.stdout or "") from e
         except Exception as e:
             error_msg = f"Unexpected error during upload: {str(e)}"
             logger.error(error_msg)
@@ -0,0 +1,329 @@
+import base64
+import hashlib
+import logging
+import mmap
+import os
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+import boto3
+import urllib3
+from boto3.s3.transfer import TransferConfig
+from botocore.config import Config
+from botocore.exceptions import ClientError
+
+from unit_of_work.uploader.adaptive_concurrency_limiter import AdaptiveConcurrencyLimiter
+from unit_of_work.uploader.hcp_uploader import HcpUploader
+from unit_of_work.uploader.mapped_region import MappedRegion
+from unit_of_work.uploader.upload_manifest import UploadManifest
+from unit_of_work.uploader.upload_result import UploadResult
+from unit_of_work.uploader.upload_summary import UploadSummary
+from unit_of_work.uploader.upload_target import UploadTarget, delete_uploaded_file, walk_upload_targets
+
+logger = logging.getLogger(__name__)
+
+
+class S3UploadError(Exception):
+    def __init__(self, message: str, results: List[UploadResult]):
+        super().__init__(message)
+        self.results: List[UploadResult] = results
+
+
+class HcpUploaderBoto3Impl(HcpUploader):
+    """Uploads to HCP through one shared boto3 client instead of the AWS CLI.
+
+    Objects are uploaded by a bounded worker pool that is shared by all callers, so
+    concurrent tapes in one process compete for the same workers and keep-alive
+    connections. Objects above `multipart_threshold` are split into
+    `multipart_chunksize` parts, uploaded `max_concurrency` at a time. With
+    `adaptive_concurrency` the objects in flight are further capped by an AIMD limit
+    that backs off when HCP throttles, including on requests botocore retries.
+
+    With `upload_checksums` every request carries a Content-MD5, so HCP rejects a
+    body that was corrupted on the way. Each file is memory mapped and every byte is
+    hashed once from the map, which then also serves as the request body, so the
+    file is not read twice. Such objects are uploaded with put_object or a multipart
+    upload of our own instead of through s3transfer.
+
+    With `delete_uploaded` each local file is unlinked as soon as its upload was
+    acknowledged and recorded in the manifest, so the disk used by a tape shrinks
+    while it is uploaded instead of all at once afterwards.
+    """
+
+    # S3 limit of parts per multipart upload
+    _MAX_PARTS: int = 10000
+
+    _THROTTLING_CODES: Set[str] = {
+        "SlowDown", "ServiceUnavailable", "503", "Throttling", "ThrottlingException", "RequestLimitExceeded"
+    }
+
+    def __init__(
+        self,
+        s3_bucket: str,
+        s3_prefix: str,
+        verify_ssl: bool,
+        endpoint_url: Optional[str] = None,
+        multipart_threshold: int = 64 * 1024 * 1024,
+        multipart_chunksize: int = 16 * 1024 * 1024,
+        max_concurrency: int = 4,
+        max_workers: int = 16,
+        adaptive_concurrency: bool = True,
+        upload_checksums: bool = False,
+        delete_uploaded: bool = False,
+        s3_client=None
+    ):
+        self._s3_bucket: str = s3_bucket
+        self._s3_prefix: str = s3_prefix.strip('/')
+        self._max_workers: int = max_workers
+        self._multipart_threshold: int = multipart_threshold
+        self._multipart_chunksize: int = multipart_chunksize
+        self._max_concurrency: int = max_concurrency
+        self._upload_checksums: bool = upload_checksums
+        self._delete_uploaded: bool = delete_uploaded
+
+        if s3_client is None:
+            if not verify_ssl:
+                urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
+            s3_client = boto3.session.Session().client(
+                "s3",
+                endpoint_url=endpoint_url,
+                verify=verify_ssl,
+                config=Config(
+                    # Every worker may have max_concurrency parts in flight
+                    max_pool_connections=max_workers * max_concurrency,
+                    tcp_keepalive=True,
+                    retries={"max_attempts": 5, "mode": "standard"},
+                    # Content-MD5 already protects the body, so skip the extra CRC pass
+                    request_checksum_calculation="when_required" if upload_checksums else "when_supported"
+                )
+            )
+        self._s3_client = s3_client
+        self._limiter: Optional[AdaptiveConcurrencyLimiter] = None
+        if adaptive_concurrency:
+            self._limiter = AdaptiveConcurrencyLimiter(max_limit=max_workers)
+            # Throttled attempts are retried inside botocore and never reach _upload_one
+            self._s3_client.meta.events.register("needs-retry.s3", self._on_needs_retry)
+        self._transfer_config: TransferConfig = TransferConfig(
+            multipart_threshold=multipart_threshold,
+            multipart_chunksize=multipart_chunksize,
+            max_concurrency=max_concurrency,
+            use_threads=max_concurrency > 1
+        )
+        self._executor: ThreadPoolExecutor = ThreadPoolExecutor(
+            max_workers=max_workers,
+            thread_name_prefix="hcp_uploader"
+        )
+        # Parts of checksummed multipart uploads; parts never submit further tasks
+        self._part_executor: ThreadPoolExecutor = ThreadPoolExecutor(
+            max_workers=max_workers * max_concurrency,
+            thread_name_prefix="hcp_uploader_part"
+        )
+
+    def upload_dir(
+        self,
+        directory: Path,
+        manifest: Optional[UploadManifest] = None
+    ) -> UploadSummary:
+        logger.info(f"Starting upload of {directory} to s3://{self._s3_bucket}/{self._s3_prefix}")
+        uploaded = 0
+        uploaded_bytes = 0
+        failed: List[UploadResult] = []
+
+        for result in self._upload(self._pending(walk_upload_targets(directory), manifest), manifest):
+            if result.succeeded:
+                uploaded += 1
+                uploaded_bytes += result.size
+            else:
+                failed.append(result)
+
+        skipped = f", {manifest.skipped} skipped ({manifest.skipped_bytes} bytes) as already uploaded" if manifest else ""
+        logger.info(
+            f"Upload of {directory} finished: {uploaded} objects, {uploaded_bytes} bytes, {len(failed)} failed{skipped}"
+        )
+        if failed:
+            raise S3UploadError(
+                f"Upload of {directory} failed for {len(failed)} objects, first error: {failed[0].error}",
+                failed
+            )
+        return UploadSummary(objects=uploaded, bytes=uploaded_bytes)
+
+    def upload_files(
+        self,
+        targets: List[UploadTarget],
+        manifest: Optional[UploadManifest] = None
+    ) -> List[UploadResult]:
+        results: List[UploadResult] = list(self._upload(self._pending(targets, manifest), manifest))
+        failed = [result for result in results if not result.succeeded]
+        if failed:
+            raise S3UploadError(
+                f"Upload failed for {len(failed)} of {len(results)} objects, first error: {failed[0].error}",
+                results
+            )
+        return results
+
+    def metrics(self) -> Dict[str, float]:
+        """Current concurrency limit, uploads in flight and recent throughput."""
+        return self._limiter.metrics() if self._limiter is not None else {}
+
+    def close(self) -> None:
+        self._executor.shutdown(wait=True)
+        self._part_executor.shutdown(wait=True)
+
+    @staticmethod
+    def _pending(targets: Iterable[UploadTarget], manifest: Optional[UploadManifest]) -> Iterable[UploadTarget]:
+        if manifest is None:
+            return targets
+        return (target for target in targets if not manifest.is_uploaded(target))
+
+    def _upload(self, targets: Iterable[UploadTarget], manifest: Optional[UploadManifest]) -> Iterator[UploadResult]:
+        """Uploads targets on the worker pool, keeping at most twice the pool size in
+        flight so that huge directories are never queued as a whole."""
+        in_flight: Set[Future] = set()
+        for target in targets:
+            if len(in_flight) >= 2 * self._max_workers:
+                done, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in done:
+                    yield future.result()
+            started = self._limiter.acquire() if self._limiter is not None else 0.0
+            in_flight.add(self._executor.submit(self._upload_one, target, manifest, started))
+        for future in wait(in_flight).done:
+            yield future.result()
+
+    def _upload_one(self, target: UploadTarget, manifest: Optional[UploadManifest], started: float) -> UploadResult:
+        key: str = self._object_key(target.s3_key)
+        size = 0
+        throttled = False
+        errored = False
+        try:
+            checksum: Optional[str] = None
+            if self._upload_checksums:
+                size, checksum = self._upload_checksummed(target.local_path, key)
+            else:
+                size = os.stat(target.local_path).st_size
+                self._s3_client.upload_file(
+                    Filename=str(target.local_path),
+                    Bucket=self._s3_bucket,
+                    Key=key,
+                    Config=self._transfer_config
+                )
+            if manifest is not None:
+                manifest.record([target], [checksum] if checksum is not None else None)
+            if self._delete_uploaded:
+                delete_uploaded_file(target)
+            return UploadResult(s3_key=target.s3_key, size=size, checksum=checksum)
+        except Exception as e:
+            throttled = self._is_throttling(e)
+            errored = not throttled
+            logger.error("Failed to upload %s to %s: %s", target.local_path, key, e)
+            return UploadResult(s3_key=target.s3_key, size=0, error=e)
+        finally:
+            if self._limiter is not None:
+                self._limiter.release(started, size, throttled, errored)
+
+    def _upload_checksummed(self, local_path: Path, key: str) -> Tuple[int, str]:
+        """Uploads the file with a Content-MD5 on every request; returns its size and
+        the hex MD5 of its whole content."""
+        with open(local_path, "rb") as f:
+            size = os.fstat(f.fileno()).st_size
+            if size == 0:
+                # An empty file cannot be memory mapped
+                digest = hashlib.md5()
+                self._s3_client.put_object(
+                    Bucket=self._s3_bucket, Key=key, Body=b"", ContentMD5=self._content_md5(digest)
+                )
+                return 0, digest.hexdigest()
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                if size < self._multipart_threshold:
+                    digest = self._md5(mapped, 0, size)
+                    self._s3_client.put_object(
+                        Bucket=self._s3_bucket,
+                        Key=key,
+                        Body=MappedRegion(mapped, 0, size),
+                        ContentMD5=self._content_md5(digest)
+                    )
+                    return size, digest.hexdigest()
+                return size, self._upload_multipart(mapped, size, key)
+
+    def _upload_multipart(self, mapped: mmap.mmap, size: int, key: str) -> str:
+        # Parts are hashed just before they are sent, at most max_concurrency ahead,
+        # so their pages are still cached when the request body is read
+        chunk_size = max(self._multipart_chunksize, -(-size // self._MAX_PARTS))
+        whole = hashlib.md5()
+        upload_id: str = self._s3_client.create_multipart_upload(Bucket=self._s3_bucket, Key=key)["UploadId"]
+        parts: List[Future] = []
+        in_flight: Set[Future] = set()
+        try:
+            for number, start in enumerate(range(0, size, chunk_size), 1):
+                if len(in_flight) >= self._max_concurrency:
+                    done, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+                    for part in done:
+                        # Stops at the first failed part
+                        part.result()
+                length = min(chunk_size, size - start)
+                digest = self._md5(mapped, start, length, whole)
+                part = self._part_executor.submit(
+                    self._s3_client.upload_part,
+                    Bucket=self._s3_bucket,
+                    Key=key,
+                    UploadId=upload_id,
+                    PartNumber=number,
+                    Body=MappedRegion(mapped, start, length),
+                    ContentMD5=self._content_md5(digest)
+                )
+                parts.append(part)
+                in_flight.add(part)
+            # The map is closed on return, so no part may still be reading from it
+            wait(parts)
+            completed = [
+                {"PartNumber": number, "ETag": part.result()["ETag"]} for number, part in enumerate(parts, 1)
+            ]
+            self._s3_client.complete_multipart_upload(
+                Bucket=self._s3_bucket,
+                Key=key,
+                UploadId=upload_id,
+                MultipartUpload={"Parts": completed}
+            )
+        except Exception:
+            wait(parts)
+            try:
+                self._s3_client.abort_multipart_upload(Bucket=self._s3_bucket, Key=key, UploadId=upload_id)
+            except Exception as e:
+                logger.warning(f"Failed to abort multipart upload {upload_id} of {key}: {str(e)}")
+            raise
+        return whole.hexdigest()
+
+    @staticmethod
+    def _md5(mapped: mmap.mmap, start: int, length: int, whole=None):
+        with memoryview(mapped) as view, view[start:start + length] as part:
+            digest = hashlib.md5(part)
+            if whole is not None:
+                whole.update(part)
+        return digest
+
+    @staticmethod
+    def _content_md5(digest) -> str:
+        return base64.b64encode(digest.digest()).decode("ascii")
+
+    def _on_needs_retry(self, response=None, **kwargs) -> None:
+        if response is None:
+            return
+        http_response, parsed = response
+        code = parsed.get("Error", {}).get("Code") if isinstance(parsed, dict) else None
+        if code in self._THROTTLING_CODES or getattr(http_response, "status_code", None) == 503:
+            self._limiter.on_throttle()
+
+    @classmethod
+    def _is_throttling(cls, error: Exception) -> bool:
+        # s3transfer may wrap the ClientError of a failed part
+        seen: Set[int] = set()
+        while error is not None and id(error) not in seen:
+            seen.add(id(error))
+            if isinstance(error, ClientError):
+                return error.response.get("Error", {}).get("Code") in cls._THROTTLING_CODES or \
+                    error.response.get("ResponseMetadata", {}).get("HTTPStatusCode") == 503
+            error = error.__cause__ or error.__context__
+        return False
+
+    def _object_key(self, s3_key: str) -> str:
+        return f"{self._s3_prefix}/{s3_key}" if self._s3_prefix else s3_key
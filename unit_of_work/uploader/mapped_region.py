@@ -0,0 +1,44 @@
+import io
+import mmap
+
+
+class MappedRegion(io.RawIOBase):
+    """Read-only, seekable file object over `length` bytes of a memory map from
+    `start`, so that a request body is served from the pages that were hashed and a
+    retry can rewind it without the file being read again."""
+
+    def __init__(self, mapped: mmap.mmap, start: int, length: int) -> None:
+        super().__init__()
+        self._mapped: mmap.mmap = mapped
+        self._start: int = start
+        self._length: int = length
+        self._position: int = 0
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:
+        count = max(0, min(len(buffer), self._length - self._position))
+        offset = self._start + self._position
+        buffer[:count] = self._mapped[offset:offset + count]
+        self._position += count
+        return count
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        if whence == io.SEEK_CUR:
+            offset += self._position
+        elif whence == io.SEEK_END:
+            offset += self._length
+        if offset < 0:
+            raise ValueError(f"Negative seek position {offset}")
+        self._position = offset
+        return self._position
+
+    def tell(self) -> int:
+        return self._position
+
+    def __len__(self) -> int:
+        return self._length
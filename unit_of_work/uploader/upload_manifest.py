@@ -0,0 +1,111 @@
+import logging
+import os
+import threading
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, TextIO, Tuple
+
+from unit_of_work.uploader.upload_target import UploadTarget
+
+logger = logging.getLogger(__name__)
+
+
+class UploadManifest:
+    """Persisted per-tape record of the objects that were uploaded completely.
+
+    Each line holds `key\tsize\tmtime_ns` of a local file whose upload succeeded,
+    followed by `\tmd5` if the uploader computed the checksum of the content. Lines
+    are flushed as soon as the upload finished, so a failed run leaves a manifest of
+    everything it did upload. A rerun skips a target whose key was recorded for a
+    local file of the same size and modification time and counts the bytes it
+    avoided. Hard links share the inode of the slicer output, so a re-sliced tape
+    never matches. The manifest is kept as the tape's upload record, and its
+    checksums allow verifying the bucket without reading local data again.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path: Path = path
+        self.skipped: int = 0
+        self.skipped_bytes: int = 0
+        self._lock: threading.Lock = threading.Lock()
+        self._file: Optional[TextIO] = None
+        self._completed: Dict[str, Tuple[int, int]] = self._load()
+        if self._completed:
+            logger.info(f"Upload manifest {path} lists {len(self._completed)} objects uploaded by an earlier run")
+
+    def __len__(self) -> int:
+        """Returns the number of objects recorded by earlier runs."""
+        return len(self._completed)
+
+    def checksum(self, s3_key: str) -> Optional[str]:
+        """Returns the hex MD5 recorded for the object by this or an earlier run, if any.
+        Checksums are not held in memory, so this reads the manifest file."""
+        with self._lock:
+            if self._file is not None:
+                self._file.flush()
+        checksum: Optional[str] = None
+        for fields in self._read_lines():
+            if fields[0] == s3_key:
+                # The last line of a key wins
+                checksum = fields[3] if len(fields) == 4 else None
+        return checksum
+
+    def is_uploaded(self, target: UploadTarget) -> bool:
+        """Returns whether the target was uploaded by an earlier run, counting it as
+        skipped if so."""
+        recorded = self._completed.get(target.s3_key)
+        if recorded is None:
+            return False
+        try:
+            stat = os.stat(target.local_path)
+        except OSError:
+            return False
+        if recorded != (stat.st_size, stat.st_mtime_ns):
+            return False
+        with self._lock:
+            self.skipped += 1
+            self.skipped_bytes += stat.st_size
+        return True
+
+    def record(self, targets: Iterable[UploadTarget], checksums: Optional[Iterable[str]] = None) -> None:
+        """Records targets whose upload has succeeded, with the hex MD5 of each if given."""
+        targets = list(targets)
+        lines = []
+        for target, checksum in zip(targets, checksums if checksums is not None else [None] * len(targets)):
+            stat = os.stat(target.local_path)
+            suffix = f"\t{checksum}" if checksum is not None else ""
+            lines.append(f"{target.s3_key}\t{stat.st_size}\t{stat.st_mtime_ns}{suffix}\n")
+        with self._lock:
+            if self._file is None:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                self._file = open(self.path, "a")
+            self._file.writelines(lines)
+            self._file.flush()
+
+    def close(self) -> None:
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+    def _load(self) -> Dict[str, Tuple[int, int]]:
+        completed: Dict[str, Tuple[int, int]] = {}
+        for fields in self._read_lines():
+            completed[fields[0]] = (int(fields[1]), int(fields[2]))
+        return completed
+
+    def _read_lines(self) -> Iterator[List[str]]:
+        """Yields the fields of every complete, well-formed line of the manifest file."""
+        try:
+            with open(self.path) as f:
+                for line in f:
+                    fields = line.rstrip("\n").split("\t")
+                    # A run killed while writing leaves a truncated last line
+                    if len(fields) not in (3, 4) or not line.endswith("\n"):
+                        continue
+                    try:
+                        int(fields[1]), int(fields[2])
+                    except ValueError:
+                        continue
+                    yield fields
+        except FileNotFoundError:
+            pass
@@ -0,0 +1,15 @@
+from dataclasses import dataclass
+from typing import Optional
+
+
+@dataclass
+class UploadResult:
+    s3_key: str
+    size: int
+    error: Optional[Exception] = None
+    # Hex MD5 of the uploaded content, if the uploader computed one
+    checksum: Optional[str] = None
+
+    @property
+    def succeeded(self) -> bool:
+        return self.error is None
\ No newline at end of file
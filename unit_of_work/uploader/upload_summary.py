@@ -0,0 +1,8 @@
+from dataclasses import dataclass
+
+
+@dataclass
+class UploadSummary:
+    # Objects and bytes this call uploaded, without those skipped as already uploaded
+    objects: int = 0
+    bytes: int = 0
@@ -1,8 +1,35 @@
+import logging
+import os
 from dataclasses import dataclass
 from pathlib import Path
+from typing import Iterator
+
+logger = logging.getLogger(__name__)
 
 
 @dataclass
 class UploadTarget:
     local_path: Path
-    s3_key: str
\ No newline at end of file
+    # Object key relative to the uploader's configured s3_prefix
+    s3_key: str
+
+
+def walk_upload_targets(directory: Path) -> Iterator[UploadTarget]:
+    """Yields a target for every file below `directory`, keyed by its relative path."""
+    root = str(directory)
+    for dir_path, _, file_names in os.walk(root):
+        relative_dir = os.path.relpath(dir_path, root)
+        for file_name in file_names:
+            s3_key = file_name if relative_dir == '.' else f"{relative_dir}/{file_name}".replace(os.sep, '/')
+            yield UploadTarget(local_path=Path(dir_path, file_name), s3_key=s3_key)
+
+
+def delete_uploaded_file(target: UploadTarget) -> None:
+    """Unlinks the local file of a target whose upload was acknowledged. A file that
+    cannot be removed is only logged, since its object is already safe."""
+    try:
+        os.unlink(target.local_path)
+    except FileNotFoundError:
+        pass
+    except OSError as e:
+        logger.warning("Failed to delete uploaded file %s: %s", target.local_path, e)
@@ -0,0 +1,130 @@
+import errno
+import itertools
+import logging
+import os
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from pathlib import Path
+from typing import List, Optional
+
+from unit_of_work.utils.remove_tree import RemovalStats, remove_tree
+
+logger = logging.getLogger(__name__)
+
+
+class BackgroundDeleter:
+    """Deletes paths on a background thread so that callers never wait for the removal.
+
+    `delete` atomically renames the path into a trash directory on the same file
+    system and returns at once; the original path is gone for everyone from then on.
+    A single worker thread reclaims the trash in order. At most `max_queued` deletions
+    wait for it; further calls block until the worker catches up. Paths on another
+    file system than `trash_directory` go to a `.trash` directory next to them, and
+    paths that cannot be renamed at all are deleted inline. Entries left in
+    `trash_directory` by an earlier process are reclaimed first.
+    """
+
+    _FALLBACK_TRASH_NAME: str = ".trash"
+    _STOP = object()
+
+    def __init__(self, trash_directory: Path, max_queued: int = 64) -> None:
+        self._trash_directory: Path = trash_directory
+        self._queue: "queue.Queue" = queue.Queue(maxsize=max_queued)
+        self._counter = itertools.count()
+        self._closed: bool = False
+        self._lock: threading.Lock = threading.Lock()
+        # Listed before any deletion of this process can add to the trash
+        try:
+            leftovers: List[Path] = list(trash_directory.iterdir())
+        except FileNotFoundError:
+            leftovers = []
+        self._worker: threading.Thread = threading.Thread(
+            target=self._reclaim_all,
+            args=(leftovers,),
+            name="background_deleter",
+            daemon=True
+        )
+        self._worker.start()
+
+    def delete(self, path: Path) -> Future:
+        """Moves `path` out of the way and schedules its deletion. The returned future
+        completes once the data is reclaimed."""
+        future: Future = Future()
+        if not os.path.lexists(path):
+            logger.info(f"Path {path} does not exist.")
+            future.set_result(None)
+            return future
+
+        trash_path: Optional[Path] = self._move_to_trash(path)
+        if trash_path is None:
+            logger.info(f"Path {path} cannot be moved to trash, deleting it inline")
+            self._reclaim(path, future)
+            return future
+
+        logger.info(f"Path {path} moved to {trash_path}, scheduled for deletion.")
+        with self._lock:
+            if self._closed:
+                # Still reclaimed by the next process that uses the trash directory
+                raise RuntimeError(f"BackgroundDeleter is closed, {trash_path} left in trash")
+            self._queue.put((trash_path, future))
+        return future
+
+    def pending(self) -> int:
+        """Number of deletions waiting for the worker."""
+        return self._queue.qsize()
+
+    def close(self, wait: bool = True) -> None:
+        """Stops accepting deletions; with `wait`, blocks until all are reclaimed."""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            self._queue.put((self._STOP, None))
+        if wait:
+            started = time.monotonic()
+            self._worker.join()
+            logger.info(f"Background deletions finished, waited {time.monotonic() - started:.1f}s")
+
+    def _move_to_trash(self, path: Path) -> Optional[Path]:
+        name = f"{path.name}.{time.time_ns()}.{next(self._counter)}"
+        for trash_directory in (self._trash_directory, path.parent / self._FALLBACK_TRASH_NAME):
+            try:
+                trash_directory.mkdir(parents=True, exist_ok=True)
+                os.rename(path, trash_directory / name)
+                return trash_directory / name
+            except OSError as e:
+                if e.errno not in (errno.EXDEV, errno.EACCES, errno.EPERM, errno.EBUSY, errno.EROFS):
+                    raise
+        return None
+
+    def _reclaim_all(self, leftovers: List[Path]) -> None:
+        if leftovers:
+            logger.info(f"Reclaiming {len(leftovers)} entries left in {self._trash_directory}")
+        for leftover in leftovers:
+            self._reclaim(leftover, Future())
+
+        while True:
+            trash_path, future = self._queue.get()
+            if trash_path is self._STOP:
+                return
+            self._reclaim(trash_path, future)
+
+    @staticmethod
+    def _reclaim(path: Path, future: Future) -> None:
+        try:
+            if os.path.isdir(path) and not os.path.islink(path):
+                stats: RemovalStats = remove_tree(path)
+                logger.info(
+                    f"Path {path} has been deleted: {stats.files} files in {stats.seconds:.1f}s "
+                    f"({stats.files_per_second:.0f} files/s)."
+                )
+            else:
+                os.remove(path)
+                logger.info(f"Path {path} has been deleted.")
+        except Exception as e:
+            logger.error(f"Failed to delete {path}: {str(e)}")
+            future.set_exception(e)
+            return
+        future.set_result(None)
@@ -1,24 +1,25 @@
-import shutil
 import os
-import time
 import logging
 from pathlib import Path
 
+from unit_of_work.utils.remove_tree import RemovalStats, remove_tree
+
 logger = logging.getLogger(__name__)
 
 def delete_path(path: Path, synchronous: bool = True):
-    if os.path.exists(path):
-        logging.info(f"Deleting path {path} ...")
-        
-        if os.path.isdir(path):
-            shutil.rmtree(path)
+    """Deletes a file or directory tree before returning. `synchronous` is kept for
+    callers; both modes wait for the removal, which leaves nothing to poll for."""
+    if os.path.lexists(path):
+        logger.info(f"Deleting path {path} ...")
+
+        if os.path.isdir(path) and not os.path.islink(path):
+            stats: RemovalStats = remove_tree(path)
+            logger.info(
+                f"Path {path} has been deleted: {stats.files} files, {stats.directories} directories "
+                f"in {stats.seconds:.1f}s ({stats.files_per_second:.0f} files/s)."
+            )
         else:
             os.remove(path)
-        
-        if synchronous:
-            while os.path.exists(path):
-                time.sleep(0.1)
-            logging.info(f"Path {path} has been deleted.")
-        logging.info(f"Path {path} scheduled for deletion.")
+            logger.info(f"Path {path} has been deleted.")
     else:
-        logging.info(f"Path {path} does not exist.")
\ No newline at end of file
+        logger.info(f"Path {path} does not exist.")
@@ -0,0 +1,24 @@
+import fnmatch
+import os
+import re
+from pathlib import Path
+from typing import Iterator, List, Pattern
+
+
+def compile_file_patterns(file_patterns: List[str]) -> Pattern[str]:
+    """Compiles shell-style patterns into one regular expression matching any of them."""
+    return re.compile("|".join(f"(?:{fnmatch.translate(pattern)})" for pattern in file_patterns))
+
+
+def scan_files(directory: Path, pattern: Pattern[str]) -> Iterator[os.DirEntry]:
+    """Lazily yields the regular files directly in `directory` whose name matches
+    `pattern`, reading the directory once. Each file is yielded once, however many
+    of the compiled patterns it matches.
+
+    Raises:
+        FileNotFoundError: If the directory does not exist
+    """
+    with os.scandir(directory) as it:
+        for entry in it:
+            if pattern.match(entry.name) and entry.is_file():
+                yield entry